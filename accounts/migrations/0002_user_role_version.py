@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.db.models import F
+from django.utils.functional import SimpleLazyObject
+
+ROLE_SESSION_KEY = "_user_role"
+
+
+class UserRole:
+    __slots__ = ("user_id", "is_staff", "profile_id", "is_approved_artist")
+
+    def __init__(self, user_id=None, is_staff=False, profile_id=None, is_approved_artist=False):
+        self.user_id = user_id
+        self.is_staff = is_staff
+        self.profile_id = profile_id
+        self.is_approved_artist = is_approved_artist
+
+    def __repr__(self):
+        return f"<UserRole {self.user_id} staff={self.is_staff} artist={self.is_approved_artist}>"
+
+    @property
+    def has_profile(self):
+        return self.profile_id is not None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+ANONYMOUS_ROLE = UserRole()
+
+
+def bump_role_version(*user_ids):
+    # 버전은 사용자 행에 두어 모든 워커가 같은 값을 보고, 인증 미들웨어가 불러오는 행으로 추가 조회 없이 비교한다
+    from .models import User
+
+    User.objects.filter(pk__in=set(user_ids)).update(role_version=F("role_version") + 1)
+
+
+def resolve_role(user):
+    from artist.models import ArtistProfile
+
+    profile = ArtistProfile.objects.filter(user_id=user.pk).order_by("pk").values_list("pk", "is_approved").first()
+    profile_id, is_approved = profile or (None, False)
+    return UserRole(user.pk, user.is_staff, profile_id, is_approved)
+
+
+def get_user_role(request):
+    user = request.user
+    if not user.is_authenticated:
+        return ANONYMOUS_ROLE
+
+    version = user.role_version
+    now = int(time.time())
+    max_age = getattr(settings, "USER_ROLE_MAX_AGE", 3600)
+    cached = request.session.get(ROLE_SESSION_KEY)
+    if (
+        cached
+        and cached.get("version") == version
+        and cached["role"].get("user_id") == user.pk
+        and now - cached.get("resolved_at", 0) < max_age
+    ):
+        role = UserRole(**cached["role"])
+        # 관리자 권한은 매 요청 불러오는 사용자 행을 그대로 따른다
+        role.is_staff = user.is_staff
+        return role
+
+    role = resolve_role(user)
+    request.session[ROLE_SESSION_KEY] = {"role": role.as_dict(), "version": version, "resolved_at": now}
+    return role
+
+
+class UserRoleMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_role = SimpleLazyObject(lambda: get_user_role(request))
+        return self.get_response(request)
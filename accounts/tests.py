@@ -1,3 +1,139 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from artist.models import ArtistApplication
+from artist.service import process_multiple_approve
+from core.testing import SEED_PASSWORD, QueryBudgetMixin, seed_dataset
+
+from .roles import ROLE_SESSION_KEY
+from .throttle import check_login_throttle, throttle_counters
+
+
+class AccountsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=3, artworks_per_artist=2, applications=3)
+
+    def test_signup_form(self):
+        response = self.request_within_budget(0, reverse("accounts:signup"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_signup(self):
+        response = self.request_within_budget(
+            11,
+            reverse("accounts:signup"),
+            method="post",
+            data={"email": "new@seed.test", "password1": "Str0ng-pass!23", "password2": "Str0ng-pass!23"},
+        )
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+
+    def test_login_form(self):
+        response = self.request_within_budget(0, reverse("accounts:login"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_login(self):
+        response = self.request_within_budget(
+            9,
+            reverse("accounts:login"),
+            method="post",
+            data={"username": self.seed.member.email, "password": SEED_PASSWORD},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(int(self.client.session["_auth_user_id"]), self.seed.member.pk)
+
+    def test_logout(self):
+        self.login(self.seed.member)
+        response = self.request_within_budget(4, reverse("accounts:logout"), method="post")
+        self.assertEqual(response.status_code, 302)
+
+
+class UserRoleTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=1)
+
+    def test_role_is_cached_in_session(self):
+        self.client.force_login(self.seed.artist)
+        first = self.request_within_budget(9, reverse("artist:dashboard"))
+        self.assertTrue(first.wsgi_request.user_role.is_approved_artist)
+        self.assertEqual(self.client.session[ROLE_SESSION_KEY]["role"]["profile_id"], self.seed.profile.pk)
+
+        second = self.request_within_budget(5, reverse("artist:dashboard"))
+        self.assertLess(len(second.captured_queries), len(first.captured_queries))
+
+    def test_role_version_does_not_depend_on_cache(self):
+        # 다른 워커(빈 캐시)로 요청이 가도 역할을 다시 계산하거나 세션을 다시 쓰지 않는다
+        self.client.force_login(self.seed.artist)
+        self.client.get(reverse("artist:dashboard"))
+        cache.clear()
+        response = self.request_within_budget(5, reverse("artist:dashboard"))
+        writes = [query for query in response.captured_queries if query["sql"].startswith('UPDATE "django_session"')]
+        self.assertEqual(writes, [])
+
+    def test_approval_invalidates_role(self):
+        self.client.force_login(self.seed.applicant)
+        response = self.request_within_budget(7, reverse("artist:dashboard"))
+        self.assertRedirects(response, reverse("core:main"), fetch_redirect_response=False)
+
+        application = ArtistApplication.objects.get(applicant=self.seed.applicant)
+        with self.captureOnCommitCallbacks(execute=True):
+            process_multiple_approve([application.pk], self.seed.admin)
+
+        response = self.request_within_budget(9, reverse("artist:dashboard"))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(LOGIN_THROTTLE_RATES={"ip": (4, 60), "email": (2, 60), "account": (3, 60)})
+class LoginThrottleTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=0)
+
+    def attempt(self, email, budget=9, **extra):
+        return self.request_within_budget(
+            budget, reverse("accounts:login"), method="post", data={"username": email, "password": "wrong"}, **extra
+        )
+
+    def test_email_window_rejects_before_authentication(self):
+        for _ in range(2):
+            self.assertEqual(self.attempt(" Member@Seed.test ").status_code, 200)
+        response = self.attempt(self.seed.member.email, budget=0)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertEqual(throttle_counters()["email"], {"allowed": 2, "rejected": 1})
+
+    def test_ip_window_spans_emails(self):
+        for index in range(4):
+            self.assertEqual(self.attempt(f"user{index}@seed.test").status_code, 200)
+        self.assertEqual(self.attempt("other@seed.test", budget=0).status_code, 429)
+        self.assertEqual(throttle_counters()["ip"], {"allowed": 4, "rejected": 1})
+
+    def test_attacker_cannot_lock_out_the_account(self):
+        email = self.seed.member.email
+        for _ in range(2):
+            self.assertEqual(self.attempt(email, REMOTE_ADDR="10.0.0.1").status_code, 200)
+        for _ in range(2):
+            self.assertEqual(self.attempt(email, budget=0, REMOTE_ADDR="10.0.0.1").status_code, 429)
+        # 다른 IP 의 피해자는 막히지 않고, 거부된 시도는 이메일 전체 한도에도 쌓이지 않는다
+        self.assertEqual(self.attempt(email, REMOTE_ADDR="10.0.0.2").status_code, 200)
+        self.assertEqual(throttle_counters()["email"], {"allowed": 3, "rejected": 2})
+        self.assertEqual(throttle_counters()["account"], {"allowed": 3, "rejected": 0})
+        self.assertEqual(self.attempt(email, budget=0, REMOTE_ADDR="10.0.0.3").status_code, 429)
+
+    def test_concurrent_attempts_share_the_limit(self):
+        request = RequestFactory().post(reverse("accounts:login"), {"username": "burst@seed.test"})
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: check_login_throttle(request), range(16)))
+        self.assertEqual(results.count(0), 2)
+
+    @override_settings(LOGIN_THROTTLE_IP_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_ip_is_read_from_configured_header(self):
+        for index in range(4):
+            self.attempt(f"user{index}@seed.test", HTTP_X_FORWARDED_FOR=f"10.0.0.{index}, 10.0.1.1")
+        self.assertEqual(
+            self.attempt("other@seed.test", budget=0, HTTP_X_FORWARDED_FOR="10.0.0.9, 10.0.1.1").status_code, 429
+        )
+        self.assertEqual(self.attempt("other@seed.test", HTTP_X_FORWARDED_FOR="10.0.1.2").status_code, 200)
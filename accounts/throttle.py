@@ -0,0 +1,94 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+WINDOW_KEY = "login-throttle:{}:{}:{}"
+COUNTER_KEY = "login-throttle-count:{}:{}"
+THROTTLE_KINDS = ("ip", "email", "account")
+THROTTLE_OUTCOMES = ("allowed", "rejected")
+# 종류별 (허용 시도 수, 기준 시간(초)). email 은 이메일과 IP 쌍, account 는 IP 와 상관없는 이메일 전체의 느슨한 한도다.
+DEFAULT_THROTTLE_RATES = {"ip": (30, 60), "email": (5, 300), "account": (50, 300)}
+
+# 공용 캐시에 접근할 수 없을 때 워커 안에서라도 제한이 유지되도록 쓰는 예비 저장소
+_local_cache = LocMemCache("login-throttle", {})
+
+
+def _call(method, *args, **kwargs):
+    try:
+        return getattr(caches[getattr(settings, "LOGIN_THROTTLE_CACHE", "default")], method)(*args, **kwargs)
+    except ValueError:
+        # incr 대상 키가 없을 때의 정상 신호이므로 예비 저장소로 넘기지 않는다
+        raise
+    except Exception:
+        return getattr(_local_cache, method)(*args, **kwargs)
+
+
+def client_ip(request):
+    header = getattr(settings, "LOGIN_THROTTLE_IP_HEADER", "")
+    forwarded = request.META.get(header, "") if header else ""
+    # 앞쪽 값은 클라이언트가 임의로 보낼 수 있으므로 프록시가 마지막에 덧붙인 주소를 쓴다
+    return forwarded.rsplit(",", 1)[-1].strip() or request.META.get("REMOTE_ADDR", "")
+
+
+def normalize_email(value):
+    return (value or "").strip().lower()
+
+
+def _incr(key, timeout):
+    # add 와 incr 은 백엔드 안에서 원자적으로 처리되므로 동시에 들어온 요청도 서로 다른 값을 받는다
+    _call("add", key, 0, timeout)
+    try:
+        return _call("incr", key)
+    except ValueError:
+        _call("set", key, 1, timeout)
+        return 1
+
+
+def _record_attempt(kind, identity, now, count_rejected):
+    # 고정 구간 카운터 두 개를 앞 구간 가중치로 합쳐 이동 구간(sliding window) 시도 수를 근사한다
+    limit, period = {**DEFAULT_THROTTLE_RATES, **getattr(settings, "LOGIN_THROTTLE_RATES", {})}[kind]
+    digest = hashlib.sha256(identity.encode()).hexdigest()[:32]
+    window, offset = divmod(now, period)
+    key = WINDOW_KEY.format(kind, digest, int(window))
+    previous = (_call("get", WINDOW_KEY.format(kind, digest, int(window) - 1)) or 0) * (1 - offset / period)
+    retry_after = max(1, math.ceil(period - offset))
+    # 이미 막힌 시도를 세지 않으면, 남의 이메일로 계속 시도해도 한도가 연장되지 않는다
+    if not count_rejected and previous + (_call("get", key) or 0) >= limit:
+        return retry_after
+    if previous + _incr(key, period * 2) > limit:
+        return retry_after
+    return 0
+
+
+def _count(kind, outcome):
+    _incr(COUNTER_KEY.format(kind, outcome), None)
+
+
+def check_login_throttle(request):
+    # 비밀번호 해시 계산 전에 IP, 이메일+IP, 이메일 순으로 시도를 기록한다. 막히면 재시도까지 남은 초를 돌려준다.
+    # IP 는 거부된 시도도 세어 공격이 이어지는 동안 계속 막고, 이메일 쪽은 피해자 계정이 잠기지 않도록 거부된 시도를 세지 않는다.
+    now = time.time()
+    ip = client_ip(request)
+    email = normalize_email(request.POST.get("username"))
+    identities = [("ip", ip, True), ("email", f"{email}|{ip}" if email else "", False), ("account", email, False)]
+    for kind, identity, count_rejected in identities:
+        if not identity:
+            continue
+        retry_after = _record_attempt(kind, identity, now, count_rejected)
+        _count(kind, "rejected" if retry_after else "allowed")
+        if retry_after:
+            return retry_after
+    return 0
+
+
+def throttle_counters():
+    keys = {COUNTER_KEY.format(kind, outcome): (kind, outcome) for kind in THROTTLE_KINDS for outcome in THROTTLE_OUTCOMES}
+    found = _call("get_many", list(keys))
+    counters = {kind: dict.fromkeys(THROTTLE_OUTCOMES, 0) for kind in THROTTLE_KINDS}
+    for key, (kind, outcome) in keys.items():
+        counters[kind][outcome] = found.get(key, 0)
+    return counters
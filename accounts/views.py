@@ -4,6 +4,7 @@ from django.contrib.auth.views import LoginView, LogoutView
 from django.shortcuts import render, redirect
 from django.views import View
 from .forms import SignupForm, EmailAuthenticationForm
+from .throttle import check_login_throttle
 
 class RedirectIfAuthenticatedMixin:
     redirect_url = "/"
@@ -30,6 +31,16 @@ class SigninView(RedirectIfAuthenticatedMixin, LoginView):
     template_name = "accounts/login.html"
     authentication_form = EmailAuthenticationForm
 
+    def post(self, request, *args, **kwargs):
+        retry_after = check_login_throttle(request)
+        if retry_after:
+            # 바인딩하지 않은 폼으로 다시 그려 인증(비밀번호 해시)이 실행되지 않게 한다
+            messages.error(request, "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            response = self.render_to_response(self.get_context_data(form=self.authentication_form(request)), status=429)
+            response["Retry-After"] = str(retry_after)
+            return response
+        return super().post(request, *args, **kwargs)
+
 class SignoutView(LogoutView):
 
     def dispatch(self, request, *args, **kwargs):
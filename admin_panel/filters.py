@@ -0,0 +1,38 @@
+from artist.contacts import CONTACT_MATCHES, contact_match, contact_q
+from artist.models import ArtistApplication
+
+SEARCH_FIELDS = ("name", "email", "phone")
+# 정규화 컬럼의 범위 조회로 찾는 필드
+CONTACT_FIELDS = ("email", "phone")
+STATUS_VALUES = tuple(value for value, _ in ArtistApplication.STATUS_CHOICES)
+# 일괄 승인/반려 대상이 될 수 있는 상태
+ACTIONABLE_STATUSES = ("PENDING", "ERROR")
+
+
+def filter_applications(queryset, field="", query="", status="", match=""):
+    if query and field not in SEARCH_FIELDS:
+        # 검색어를 버리고 범위를 넓히면 일괄 처리 대상이 전체로 바뀌므로 거부한다
+        raise ValueError("지원하지 않는 검색 필드입니다.")
+    if status in STATUS_VALUES:
+        queryset = queryset.filter(status=status)
+    if field in CONTACT_FIELDS and query:
+        if match not in CONTACT_MATCHES:
+            match = contact_match(queryset, field, query)
+        queryset = queryset.filter(contact_q(field, query, match=match))
+    elif field in SEARCH_FIELDS and query:
+        queryset = queryset.filter(**{f"{field}__icontains": query})
+    return queryset
+
+
+def actionable_applications(filters):
+    queryset = ArtistApplication.objects.filter(status__in=ACTIONABLE_STATUSES)
+    return filter_applications(queryset, **filters)
+
+
+def pin_contact_match(filters):
+    # 일괄 작업은 청크마다 조건을 다시 평가하므로, 처리로 대상이 줄어도 일치 방식이 바뀌지 않게 처음 고른 방식을 고정한다
+    field, query = filters.get("field"), filters.get("query")
+    if field not in CONTACT_FIELDS or not query or filters.get("match") in CONTACT_MATCHES:
+        return filters
+    base = actionable_applications({**filters, "field": "", "query": ""})
+    return {**filters, "match": contact_match(base, field, query)}
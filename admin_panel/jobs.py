@@ -0,0 +1,121 @@
+from bisect import bisect_right
+
+from django.db import transaction
+from django.utils import timezone
+
+from artist.service import process_multiple_approve, process_multiple_reject
+from core.models import Task
+from .filters import actionable_applications, pin_contact_match
+from .models import ApplicationJob
+
+JOB_CHUNK_SIZE = 200
+
+JOB_PROCESSORS = {
+    "approve": process_multiple_approve,
+    "reject": process_multiple_reject,
+}
+
+
+def _start(job):
+    from .tasks import run_application_job
+
+    run_application_job.delay(job.pk)
+    return job
+
+
+def create_job(action, application_ids, admin_user):
+    application_ids = sorted({int(x) for x in application_ids})
+    return _start(ApplicationJob.objects.create(
+        action=action,
+        requested_by=admin_user,
+        application_ids=application_ids,
+        total=len(application_ids),
+    ))
+
+
+def create_filter_job(action, filters, admin_user):
+    filters = pin_contact_match(filters)
+    return _start(ApplicationJob.objects.create(
+        action=action,
+        requested_by=admin_user,
+        filters=filters,
+        total=actionable_applications(filters).count(),
+    ))
+
+
+def next_chunk(job):
+    if job.filters is not None:
+        # 조건에 맞는 신청을 ID 순 키셋으로 잘라 가져와 메모리와 트랜잭션 크기를 일정하게 유지한다
+        return list(
+            actionable_applications(job.filters)
+            .filter(pk__gt=job.cursor)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:JOB_CHUNK_SIZE]
+        )
+    start = bisect_right(job.application_ids, job.cursor)
+    return job.application_ids[start:start + JOB_CHUNK_SIZE]
+
+
+def run_job_chunk(job_id):
+    job = ApplicationJob.objects.filter(pk=job_id).first()
+    if job is None or job.status in ("DONE", "FAILED"):
+        return False
+
+    start = job.cursor
+    chunk = next_chunk(job)
+    if job.status == "PENDING":
+        ApplicationJob.objects.filter(pk=job_id, status="PENDING").update(status="RUNNING")
+
+    try:
+        result = JOB_PROCESSORS[job.action](chunk, job.requested_by) if chunk else None
+    except Exception as e:
+        ApplicationJob.objects.filter(pk=job_id).update(status="FAILED", error=str(e), finished_at=timezone.now())
+        return False
+
+    with transaction.atomic():
+        job = ApplicationJob.objects.select_for_update().get(pk=job_id)
+        # 같은 청크가 두 번 실행된 경우(워커 잠금 만료 등) 결과를 중복해서 쌓지 않는다
+        if job.cursor != start:
+            return job.status == "RUNNING"
+        if result is None:
+            job.status = "DONE"
+            job.finished_at = timezone.now()
+        else:
+            # 그 사이 삭제되어 어느 결과에도 들어가지 않은 ID 는 건너뛴 것으로 세어 진행률이 100% 에 닿게 한다
+            reported = set(result.approved) | set(result.skipped) | set(result.failed) | set(result.rejected)
+            job.approved += result.approved
+            job.skipped += result.skipped + [pk for pk in chunk if pk not in reported]
+            job.failed += result.failed
+            job.rejected += result.rejected
+            job.cursor = chunk[-1]
+            job.status = "RUNNING"
+        job.save()
+    return job.status == "RUNNING"
+
+
+def recover_stalled_jobs():
+    # 워커가 죽어 이어 갈 작업 행이 없는 일괄 처리를 찾아, 재시도까지 실패했으면 실패로 닫고 아니면 다시 넣는다
+    from .tasks import run_application_job
+
+    open_ids = list(ApplicationJob.objects.filter(status__in=("PENDING", "RUNNING")).values_list("pk", flat=True))
+    if not open_ids:
+        return 0
+    latest = dict(
+        Task.objects.filter(name=run_application_job.name, args__0__in=open_ids)
+        .order_by("id")
+        .values_list("args__0", "status")
+    )
+
+    recovered = 0
+    for job_id in open_ids:
+        status = latest.get(job_id)
+        if status in ("PENDING", "RUNNING"):
+            continue
+        if status == "FAILED":
+            ApplicationJob.objects.filter(pk=job_id, status__in=("PENDING", "RUNNING")).update(
+                status="FAILED", error="처리 중 워커가 중단되어 재시도 횟수를 모두 썼습니다.", finished_at=timezone.now()
+            )
+        else:
+            run_application_job.delay(job_id)
+        recovered += 1
+    return recovered
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('approve', '승인'), ('reject', '반려')], max_length=8)),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('RUNNING', '처리중'), ('DONE', '완료'), ('FAILED', '실패')], default='PENDING', max_length=8)),
+                ('application_ids', models.JSONField(blank=True, default=list)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('cursor', models.PositiveIntegerField(default=0)),
+                ('approved', models.JSONField(blank=True, default=list)),
+                ('skipped', models.JSONField(blank=True, default=list)),
+                ('failed', models.JSONField(blank=True, default=list)),
+                ('rejected', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='application_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
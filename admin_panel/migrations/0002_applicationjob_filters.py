@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_applicationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationjob',
+            name='filters',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='applicationjob',
+            name='cursor',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
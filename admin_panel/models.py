@@ -1,3 +1,60 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class ApplicationJob(models.Model):
+    ACTION_CHOICES = (("approve", "승인"), ("reject", "반려"))
+    STATUS_CHOICES = (("PENDING", "대기"), ("RUNNING", "처리중"), ("DONE", "완료"), ("FAILED", "실패"))
+
+    action = models.CharField(max_length=8, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default="PENDING")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="application_jobs"
+    )
+    application_ids = models.JSONField(default=list, blank=True)
+    # 검색 조건으로 대상을 정한 작업이면 application_ids 대신 조건을 저장한다
+    filters = models.JSONField(null=True, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    # 마지막으로 처리한 신청 ID (ID 순서로 이어서 처리)
+    cursor = models.BigIntegerField(default=0)
+    approved = models.JSONField(default=list, blank=True)
+    skipped = models.JSONField(default=list, blank=True)
+    failed = models.JSONField(default=list, blank=True)
+    rejected = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.get_action_display()} #{self.pk} / {self.get_status_display()}"
+
+    @property
+    def processed(self):
+        return len(self.approved) + len(self.skipped) + len(self.failed) + len(self.rejected)
+
+    def as_progress(self, include_results=False):
+        progress = {
+            "id": self.pk,
+            "action": self.action,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "counts": {
+                "approved": len(self.approved),
+                "skipped": len(self.skipped),
+                "failed": len(self.failed),
+                "rejected": len(self.rejected),
+            },
+            "error": self.error,
+        }
+        if include_results:
+            progress["results"] = {
+                "approved": self.approved,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+        return progress
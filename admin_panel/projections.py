@@ -0,0 +1,13 @@
+from core.projections import Projection
+
+
+class ApplicationRow(Projection):
+    __slots__ = ("id", "applicant_id", "name", "gender", "birth_date", "email", "phone", "status", "submitted_at")
+
+
+class ArtistStatsRow(Projection):
+    __slots__ = (
+        "id", "user_id", "name", "works_under_100_count", "exhibitions_count", "latest_apply_activity",
+        "recent_works", "average_price", "min_price", "max_price",
+    )
+    lookups = {"id": "artist_id", "user_id": "artist__user_id", "name": "artist__name"}
@@ -0,0 +1,20 @@
+from django.conf import settings
+
+from core.tasks import task
+
+from .jobs import recover_stalled_jobs, run_job_chunk
+
+
+@task()
+def run_application_job(job_id):
+    # 한 번에 한 청크만 처리하고 다음 청크는 새 작업으로 넘겨 워커를 오래 붙잡지 않는다.
+    # EAGER 모드에서 이어 붙이면 요청 안에서 모든 청크가 돌므로, 그때는 진행 상황 조회가 한 청크씩 이어 간다.
+    if run_job_chunk(job_id) and not getattr(settings, "TASK_QUEUE_EAGER", False):
+        run_application_job.delay(job_id)
+
+
+@task(max_attempts=1, every=5 * 60)
+def recover_application_jobs():
+    # EAGER 모드에서는 작업 행이 없으므로 진행 상황 조회가 대신 이어 간다
+    if not getattr(settings, "TASK_QUEUE_EAGER", False):
+        recover_stalled_jobs()
@@ -1,3 +1,261 @@
-from django.test import TestCase
+import csv
+import io
+import zipfile
+from datetime import timedelta
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from artist.models import ArtistApplication, ArtistStats
+from core.models import Task
+from core.tasks import fail_abandoned_tasks
+from core.testing import QueryBudgetMixin, seed_dataset
+
+from .jobs import create_filter_job, create_job, recover_stalled_jobs, run_job_chunk
+from .models import ApplicationJob
+from .tasks import run_application_job
+
+
+def read_export(export_format, content):
+    if export_format == "csv":
+        return list(csv.reader(io.StringIO(content.decode("utf-8-sig"))))
+    namespace = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    return [
+        ["".join(cell.itertext()) for cell in row.iter(f"{namespace}c")]
+        for row in sheet.iter(f"{namespace}row")
+    ]
+
+
+class AdminPanelQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset()
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.seed.admin)
+
+    def test_dashboard(self):
+        response = self.request_within_budget(3, reverse("admin_panel:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_applications"], 40)
+        self.assertEqual(response.context["pending_applications"], 20)
+
+    def test_applications(self):
+        response = self.request_within_budget(4, reverse("admin_panel:applications"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["applications"]), 10)
+
+    def test_applications_search(self):
+        response = self.request_within_budget(
+            4, reverse("admin_panel:applications"), data={"field": "name", "query": "신청자1", "status": "PENDING"}
+        )
+        self.assertEqual(response.status_code, 200)
+        status_index = ArtistApplication._meta.indexes[0].name
+        self.assertUsesIndex(response.captured_queries, status_index, table="artist_artistapplication")
+
+    def test_applications_contact_search(self):
+        response = self.request_within_budget(
+            5, reverse("admin_panel:applications"), data={"field": "phone", "query": "0007"}
+        )
+        self.assertEqual([row.phone for row in response.context["applications"]], ["010-2007-0007"])
+        self.assertUsesIndex(response.captured_queries, "phone_reversed", table="artist_artistapplication")
+
+        response = self.request_within_budget(
+            5, reverse("admin_panel:applications"), data={"field": "email", "query": "Applicant1"}
+        )
+        self.assertEqual(len(response.context["applications"]), 10)
+        self.assertUsesIndex(response.captured_queries, "email_local", table="artist_artistapplication")
+
+        # 앞/뒤 일치가 없으면 가운데 일부로도 찾는다
+        response = self.client.get(reverse("admin_panel:applications"), {"field": "phone", "query": "2007"})
+        self.assertEqual([row.phone for row in response.context["applications"]], ["010-2007-0007"])
+
+    def test_apply_to_all_keeps_default_search_field(self):
+        response = self.client.get(reverse("admin_panel:applications"), {"query": "신청자1"})
+        self.assertContains(response, '<input type="hidden" name="field" value="name">', html=True)
+        context = response.context
+        self.client.post(reverse("admin_panel:application_process"), {
+            "scope": "all",
+            "action": "reject",
+            "field": context["selected_field"],
+            "query": context["query"],
+            "status": context["selected_status"],
+        })
+        expected = ArtistApplication.objects.filter(status__in=("PENDING", "ERROR"), name__icontains="신청자1").count()
+        self.assertEqual(ApplicationJob.objects.get().total, expected)
+        self.assertLess(expected, ArtistApplication.objects.filter(status__in=("PENDING", "ERROR")).count())
+
+    def test_apply_to_all_rejects_unknown_search_field(self):
+        response = self.client.post(
+            reverse("admin_panel:application_process"),
+            {"scope": "all", "action": "approve", "field": "", "query": "신청자1"},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(ApplicationJob.objects.exists())
+
+    def test_application_export(self):
+        rows = {}
+        for export_format in ("csv", "xlsx"):
+            response = self.request_within_budget(
+                3, reverse("admin_panel:application_export"), data={"format": export_format}
+            )
+            self.assertEqual(response.status_code, 200)
+            rows[export_format] = read_export(export_format, response.streamed)
+
+        applications = ArtistApplication.objects.order_by("-submitted_at", "-id")
+        self.assertEqual(rows["csv"][0][:3], ["신청 ID", "회원 ID", "이름"])
+        self.assertEqual(len(rows["csv"]), applications.count() + 1)
+        first = applications.first()
+        self.assertEqual(rows["csv"][1][:3], [str(first.pk), str(first.applicant_id), first.name])
+        self.assertEqual(rows["csv"][1][7], first.get_status_display())
+        self.assertEqual(rows["xlsx"], rows["csv"])
+
+    def test_artist_stats(self):
+        response = self.request_within_budget(4, reverse("admin_panel:artist_stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertUsesIndex(response.captured_queries, "artist_stats_recent", table="artist_artiststats")
+
+    def test_artist_stats_contact_search(self):
+        response = self.request_within_budget(
+            5, reverse("admin_panel:artist_stats"), data={"field": "email", "query": "@seed.test"}
+        )
+        self.assertEqual(response.context["paginator"].count, 30)
+        response = self.request_within_budget(
+            5, reverse("admin_panel:artist_stats"), data={"field": "phone", "query": "010-1012"}
+        )
+        self.assertEqual([row.name for row in response.context["artists"]], ["작가12"])
+        response = self.client.get(reverse("admin_panel:artist_stats"), {"field": "phone", "query": "1012"})
+        self.assertEqual([row.name for row in response.context["artists"]], ["작가12"])
+
+    def test_artist_stats_export(self):
+        response = self.request_within_budget(3, reverse("admin_panel:artist_stats_export"), data={"format": "csv"})
+        self.assertEqual(response.status_code, 200)
+        rows = read_export("csv", response.streamed)
+        self.assertEqual(len(rows), 31)
+        stats = ArtistStats.objects.select_related("artist").get(artist=self.seed.profile)
+        row = next(row for row in rows[1:] if row[0] == str(self.seed.profile.pk))
+        self.assertEqual(row[2:5], [stats.artist.name, str(stats.works_under_100_count), str(stats.exhibitions_count)])
+        self.assertEqual(row[6], str(stats.recent_works))
+
+    def test_process_and_job_status(self):
+        selected = list(
+            ArtistApplication.objects.filter(status="PENDING").order_by("pk").values_list("pk", flat=True)[:5]
+        )
+        response = self.request_within_budget(
+            3,
+            reverse("admin_panel:application_process"),
+            method="post",
+            data={"selected": selected, "action": "approve"},
+        )
+        job = ApplicationJob.objects.get()
+        self.assertRedirects(response, response.url, fetch_redirect_response=False)
+
+        while run_job_chunk(job.pk):
+            pass
+        response = self.request_within_budget(3, reverse("admin_panel:application_job", args=[job.pk]))
+        self.assertEqual(response.status_code, 200)
+        response = self.request_within_budget(3, reverse("admin_panel:application_job_status", args=[job.pk]))
+        self.assertEqual(response.json()["status"], "DONE")
+        self.assertEqual(sorted(response.json()["results"]["approved"]), selected)
+
+
+class ApplicationJobTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=8)
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.seed.admin)
+
+    def pending_ids(self):
+        return list(ArtistApplication.objects.filter(status="PENDING").order_by("pk").values_list("pk", flat=True))
+
+    def test_missing_ids_count_as_skipped(self):
+        pending = self.pending_ids()
+        job = create_job("reject", pending + [10_000_000], self.seed.admin)
+        while run_job_chunk(job.pk):
+            pass
+        job.refresh_from_db()
+        self.assertEqual(job.status, "DONE")
+        self.assertEqual(job.processed, job.total)
+        self.assertEqual(sorted(job.rejected), pending)
+        self.assertEqual(job.skipped, [10_000_000])
+
+    @override_settings(TASK_QUEUE_EAGER=False)
+    @mock.patch("admin_panel.jobs.JOB_CHUNK_SIZE", 2)
+    def test_job_status_reports_progress_per_chunk(self):
+        pending = self.pending_ids()
+        job = create_filter_job("reject", {"field": "", "query": "", "status": "PENDING"}, self.seed.admin)
+        status_url = reverse("admin_panel:application_job_status", args=[job.pk])
+        self.assertEqual(self.client.get(status_url).json()["total"], len(pending))
+
+        run_job_chunk(job.pk)
+        progress = self.client.get(status_url).json()
+        self.assertEqual((progress["status"], progress["processed"]), ("RUNNING", 2))
+        self.assertEqual(progress["counts"]["rejected"], 2)
+        self.assertNotIn("results", progress)
+
+        while run_job_chunk(job.pk):
+            pass
+        progress = self.client.get(status_url).json()
+        self.assertEqual((progress["status"], progress["processed"]), ("DONE", len(pending)))
+        self.assertEqual(sorted(progress["results"]["rejected"]), pending)
+
+    @mock.patch("admin_panel.jobs.JOB_CHUNK_SIZE", 1)
+    def test_filter_job_keeps_its_contact_match(self):
+        # "00" 은 한 명의 끝자리와 맞고 모두의 가운데와 맞는다. 처리 도중 부분 일치로 넓어지면 안 된다.
+        job = create_filter_job("reject", {"field": "phone", "query": "00", "status": ""}, self.seed.admin)
+        self.assertEqual(job.filters["match"], "anchored")
+        while run_job_chunk(job.pk):
+            pass
+        job.refresh_from_db()
+        self.assertEqual(job.rejected, [ArtistApplication.objects.get(applicant=self.seed.applicant).pk])
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    @mock.patch("admin_panel.jobs.JOB_CHUNK_SIZE", 2)
+    def test_eager_mode_processes_one_chunk_per_request(self):
+        pending = self.pending_ids()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("admin_panel:application_process"), {"selected": pending, "action": "approve"}
+            )
+        job = ApplicationJob.objects.get()
+        self.assertEqual((job.status, job.processed), ("RUNNING", 2))
+
+        status_url = reverse("admin_panel:application_job_status", args=[job.pk])
+        self.assertEqual(self.client.get(status_url).json()["processed"], 4)
+        self.assertEqual(self.client.get(status_url).json()["status"], "DONE")
+        job.refresh_from_db()
+        self.assertEqual(sorted(job.approved), pending)
+
+    @override_settings(TASK_QUEUE_EAGER=False)
+    def test_dead_worker_job_is_retried_then_failed(self):
+        self.assertGreater(run_application_job.max_attempts, 1)
+        job = create_job("reject", self.pending_ids(), self.seed.admin)
+        task = Task.objects.get(name=run_application_job.name)
+        self.assertEqual(recover_stalled_jobs(), 0)
+
+        # 다음 청크 작업을 넣기 전에 워커가 죽어 작업 행이 끝난 채로 남은 경우 다시 넣는다
+        Task.objects.filter(pk=task.pk).update(status="DONE")
+        ApplicationJob.objects.filter(pk=job.pk).update(status="RUNNING")
+        self.assertEqual(recover_stalled_jobs(), 1)
+        retry = Task.objects.filter(name=run_application_job.name, status="PENDING").get()
+        self.assertEqual(retry.args, [job.pk])
+
+        # 재시도를 모두 쓰고 잠금이 만료되면 작업 행도 일괄 처리도 실패로 닫힌다
+        Task.objects.filter(pk=retry.pk).update(
+            status="RUNNING", attempts=retry.max_attempts, locked_at=timezone.now() - timedelta(days=1)
+        )
+        fail_abandoned_tasks()
+        self.assertEqual(recover_stalled_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "FAILED")
+        self.assertTrue(job.error)
+        self.assertEqual(recover_stalled_jobs(), 0)
@@ -7,5 +7,9 @@ urlpatterns = [
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
     path("artist/applications/", views.ApplicationListView.as_view(), name="applications"),
     path("artist/applications/process/", views.ApplicationMultipleProcessView.as_view(), name="application_process"),
+    path("artist/applications/jobs/<int:pk>/", views.ApplicationJobView.as_view(), name="application_job"),
+    path("artist/applications/jobs/<int:pk>/status/", views.ApplicationJobStatusView.as_view(), name="application_job_status"),
+    path("artist/applications/export/", views.ApplicationExportView.as_view(), name="application_export"),
     path("artist/stats/", views.ArtistStatsListView.as_view(), name="artist_stats"),
+    path("artist/stats/export/", views.ArtistStatsExportView.as_view(), name="artist_stats_export"),
 ]
\ No newline at end of file
@@ -1,14 +1,23 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import ListView, View, TemplateView
-from django.shortcuts import redirect, reverse
-
-from artist.models import ArtistApplication, ArtistProfile
-from artist.service import process_multiple_approve, process_multiple_reject
-from django.db.models import Count, Avg, Max, Q, IntegerField, Min
-from django.db.models.functions import Coalesce
+from django.http import JsonResponse
+from django.views.generic import DetailView, ListView, View, TemplateView
+from django.shortcuts import get_object_or_404, redirect, reverse
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
+
+from accounts.throttle import throttle_counters
+from artist.models import ArtistApplication, ArtistStats, GENDER_CHOICES
+from artist.contacts import search_contacts
+from artist.counters import status_counts
+from core.pagination import CachedCountPaginator
+from core.projections import ProjectionMixin
+from .exports import export_response
+from .filters import CONTACT_FIELDS, filter_applications
+from .jobs import create_filter_job, create_job, run_job_chunk
+from .models import ApplicationJob
+from .projections import ApplicationRow, ArtistStatsRow
 from django.utils import timezone
-from datetime import timedelta
 
 
 class AdminOnlyMixin(UserPassesTestMixin):
@@ -19,36 +28,28 @@ class AdminOnlyMixin(UserPassesTestMixin):
         messages.error(self.request, "권한이 없는 사용자입니다.")
         return redirect("core:main")
 
-class ApplicationListView(LoginRequiredMixin, AdminOnlyMixin, ListView):
+class ApplicationListView(LoginRequiredMixin, AdminOnlyMixin, ProjectionMixin, ListView):
     model = ArtistApplication
+    projection = ApplicationRow
+    paginator_class = CachedCountPaginator
     template_name = "admin_panel/applications.html"
     context_object_name = "applications"
     paginate_by = 10
 
     def get_queryset(self):
-        queryset =  (
-            ArtistApplication.objects
-            .select_related("applicant", "processed_by")
-            .order_by("-submitted_at", "-id")
-        )
-
-        field = self.request.GET.get("field", "name").strip()
-        query = self.request.GET.get("query", "").strip()
-
-        if field and query:
-
-            if field == "name":
-                queryset = queryset.filter(name__icontains=query)
-
-            elif field == "email":
-                queryset = queryset.filter(email__icontains=query)
-
-            elif field == "phone":
-                queryset = queryset.filter(phone__icontains=query)
-            else:
-                messages.warning(self.request, "지원하지 않는 검색 필드입니다.")
-
-        return queryset
+        queryset = ArtistApplication.objects.order_by("-submitted_at", "-id")
+        try:
+            return filter_applications(queryset, **self.get_filters())
+        except ValueError as e:
+            messages.warning(self.request, str(e))
+            return queryset.none()
+
+    def get_filters(self):
+        return {
+            "field": self.request.GET.get("field", "name").strip(),
+            "query": self.request.GET.get("query", "").strip(),
+            "status": self.request.GET.get("status", "").strip(),
+        }
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -61,8 +62,12 @@ class ApplicationListView(LoginRequiredMixin, AdminOnlyMixin, ListView):
             on_each_side=1,
             on_ends=1
         )
-        context['selected_field'] = self.request.GET.get("field", "")
-        context['query'] = self.request.GET.get("query", "")
+        # 일괄 처리 폼도 목록과 같은 조건(기본값 포함)을 보내도록 get_filters() 결과를 그대로 쓴다
+        filters = self.get_filters()
+        context['selected_field'] = filters["field"]
+        context['query'] = filters["query"]
+        context['selected_status'] = filters["status"]
+        context['status_choices'] = ArtistApplication.STATUS_CHOICES
         return context
 
 
@@ -71,8 +76,9 @@ class ApplicationMultipleProcessView(LoginRequiredMixin, AdminOnlyMixin, View):
 
         selected = request.POST.getlist("selected")
         next_url = request.POST.get("next") or reverse("admin_panel:applications")
+        apply_to_all = request.POST.get("scope") == "all"
 
-        if not selected:
+        if not selected and not apply_to_all:
             messages.warning(request, "선택된 신청이 없습니다")
             return redirect(next_url)
 
@@ -86,30 +92,49 @@ class ApplicationMultipleProcessView(LoginRequiredMixin, AdminOnlyMixin, View):
             messages.error(request, "잘못된 작업입니다.")
             return redirect(next_url)
 
-        try:
-            selected = [int(x) for x in selected]
-        except ValueError:
-            messages.error(request, "잘못된 신청 ID가 포함되어 있습니다.")
-            return redirect(next_url)
+        if apply_to_all:
+            filters = {key: request.POST.get(key, "").strip() for key in ("field", "query", "status")}
+            try:
+                job = create_filter_job(action, filters, request.user)
+            except ValueError as e:
+                messages.error(request, str(e))
+                return redirect(next_url)
+        else:
+            try:
+                selected = [int(x) for x in selected]
+            except ValueError:
+                messages.error(request, "잘못된 신청 ID가 포함되어 있습니다.")
+                return redirect(next_url)
+            job = create_job(action, selected, request.user)
+
+        messages.success(
+            request, f"{job.get_action_display()} 작업 #{job.pk}({job.total}건)이 접수되었습니다. 진행 상황을 확인해주세요."
+        )
+        return redirect(f"{reverse('admin_panel:application_job', args=[job.pk])}?{urlencode({'next': next_url})}")
 
-        if action == 'approve':
-            result = process_multiple_approve(selected, request.user)
-            messages.success(
-                request,
-                f"승인 {len(result.approved)}건, 스킵 {len(result.skipped)}건, 실패 {len(result.failed)}건이 처리되었습니다."
-            )
-            return redirect(next_url)
 
-        if action == 'reject':
-            result = process_multiple_reject(selected, request.user)
-            messages.success(
-                request,
-                f"반려 {len(result.rejected)}건, 스킵 {len(result.skipped)}건이 정상적으로 처리되었습니다."
-            )
-            return redirect(next_url)
+class ApplicationJobView(LoginRequiredMixin, AdminOnlyMixin, DetailView):
+    model = ApplicationJob
+    template_name = "admin_panel/application_job.html"
+    context_object_name = "job"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        next_url = self.request.GET.get("next", "")
+        if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()}):
+            next_url = reverse("admin_panel:applications")
+        context["next_url"] = next_url
+        return context
 
-        messages.error(request, "알 수 없는 오류가 발생했습니다.")
-        return redirect(next_url)
+
+class ApplicationJobStatusView(LoginRequiredMixin, AdminOnlyMixin, View):
+    def get(self, request, pk):
+        job = get_object_or_404(ApplicationJob, pk=pk)
+        if getattr(settings, "TASK_QUEUE_EAGER", False) and job.status in ("PENDING", "RUNNING"):
+            # 워커가 없는 EAGER 모드에서는 진행 상황을 조회할 때마다 한 청크씩 처리한다
+            run_job_chunk(job.pk)
+            job.refresh_from_db()
+        return JsonResponse(job.as_progress(include_results=job.status in ("DONE", "FAILED")))
 
 
 class DashboardView(LoginRequiredMixin, AdminOnlyMixin, TemplateView):
@@ -117,56 +142,45 @@ class DashboardView(LoginRequiredMixin, AdminOnlyMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        pending = ArtistApplication.objects.filter(status="PENDING").count()
+        # 상태별 건수는 신청 테이블을 세지 않고 집계 테이블 한 번 조회로 읽는다
+        counts = status_counts()
 
         context.update({
             "admin_email": getattr(self.request.user, "email", ""),
-            "total_applications": ArtistApplication.objects.count(),
-            "approved_applications": ArtistApplication.objects.filter(status="APPROVED").count(),
-            "rejected_applications": ArtistApplication.objects.filter(status="REJECTED").count(),
-            "pending_applications": pending,
+            "total_applications": sum(counts.values()),
+            "approved_applications": counts["APPROVED"],
+            "rejected_applications": counts["REJECTED"],
+            "pending_applications": counts["PENDING"],
+            "login_throttle": throttle_counters(),
         })
         return context
 
 
-class ArtistStatsListView(ListView):
-    model = ArtistProfile
+class ArtistStatsListView(ProjectionMixin, ListView):
+    model = ArtistStats
+    projection = ArtistStatsRow
+    paginator_class = CachedCountPaginator
     template_name = "admin_panel/artist_stats.html"
     context_object_name = "artists"
     paginate_by = 10
 
     def get_queryset(self):
-
-        now = timezone.now()
         field = self.request.GET.get("field", "name").strip()
         query = self.request.GET.get("query", "").strip()
-        recent = now - timedelta(days=30)
 
-        queryset = ArtistProfile.objects.filter(is_approved=True)
+        # 작품/전시 변경 시 갱신되는 집계 테이블을 인덱스 순서대로 읽는다
+        queryset = ArtistStats.objects.filter(artist__is_approved=True)
 
         if field == "name":
-            queryset = queryset.filter(name__icontains=query)
+            queryset = queryset.filter(artist__name__icontains=query)
 
-        elif field == "email":
-            queryset = queryset.filter(email__icontains=query)
-
-        elif field == "phone":
-            queryset = queryset.filter(phone__icontains=query)
+        elif field in CONTACT_FIELDS:
+            if query:
+                queryset = search_contacts(queryset, field, query, prefix="artist__")
         else:
             messages.warning(self.request, "지원하지 않는 검색 필드입니다.")
 
-        queryset = (
-            queryset.annotate(
-                works_under_100_count=Count("artworks", filter=Q(artworks__size__lte=100), distinct=True,),
-                average_price=Coalesce(Avg("artworks__price"), 0, output_field=IntegerField()),
-                exhibitions_count=Count("exhibitions", distinct=True),
-                latest_apply_activity = Coalesce(Max("artworks__created_at"), Max("exhibitions__start_date")),
-                recent_works = Count("artworks",filter=Q(artworks__created_at__gte=recent),distinct=True),
-                min_price = Coalesce(Min("artworks__price"), 0, output_field=IntegerField()),
-                max_price = Coalesce(Max("artworks__price"), 0, output_field=IntegerField()),
-            ).order_by("-latest_apply_activity", "-id")
-        )
-        return queryset
+        return queryset.order_by("-latest_apply_activity", "-artist")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -181,4 +195,68 @@ class ArtistStatsListView(ListView):
         )
         context['selected_field'] = self.request.GET.get("field", "")
         context['query'] = self.request.GET.get("query", "")
-        return context
\ No newline at end of file
+        return context
+
+
+class ApplicationExportView(ApplicationListView):
+    export_columns = (
+        ("신청 ID", "id"),
+        ("회원 ID", "applicant_id"),
+        ("이름", "name"),
+        ("성별", "gender"),
+        ("생년월일", "birth_date"),
+        ("이메일", "email"),
+        ("연락처", "phone"),
+        ("상태", "status"),
+        ("신청일", "submitted_at"),
+        ("처리일", "processed_at"),
+    )
+
+    def get(self, request, *args, **kwargs):
+        lookups = [lookup for _, lookup in self.export_columns]
+        rows = self.get_queryset().values_list(*lookups).iterator(chunk_size=2000)
+        return export_response(
+            request.GET.get("format", "csv"),
+            f"applications-{timezone.localdate():%Y%m%d}",
+            [label for label, _ in self.export_columns],
+            self.humanize(rows),
+            sheet_name="작가 등록 신청",
+        )
+
+    def humanize(self, rows):
+        lookups = [lookup for _, lookup in self.export_columns]
+        displays = {
+            lookups.index("gender"): dict(GENDER_CHOICES),
+            lookups.index("status"): dict(ArtistApplication.STATUS_CHOICES),
+        }
+        for row in rows:
+            row = list(row)
+            for index, choices in displays.items():
+                row[index] = choices.get(row[index], row[index])
+            yield row
+
+
+class ArtistStatsExportView(LoginRequiredMixin, AdminOnlyMixin, ArtistStatsListView):
+    export_columns = (
+        ("작가 ID", "artist_id"),
+        ("회원 ID", "artist__user_id"),
+        ("이름", "artist__name"),
+        ("100호 이하 작품 수", "works_under_100_count"),
+        ("전시 수", "exhibitions_count"),
+        ("최근 활동일", "latest_apply_activity"),
+        ("최근 30일 신작", "recent_works"),
+        ("평균 가격", "average_price"),
+        ("최저 가격", "min_price"),
+        ("최고 가격", "max_price"),
+    )
+
+    def get(self, request, *args, **kwargs):
+        lookups = [lookup for _, lookup in self.export_columns]
+        rows = self.get_queryset().values_list(*lookups).iterator(chunk_size=2000)
+        return export_response(
+            request.GET.get("format", "csv"),
+            f"artist-stats-{timezone.localdate():%Y%m%d}",
+            [label for label, _ in self.export_columns],
+            rows,
+            sheet_name="작가 통계",
+        )
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ArtistConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artist'
+
+    def ready(self):
+        from core.cache import track_model_versions
+        from . import signals  # noqa: F401
+
+        track_model_versions(
+            self.get_model("ArtistProfile"), self.get_model("ArtistApplication"), self.get_model("ArtistStats")
+        )
@@ -0,0 +1,99 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+NON_DIGIT_RE = re.compile(r"\D")
+# anchored: 앞/뒤 일치(인덱스 범위), contains: 부분 일치(전체 스캔)
+CONTACT_MATCHES = ("anchored", "contains")
+
+
+def normalize_phone(phone):
+    return NON_DIGIT_RE.sub("", phone or "")
+
+
+def split_email(email):
+    local, _, domain = (email or "").strip().lower().rpartition("@")
+    if not local:
+        return domain, ""
+    return local, domain
+
+
+def contact_columns(email, phone):
+    digits = normalize_phone(phone)
+    local, domain = split_email(email)
+    return {
+        "phone_digits": digits,
+        "phone_reversed": digits[::-1],
+        "email_local": local,
+        "email_domain": domain,
+    }
+
+
+def prefix_range(lookup, prefix):
+    # 범위 비교는 바이트 순서로 비교할 때만 정확하다. 로케일 콜레이션은 구두점 순서가 달라 앞 일치 행을 놓칠 수 있다.
+    if connection.vendor != "sqlite":
+        # PostgreSQL 은 db_index 가 있는 CharField 에 varchar_pattern_ops 인덱스(_like)를 함께 만들어 LIKE 'x%' 가 이를 탄다
+        return Q(**{f"{lookup}__startswith": prefix})
+    # SQLite 의 LIKE 는 대소문자를 가리지 않아 BINARY 인덱스를 못 타므로 [prefix, 다음 문자열) 범위로 바꿔 찾는다
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f"{lookup}__gte": prefix, f"{lookup}__lt": upper})
+
+
+def phone_search_q(query, prefix=""):
+    digits = normalize_phone(query)
+    if not digits:
+        return Q(pk__in=[])
+    # 앞자리(010-1234) 또는 끝자리(5678) 검색
+    return prefix_range(f"{prefix}phone_digits", digits) | prefix_range(f"{prefix}phone_reversed", digits[::-1])
+
+
+def email_search_q(query, prefix=""):
+    query = (query or "").strip().lower()
+    if not query:
+        return Q()
+    if "@" not in query:
+        return prefix_range(f"{prefix}email_local", query) | prefix_range(f"{prefix}email_domain", query)
+    local, _, domain = query.rpartition("@")
+    if not local:
+        return prefix_range(f"{prefix}email_domain", domain) if domain else Q()
+    condition = Q(**{f"{prefix}email_local": local})
+    if domain:
+        condition &= prefix_range(f"{prefix}email_domain", domain)
+    return condition
+
+
+def contact_search_q(field, query, prefix=""):
+    if field == "email":
+        return email_search_q(query, prefix)
+    if field == "phone":
+        return phone_search_q(query, prefix)
+    raise ValueError(field)
+
+
+def contact_contains_q(field, query, prefix=""):
+    # 가운데 일부만 아는 검색어용 부분 일치. 인덱스를 쓰지 못해 테이블 전체를 훑는다.
+    if field == "email":
+        query = (query or "").strip()
+        return Q(**{f"{prefix}email__icontains": query}) if query else Q()
+    if field == "phone":
+        digits = normalize_phone(query)
+        return Q(**{f"{prefix}phone_digits__contains": digits}) if digits else Q(pk__in=[])
+    raise ValueError(field)
+
+
+def contact_match(queryset, field, query, prefix=""):
+    # 앞/뒤 일치(인덱스 범위)로 하나라도 찾으면 그 결과를 쓰고, 없을 때만 부분 일치로 넘어간다
+    if queryset.filter(contact_search_q(field, query, prefix)).exists():
+        return "anchored"
+    return "contains"
+
+
+def contact_q(field, query, prefix="", match="anchored"):
+    if match == "contains":
+        return contact_contains_q(field, query, prefix)
+    return contact_search_q(field, query, prefix)
+
+
+def search_contacts(queryset, field, query, prefix=""):
+    return queryset.filter(contact_q(field, query, prefix, contact_match(queryset, field, query, prefix)))
@@ -0,0 +1,52 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import ApplicationStatusCount, ArtistApplication
+
+
+def adjust_status_counts(deltas):
+    # 상태를 바꾸는 쪽의 트랜잭션 안에서 호출해야 롤백 시 카운터도 함께 되돌아간다
+    for status, delta in sorted(Counter(deltas).items()):
+        if not delta:
+            continue
+        counter = ApplicationStatusCount.objects.filter(status=status)
+        if counter.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ApplicationStatusCount.objects.create(status=status, count=delta)
+        except IntegrityError:
+            counter.update(count=F("count") + delta)
+
+
+def move_status_counts(from_statuses, to_status):
+    deltas = Counter()
+    for status in from_statuses:
+        deltas[status] -= 1
+        deltas[to_status] += 1
+    adjust_status_counts(deltas)
+
+
+def status_counts():
+    counts = {status: 0 for status, _ in ArtistApplication.STATUS_CHOICES}
+    counts.update(ApplicationStatusCount.objects.values_list("status", "count"))
+    return counts
+
+
+def reconcile_status_counts():
+    with transaction.atomic():
+        actual = dict(
+            ArtistApplication.objects.order_by().values_list("status").annotate(total=Count("id"))
+        )
+        stored = dict(ApplicationStatusCount.objects.select_for_update().values_list("status", "count"))
+        drift = {
+            status: actual.get(status, 0) - stored.get(status, 0)
+            for status in set(actual) | set(stored)
+            if actual.get(status, 0) != stored.get(status, 0)
+        }
+        for status, total in actual.items():
+            ApplicationStatusCount.objects.update_or_create(status=status, defaults={"count": total})
+        ApplicationStatusCount.objects.exclude(status__in=actual).delete()
+    return drift
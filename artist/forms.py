@@ -1,9 +1,12 @@
 from django import forms
+from django.db import transaction
 from django.core.validators import RegexValidator
 from .models import ArtistApplication
-from gallery.models import Artwork, Exhibition, ALLOWED_EXTENSIONS, ALLOWED_SIZE_MB
+from gallery.images import VerifiedImageField
+from .tasks import promote_direct_upload
+from .uploads import accept_uploaded_key
+from gallery.models import Artwork, Exhibition
 from django.core.exceptions import ValidationError
-import os
 
 PHONE_RE = r"^\d{3}-\d{3,4}-\d{4}$"
 
@@ -38,10 +41,50 @@ class ArtistApplicationForm(forms.ModelForm):
             "gender": "성별"
         }
 
-class ArtworkCreateForm(forms.ModelForm):
+    def save(self, commit=True):
+        if not commit:
+            return super().save(commit=False)
+        # 상태별 건수 카운터(post_save 신호)가 신청과 함께 커밋되도록 묶는다
+        with transaction.atomic():
+            return super().save()
+
+class DirectUploadFormMixin(forms.Form):
+    upload_kind = None
+
+    image_key = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean_image_key(self):
+        key = (self.cleaned_data.get("image_key") or "").strip()
+        self.direct_upload = None
+        if key and not self.cleaned_data.get("image"):
+            profile = getattr(self.user, "artistprofile", None)
+            if profile is None:
+                raise ValidationError("등록된 작가만 업로드할 수 있습니다.")
+            self.direct_upload = accept_uploaded_key(self.upload_kind, profile, key)
+        return key
+
+    def clean(self):
+        cleaned = super().clean()
+        # 브라우저가 스토리지로 직접 올린 경우에는 검증된 임시 업로드를 그대로 가리키고, 메타데이터 제거와 이동은 작업이 맡는다
+        if getattr(self, "direct_upload", None) is not None:
+            cleaned["image"] = cleaned["image_key"]
+            self.instance.image_width, self.instance.image_height = self.direct_upload
+        return cleaned
+
+    def save(self, commit=True):
+        instance = super().save(commit)
+        if commit and getattr(self, "direct_upload", None) is not None:
+            promote_direct_upload.delay(instance._meta.label, instance.pk, self.cleaned_data["image_key"])
+        return instance
+
+
+class ArtworkCreateForm(DirectUploadFormMixin, forms.ModelForm):
+    upload_kind = "artwork"
+
     class Meta:
         model = Artwork
         fields = ["title", "price", "size", "image"]
+        field_classes = {"image": VerifiedImageField}
         labels = {
             "title": "작품 제목",
             "price": "작품 가격",
@@ -94,22 +137,17 @@ class ArtworkCreateForm(forms.ModelForm):
             raise ValidationError("작품의 호수는 1 이상 500 이하의 정수여야 합니다.")
         return size
 
-    def clean_image(self):
-        image = self.cleaned_data.get("image")
-        if image:
-            ext = os.path.splitext(image.name)[1].lower()
-            if ext not in ALLOWED_EXTENSIONS:
-                raise ValidationError(f"허용된 이미지 형식이 아닙니다: {', '.join(ALLOWED_EXTENSIONS)}")
-
-            if image.size > ALLOWED_SIZE_MB * 1024 * 1024:
-                raise ValidationError(f"이미지 파일 크기는 {ALLOWED_SIZE_MB}MB 이하만 가능합니다.")
-        return image
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop("user", None)
+        super().__init__(*args, **kwargs)
 
-class ExhibitionCreateForm(forms.ModelForm):
+class ExhibitionCreateForm(DirectUploadFormMixin, forms.ModelForm):
+    upload_kind = "exhibition"
 
     class Meta:
         model = Exhibition
         fields = ["title", "start_date", "end_date", "artworks", "image"]
+        field_classes = {"image": VerifiedImageField}
         labels = {
             "title": "전시 제목",
             "start_date": "전시 시작일",
@@ -140,9 +178,9 @@ class ExhibitionCreateForm(forms.ModelForm):
         self.user = kwargs.pop("user", None)
         super().__init__(*args, **kwargs)
         if self.user is not None:
-            profile = getattr(self.user, "artistprofile", None)
+            # 작가 프로필을 따로 읽지 않고 회원 ID 로 바로 거른다
             self.fields["artworks"].queryset = (
-                Artwork.objects.filter(artist=profile).order_by("-id") if profile else Artwork.objects.none()
+                Artwork.objects.filter(artist__user_id=self.user.pk).select_related("artist").order_by("-id")
             )
         else:
             self.fields["artworks"].queryset = Artwork.objects.none()
@@ -155,17 +193,6 @@ class ExhibitionCreateForm(forms.ModelForm):
             raise ValidationError("전시 제목은 64자 이하로 입력해주세요.")
         return title
 
-    def clean_image(self):
-        image = self.cleaned_data.get("image")
-        if image:
-            ext = os.path.splitext(image.name)[1].lower()
-            if ext not in ALLOWED_EXTENSIONS:
-                raise ValidationError(f"허용된 이미지 형식이 아닙니다: {', '.join(ALLOWED_EXTENSIONS)}")
-
-            if image.size > ALLOWED_SIZE_MB * 1024 * 1024:
-                raise ValidationError(f"이미지 파일 크기는 {ALLOWED_SIZE_MB}MB 이하만 가능합니다.")
-        return image
-
     def clean(self):
         cleaned = super().clean()
         start = cleaned.get("start_date")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from artist.counters import reconcile_status_counts
+
+
+class Command(BaseCommand):
+    help = "작가 신청 상태별 건수 집계를 실제 신청 데이터와 맞춥니다. (워커가 하루 한 번 자동 실행)"
+
+    def handle(self, *args, **options):
+        drift = reconcile_status_counts()
+        for status, delta in sorted(drift.items()):
+            self.stdout.write(f"{status}: {delta:+d}")
+        self.stdout.write(self.style.SUCCESS(f"상태별 건수 집계를 보정했습니다. (어긋난 상태 {len(drift)}개)"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from artist.stats import refresh_stale_stats
+
+
+class Command(BaseCommand):
+    help = "최근 30일 신작 수가 바뀐 작가의 통계를 다시 계산합니다. (워커가 한 시간마다 자동 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="모든 작가의 통계를 다시 계산합니다.")
+
+    def handle(self, *args, **options):
+        count = refresh_stale_stats(everything=options["all"])
+        self.stdout.write(self.style.SUCCESS(f"작가 통계 {count}건을 갱신했습니다."))
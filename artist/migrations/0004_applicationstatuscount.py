@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:59
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_status_counts(apps, schema_editor):
+    ArtistApplication = apps.get_model("artist", "ArtistApplication")
+    ApplicationStatusCount = apps.get_model("artist", "ApplicationStatusCount")
+    rows = ArtistApplication.objects.order_by().values_list("status").annotate(total=Count("id"))
+    ApplicationStatusCount.objects.bulk_create(
+        [ApplicationStatusCount(status=status, count=total) for status, total in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artist', '0003_remove_artistapplication_unique_artist_application_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusCount',
+            fields=[
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('PROCESSING', '처리중'), ('APPROVED', '승인'), ('REJECTED', '반려'), ('ERROR', '오류')], max_length=10, primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_status_counts, migrations.RunPython.noop),
+    ]
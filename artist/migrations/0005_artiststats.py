@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:02
+
+from datetime import datetime, time, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Max, Min, Q
+from django.utils import timezone
+
+
+def fill_artist_stats(apps, schema_editor):
+    ArtistProfile = apps.get_model("artist", "ArtistProfile")
+    ArtistStats = apps.get_model("artist", "ArtistStats")
+    Artwork = apps.get_model("gallery", "Artwork")
+    Exhibition = apps.get_model("gallery", "Exhibition")
+
+    recent = timezone.now() - timedelta(days=30)
+    stats = {pk: ArtistStats(artist_id=pk) for pk in ArtistProfile.objects.values_list("pk", flat=True)}
+    works = Artwork.objects.order_by().values("artist_id").annotate(
+        under_100=Count("id", filter=Q(size__lte=100)),
+        average=Avg("price"),
+        low=Min("price"),
+        high=Max("price"),
+        latest=Max("created_at"),
+        recent=Count("id", filter=Q(created_at__gte=recent)),
+        oldest_recent=Min("created_at", filter=Q(created_at__gte=recent)),
+    )
+    for row in works:
+        row_stats = stats[row["artist_id"]]
+        row_stats.works_under_100_count = row["under_100"]
+        row_stats.average_price = int(row["average"] or 0)
+        row_stats.min_price = row["low"] or 0
+        row_stats.max_price = row["high"] or 0
+        row_stats.latest_apply_activity = row["latest"]
+        row_stats.recent_works = row["recent"]
+        if row["oldest_recent"] is not None:
+            row_stats.recent_expires_at = row["oldest_recent"] + timedelta(days=30)
+    exhibitions = Exhibition.objects.order_by().values_list("artist_id").annotate(Count("id"), Max("start_date"))
+    for artist_id, count, latest in exhibitions:
+        stats[artist_id].exhibitions_count = count
+        if stats[artist_id].latest_apply_activity is None:
+            stats[artist_id].latest_apply_activity = timezone.make_aware(datetime.combine(latest, time.min))
+    ArtistStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artist', '0004_applicationstatuscount'),
+        ('gallery', '0006_image_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistStats',
+            fields=[
+                ('artist', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='artist.artistprofile')),
+                ('works_under_100_count', models.PositiveIntegerField(default=0)),
+                ('average_price', models.IntegerField(default=0)),
+                ('min_price', models.IntegerField(default=0)),
+                ('max_price', models.IntegerField(default=0)),
+                ('exhibitions_count', models.PositiveIntegerField(default=0)),
+                ('latest_apply_activity', models.DateTimeField(blank=True, null=True)),
+                ('recent_works', models.PositiveIntegerField(default=0)),
+                ('recent_expires_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-latest_apply_activity', '-artist'], name='artist_stats_recent')],
+            },
+        ),
+        migrations.RunPython(fill_artist_stats, migrations.RunPython.noop),
+    ]
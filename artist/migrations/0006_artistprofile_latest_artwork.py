@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:07
+
+from django.db import migrations, models
+
+
+def fill_latest_artwork(apps, schema_editor):
+    ArtistProfile = apps.get_model("artist", "ArtistProfile")
+    Artwork = apps.get_model("gallery", "Artwork")
+    with_image = (
+        Artwork.objects.exclude(image="")
+        .filter(image__isnull=False)
+        .order_by("-created_at", "-id")
+        .values_list("image", "image_renditions", "image_color", "image_placeholder")
+    )
+    for artist_id in ArtistProfile.objects.values_list("pk", flat=True).iterator(chunk_size=500):
+        latest = with_image.filter(artist_id=artist_id).first()
+        if latest is None:
+            continue
+        image, renditions, color, placeholder = latest
+        ArtistProfile.objects.filter(pk=artist_id).update(
+            latest_artwork_image=image,
+            latest_artwork_renditions=renditions or {},
+            latest_artwork_color=color,
+            latest_artwork_placeholder=placeholder,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artist', '0005_artiststats'),
+        ('gallery', '0006_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artistprofile',
+            name='latest_artwork_color',
+            field=models.CharField(blank=True, default='', editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='latest_artwork_image',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='latest_artwork_placeholder',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='latest_artwork_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(fill_latest_artwork, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:09
+
+import re
+
+from django.db import migrations, models
+
+
+def fill_contact_columns(apps, schema_editor):
+    for model_name in ("ArtistProfile", "ArtistApplication"):
+        model = apps.get_model("artist", model_name)
+        rows = []
+        for row in model.objects.only("pk", "email", "phone").iterator(chunk_size=1000):
+            digits = re.sub(r"\D", "", row.phone or "")
+            local, _, domain = (row.email or "").strip().lower().rpartition("@")
+            row.phone_digits, row.phone_reversed = digits, digits[::-1]
+            row.email_local, row.email_domain = (local, domain) if local else (domain, "")
+            rows.append(row)
+        model.objects.bulk_update(
+            rows, ["phone_digits", "phone_reversed", "email_local", "email_domain"], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artist', '0006_artistprofile_latest_artwork'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artistapplication',
+            name='email_domain',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='artistapplication',
+            name='email_local',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='artistapplication',
+            name='phone_digits',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=13),
+        ),
+        migrations.AddField(
+            model_name='artistapplication',
+            name='phone_reversed',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=13),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='email_domain',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='email_local',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='phone_digits',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=13),
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='phone_reversed',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=13),
+        ),
+        migrations.RunPython(fill_contact_columns, migrations.RunPython.noop),
+    ]
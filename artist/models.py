@@ -3,6 +3,8 @@ from django.core.validators import RegexValidator
 from django.conf import settings
 from django.db.models import UniqueConstraint, Q
 
+from .contacts import contact_columns
+
 GENDER_CHOICES = (("M", "남자"), ("F", "여자"))
 
 phone_validator = RegexValidator(
@@ -10,7 +12,29 @@ phone_validator = RegexValidator(
     message="연락처는 000-0000-0000 또는 000-000-0000 형식이어야 합니다.",
 )
 
-class ArtistProfile(models.Model):
+class ContactSearchFields(models.Model):
+    # 검색용 정규화 컬럼: 숫자만 남긴 연락처(앞/뒤집은 순서), 소문자 이메일 로컬/도메인
+    phone_digits = models.CharField(max_length=13, blank=True, default="", editable=False, db_index=True)
+    phone_reversed = models.CharField(max_length=13, blank=True, default="", editable=False, db_index=True)
+    email_local = models.CharField(max_length=254, blank=True, default="", editable=False, db_index=True)
+    email_domain = models.CharField(max_length=254, blank=True, default="", editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def fill_contact_columns(self):
+        for field, value in contact_columns(self.email, self.phone).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.fill_contact_columns()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"email", "phone"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "phone_digits", "phone_reversed", "email_local", "email_domain"}
+        super().save(*args, **kwargs)
+
+
+class ArtistProfile(ContactSearchFields):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=16)
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES)
@@ -19,6 +43,11 @@ class ArtistProfile(models.Model):
     phone = models.CharField(max_length=13, validators=[phone_validator,])
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # 작가 목록 썸네일용으로 이미지가 있는 가장 최근 작품의 이미지 정보를 복사해 둔다
+    latest_artwork_image = models.CharField(max_length=100, blank=True, default="", editable=False)
+    latest_artwork_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    latest_artwork_color = models.CharField(max_length=7, blank=True, default="", editable=False)
+    latest_artwork_placeholder = models.TextField(blank=True, default="", editable=False)
 
     class Meta:
         ordering = ["-created_at", "-id"]
@@ -29,7 +58,7 @@ class ArtistProfile(models.Model):
     def __str__(self):
         return f"{self.name} ({self.user.email})"
 
-class ArtistApplication(models.Model):
+class ArtistApplication(ContactSearchFields):
     STATUS_CHOICES = (("PENDING", "대기"), ("PROCESSING", "처리중"), ("APPROVED", "승인"), ("REJECTED", "반려"),
                       ("ERROR", "오류"))
     applicant = models.ForeignKey(
@@ -66,3 +95,40 @@ class ArtistApplication(models.Model):
     def __str__(self):
         return f"{self.name} / {self.get_status_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장 시 상태별 건수 카운터를 옮길 수 있도록 불러온 상태를 기억해 둔다
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+
+
+class ApplicationStatusCount(models.Model):
+    status = models.CharField(max_length=10, primary_key=True, choices=ArtistApplication.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.get_status_display()}: {self.count}"
+
+
+class ArtistStats(models.Model):
+    artist = models.OneToOneField(ArtistProfile, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    works_under_100_count = models.PositiveIntegerField(default=0)
+    average_price = models.IntegerField(default=0)
+    min_price = models.IntegerField(default=0)
+    max_price = models.IntegerField(default=0)
+    exhibitions_count = models.PositiveIntegerField(default=0)
+    latest_apply_activity = models.DateTimeField(null=True, blank=True)
+    recent_works = models.PositiveIntegerField(default=0)
+    # 최근 30일 신작 수가 처음으로 줄어드는 시각 (주기 갱신 대상)
+    recent_expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-latest_apply_activity", "-artist"], name="artist_stats_recent"),
+        ]
+
+    def __str__(self):
+        return f"{self.artist_id} 통계"
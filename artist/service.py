@@ -1,6 +1,17 @@
+import logging
+
 from django.db import transaction, IntegrityError
 from django.utils import timezone
-from .models import ArtistApplication, ArtistProfile
+from accounts.roles import bump_role_version
+from core.cache import bump_model_version
+from .counters import move_status_counts
+from .models import ArtistApplication, ArtistProfile, ArtistStats
+
+APPROVE_CHUNK_SIZE = 500
+PROFILE_EXISTS_MESSAGE = "이미 프로필이 존재합니다."
+PROFILE_FIELDS = ("name", "gender", "birth_date", "email", "phone")
+
+logger = logging.getLogger(__name__)
 
 
 class ProcessResult:
@@ -41,7 +52,7 @@ def process_single_application(application, admin_user):
 
         application.status = "APPROVED"
         if not created:
-            application.last_error_message = "이미 프로필이 존재합니다."
+            application.last_error_message = PROFILE_EXISTS_MESSAGE
             application.save(update_fields=["status", "last_error_message"])
             return "SKIPPED"
 
@@ -49,26 +60,111 @@ def process_single_application(application, admin_user):
         return "APPROVED"
 
 
+def _approve_one(application_id, admin_user, result):
+    try:
+        return_message = process_single_application(ArtistApplication(pk=application_id), admin_user)
+        if return_message == "APPROVED":
+            result.approved.append(application_id)
+        else:
+            result.skipped.append(application_id)
+    except IntegrityError as e:
+        _mark_error(application_id, f"IntegrityError: {e}")
+        result.failed.append(application_id)
+    except Exception as e:
+        _mark_error(application_id, f"Error: {e}")
+        result.failed.append(application_id)
+
+
+def _mark_error(application_id, message):
+    with transaction.atomic():
+        statuses = list(
+            ArtistApplication.objects.select_for_update().filter(pk=application_id).values_list("status", flat=True)
+        )
+        ArtistApplication.objects.filter(pk=application_id).update(status="ERROR", last_error_message=message)
+        move_status_counts(statuses, "ERROR")
+
+
+def _approve_chunk(application_ids, admin_user, result):
+    with transaction.atomic():
+        applications = list(
+            ArtistApplication.objects.select_for_update()
+            .filter(pk__in=application_ids)
+            .only("id", "status", "applicant_id", *PROFILE_FIELDS)
+        )
+        eligible = [app for app in applications if app.status in ("PENDING", "ERROR")]
+        skipped = [app.id for app in applications if app.status not in ("PENDING", "ERROR")]
+
+        applicant_ids = {app.applicant_id for app in eligible}
+        # 이미 있는 프로필은 잠가 두어 처리하는 동안 지워지거나 바뀌지 않게 한다
+        existing = set(
+            ArtistProfile.objects.select_for_update().filter(user_id__in=applicant_ids).values_list("user_id", flat=True)
+        )
+        creating = {}
+        for app in eligible:
+            if app.applicant_id not in existing and app.applicant_id not in creating:
+                creating[app.applicant_id] = app
+        profiles = [
+            ArtistProfile(user_id=app.applicant_id, is_approved=True,
+                          **{field: getattr(app, field) for field in PROFILE_FIELDS})
+            for app in creating.values()
+        ]
+        # bulk_create 는 save() 를 거치지 않으므로 검색용 연락처 컬럼을 직접 채운다
+        for profile in profiles:
+            profile.fill_contact_columns()
+        try:
+            with transaction.atomic():
+                ArtistProfile.objects.bulk_create(profiles)
+        except IntegrityError:
+            # 그 사이 다른 경로로 같은 회원의 프로필이 만들어졌다. 어느 행이 우리 것인지 내용으로 짐작하지 않고
+            # 새로 만들 신청 전부를 개별 처리로 넘긴다.
+            approved, approved_users = [], []
+            conflicted = [app.id for app in creating.values()]
+        else:
+            approved = [app.id for app in creating.values()]
+            approved_users = list(creating)
+            conflicted = []
+        # bulk_create 는 post_save 를 보내지 않으므로 작가 통계 행도 직접 만든다
+        ArtistStats.objects.bulk_create(
+            [
+                ArtistStats(artist_id=profile_id)
+                for profile_id in ArtistProfile.objects.filter(user_id__in=approved_users).values_list("pk", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+        existing_profile = [app.id for app in eligible if app.id not in approved and app.id not in conflicted]
+
+        now = timezone.now()
+        ArtistApplication.objects.filter(pk__in=approved).update(
+            status="APPROVED", processed_by=admin_user, processed_at=now, last_error_message=""
+        )
+        ArtistApplication.objects.filter(pk__in=existing_profile).update(
+            status="APPROVED", processed_by=admin_user, processed_at=now, last_error_message=PROFILE_EXISTS_MESSAGE
+        )
+        # 세션에 저장된 역할 정보를 다시 읽도록 새로 승인된 회원의 역할 버전을 올린다
+        bump_role_version(*approved_users)
+        changed = set(approved) | set(existing_profile)
+        move_status_counts([app.status for app in eligible if app.id in changed], "APPROVED")
+
+    result.approved.extend(approved)
+    result.skipped.extend(skipped + existing_profile)
+    return conflicted
+
+
 def process_multiple_approve(application_ids, admin_user):
     result = ProcessResult()
-    application_ids = [int(x) for x in application_ids]
-    for app in ArtistApplication.objects.filter(pk__in=application_ids).only("id"):
+    application_ids = sorted({int(x) for x in application_ids})
+    for start in range(0, len(application_ids), APPROVE_CHUNK_SIZE):
+        chunk = application_ids[start:start + APPROVE_CHUNK_SIZE]
         try:
-            return_message = process_single_application(app, admin_user)
-            if return_message == "APPROVED":
-                result.approved.append(app.id)
-            else:
-                result.skipped.append(app.id)
-        except IntegrityError as e:
-            ArtistApplication.objects.filter(pk=app.id).update(
-                status="ERROR", last_error_message=f"IntegrityError: {e}"
-            )
-            result.failed.append(app.id)
-        except Exception as e:
-            ArtistApplication.objects.filter(pk=app.id).update(
-                status="ERROR", last_error_message=f"Error: {e}"
-            )
-            result.failed.append(app.id)
+            fallback = _approve_chunk(chunk, admin_user, result)
+        except Exception:
+            # 일괄 처리 자체가 실패하면 기존처럼 한 건씩 처리해 실패한 신청만 ERROR 로 남긴다
+            logger.exception("일괄 승인 실패, 한 건씩 다시 처리합니다: %s", chunk)
+            fallback = ArtistApplication.objects.filter(pk__in=chunk).values_list("id", flat=True)
+        for application_id in fallback:
+            _approve_one(application_id, admin_user, result)
+
+    bump_model_version(ArtistApplication, ArtistProfile)
     return result
 
 def process_multiple_reject(application_ids, admin_user):
@@ -78,12 +174,15 @@ def process_multiple_reject(application_ids, admin_user):
     with transaction.atomic():
         applications = (ArtistApplication.objects.select_for_update().filter(pk__in=application_ids,
                                                                                  status__in=["PENDING", "ERROR"]))
-        processed = list(applications.values_list('id', flat=True))
-        applications.update(
+        rows = list(applications.values_list('id', 'status'))
+        processed = [application_id for application_id, _ in rows]
+        ArtistApplication.objects.filter(pk__in=processed).update(
             status="REJECTED",
             processed_by=admin_user,
             processed_at=timezone.now(),
         )
+        move_status_counts([status for _, status in rows], "REJECTED")
+        bump_model_version(ArtistApplication)
 
     result.rejected.extend(processed)
     result.skipped.extend(set(application_ids) - set(processed))
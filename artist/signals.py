@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.roles import bump_role_version
+from gallery.models import Artwork, Exhibition
+
+from . import tasks
+from .counters import adjust_status_counts, move_status_counts
+from .models import ArtistApplication, ArtistProfile, ArtistStats
+
+
+@receiver(post_save, sender=ArtistProfile)
+def create_artist_stats(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    ArtistStats.objects.get_or_create(artist=instance)
+
+
+@receiver(post_save, sender=ArtistProfile)
+@receiver(post_delete, sender=ArtistProfile)
+def invalidate_user_role(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_role_version(instance.user_id)
+
+
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Exhibition)
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Exhibition)
+def schedule_artist_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    tasks.refresh_artist_stats.delay(instance.artist_id)
+
+
+# 관리자 화면 수정, 삭제, 회원 삭제에 따른 CASCADE 까지 모델 저장/삭제를 거치는 변경은 여기서 카운터에 반영한다.
+# 쿼리셋 update 로 상태를 바꾸는 일괄 처리는 service 에서 직접 옮기고, 남는 어긋남은 주기 보정 작업이 맞춘다.
+@receiver(pre_save, sender=ArtistApplication)
+def remember_application_status(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or getattr(instance, "_loaded_status", None):
+        return
+    instance._loaded_status = sender.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+
+
+@receiver(post_save, sender=ArtistApplication)
+def count_application_status(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    previous = None if created else getattr(instance, "_loaded_status", None)
+    if previous is None:
+        adjust_status_counts({instance.status: 1})
+    elif previous != instance.status:
+        move_status_counts([previous], instance.status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=ArtistApplication)
+def uncount_application_status(sender, instance, **kwargs):
+    adjust_status_counts({instance.status: -1})
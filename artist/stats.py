@@ -0,0 +1,99 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q
+from django.utils import timezone
+
+from core.cache import bump_model_version
+from gallery.models import Artwork, Exhibition
+
+from .models import ArtistProfile, ArtistStats
+
+RECENT_DAYS = 30
+STATS_CHUNK_SIZE = 500
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def collect_artist_stats(artist_ids, now=None):
+    # 작품과 전시를 따로 집계해 두 테이블을 조인할 때 생기는 행 증폭을 피한다
+    now = now or timezone.now()
+    recent = now - timedelta(days=RECENT_DAYS)
+    works = (
+        Artwork.objects.filter(artist_id__in=artist_ids)
+        .order_by()
+        .values("artist_id")
+        .annotate(
+            works_under_100_count=Count("id", filter=Q(size__lte=100)),
+            average_price=Avg("price"),
+            min_price=Min("price"),
+            max_price=Max("price"),
+            latest_artwork=Max("created_at"),
+            recent_works=Count("id", filter=Q(created_at__gte=recent)),
+            oldest_recent=Min("created_at", filter=Q(created_at__gte=recent)),
+        )
+    )
+    exhibitions = (
+        Exhibition.objects.filter(artist_id__in=artist_ids)
+        .order_by()
+        .values_list("artist_id")
+        .annotate(count=Count("id"), latest=Max("start_date"))
+    )
+
+    stats = {artist_id: ArtistStats(artist_id=artist_id) for artist_id in artist_ids}
+    for row in works:
+        row_stats = stats[row["artist_id"]]
+        row_stats.works_under_100_count = row["works_under_100_count"]
+        row_stats.average_price = int(row["average_price"] or 0)
+        row_stats.min_price = row["min_price"] or 0
+        row_stats.max_price = row["max_price"] or 0
+        row_stats.latest_apply_activity = row["latest_artwork"]
+        row_stats.recent_works = row["recent_works"]
+        if row["oldest_recent"] is not None:
+            row_stats.recent_expires_at = row["oldest_recent"] + timedelta(days=RECENT_DAYS)
+    for artist_id, count, latest in exhibitions:
+        stats[artist_id].exhibitions_count = count
+        # 작품이 없는 작가는 가장 최근 전시 시작일을 활동일로 본다
+        if stats[artist_id].latest_apply_activity is None:
+            stats[artist_id].latest_apply_activity = _start_of_day(latest)
+    return stats
+
+
+def refresh_artist_stats(artist_ids, now=None):
+    artist_ids = sorted(set(artist_ids))
+    refreshed = 0
+    for start in range(0, len(artist_ids), STATS_CHUNK_SIZE):
+        chunk = artist_ids[start:start + STATS_CHUNK_SIZE]
+        with transaction.atomic():
+            # 작가 행을 잠가 같은 작가의 갱신이 겹쳐도 오래된 집계가 나중에 덮어쓰지 않게 한다
+            existing = list(
+                ArtistProfile.objects.select_for_update().filter(pk__in=chunk).values_list("pk", flat=True)
+            )
+            stats = list(collect_artist_stats(existing, now).values())
+            ArtistStats.objects.bulk_create(
+                stats,
+                update_conflicts=True,
+                unique_fields=["artist"],
+                update_fields=[
+                    "works_under_100_count", "average_price", "min_price", "max_price", "exhibitions_count",
+                    "latest_apply_activity", "recent_works", "recent_expires_at", "refreshed_at",
+                ],
+            )
+        refreshed += len(stats)
+    if refreshed:
+        bump_model_version(ArtistStats)
+    return refreshed
+
+
+def refresh_stale_stats(now=None, everything=False):
+    now = now or timezone.now()
+    if everything:
+        artist_ids = ArtistProfile.objects.values_list("pk", flat=True)
+    else:
+        # 30일 창을 벗어난 신작이 있는 작가와 아직 집계 행이 없는 작가만 다시 계산한다
+        artist_ids = ArtistProfile.objects.filter(
+            Q(stats__recent_expires_at__lte=now) | Q(stats__isnull=True)
+        ).values_list("pk", flat=True)
+    return refresh_artist_stats(list(artist_ids), now)
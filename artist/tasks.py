@@ -0,0 +1,34 @@
+from django.apps import apps
+
+from core.tasks import task
+
+from . import counters, stats, uploads
+
+
+@task(max_attempts=5)
+def refresh_artist_stats(artist_id):
+    stats.refresh_artist_stats([artist_id])
+
+
+@task(max_attempts=3, every=60 * 60)
+def refresh_stale_artist_stats():
+    # 신작이 30일 창을 벗어나도 쓰기가 없으면 갱신되지 않으므로 워커가 한 시간마다 따라잡는다
+    stats.refresh_stale_stats()
+
+
+@task(max_attempts=5)
+def promote_direct_upload(model_label, pk, name):
+    # 직접 업로드를 메타데이터를 지운 정식 경로 파일로 바꾼다
+    uploads.promote_uploaded_key(apps.get_model(model_label), pk, name)
+
+
+@task(max_attempts=3, every=60 * 60)
+def purge_stale_uploads():
+    if uploads.direct_uploads_enabled():
+        uploads.purge_stale_uploads()
+
+
+@task(max_attempts=3, every=24 * 60 * 60)
+def reconcile_application_counts():
+    # 신호를 거치지 않는 일괄 쓰기(bulk_create, 직접 SQL)로 생긴 어긋남을 하루 한 번 맞춘다
+    counters.reconcile_status_counts()
@@ -1,3 +1,288 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+import boto3
+import requests
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from moto import mock_aws
+from PIL import Image
+
+from core.models import Task
+from core.testing import QueryBudgetMixin, seed_dataset
+from gallery.models import Artwork
+
+from .counters import reconcile_status_counts, status_counts
+from . import contacts, service
+from .contacts import search_contacts
+from .models import ArtistApplication, ArtistProfile
+from .service import PROFILE_EXISTS_MESSAGE, PROFILE_FIELDS, process_multiple_approve
+from .tasks import promote_direct_upload
+from .uploads import purge_stale_uploads
+
+
+class ArtistQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset()
+
+    def test_dashboard(self):
+        self.login(self.seed.artist)
+        response = self.request_within_budget(5, reverse("artist:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["artworks_count"], 8)
+        self.assertUsesIndex(response.captured_queries, "art_by_artist_recent", table="gallery_artwork")
+        self.assertUsesIndex(response.captured_queries, "exhibitions_by_artist_recent", table="gallery_exhibition")
+
+    def test_artwork_apply_form(self):
+        self.login(self.seed.artist)
+        response = self.request_within_budget(2, reverse("artist:artwork_apply"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_exhibition_apply_form(self):
+        self.login(self.seed.artist)
+        response = self.request_within_budget(4, reverse("artist:exhibition_apply"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_application_form(self):
+        self.login(self.seed.member)
+        response = self.request_within_budget(3, reverse("artist:apply"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_application_submit(self):
+        self.login(self.seed.member)
+        before = status_counts()["PENDING"]
+        response = self.request_within_budget(
+            8,
+            reverse("artist:apply"),
+            method="post",
+            data={
+                "name": "새 작가",
+                "gender": "F",
+                "birth_date": "1995-05-05",
+                "email": "member@seed.test",
+                "phone": "010-5555-6666",
+            },
+        )
+        self.assertRedirects(response, reverse("core:main"), fetch_redirect_response=False)
+        self.assertTrue(ArtistApplication.objects.filter(applicant=self.seed.member, status="PENDING").exists())
+        self.assertEqual(status_counts()["PENDING"], before + 1)
+
+    def test_direct_upload_disabled(self):
+        self.login(self.seed.artist)
+        response = self.request_within_budget(
+            2, reverse("artist:direct_upload"), method="post", data={"kind": "artwork", "filename": "a.jpg"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class ApplicationStatusCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=0, exhibitions_per_artist=0, applications=8)
+
+    def assertCountsMatch(self):
+        self.assertEqual(reconcile_status_counts(), {})
+
+    def test_model_saves_and_deletes_move_counters(self):
+        application = ArtistApplication.objects.filter(status="PENDING").first()
+        application.status = "REJECTED"
+        application.save()
+        self.assertCountsMatch()
+
+        ArtistApplication.objects.filter(status="ERROR").first().delete()
+        self.assertCountsMatch()
+
+    def test_user_cascade_delete_moves_counters(self):
+        before = status_counts()["PENDING"]
+        self.seed.applicant.delete()
+        self.assertEqual(status_counts()["PENDING"], before - 1)
+        self.assertCountsMatch()
+
+
+
+class ContactSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(artists=1, artworks_per_artist=0, exhibitions_per_artist=0, applications=7)
+        locals_ = ["kim.a", "kim-a", "kim_a", "kim/a", "kim0", "kima", "kim"]
+        for application, local in zip(ArtistApplication.objects.order_by("pk"), locals_):
+            application.email = f"{local}@x.test"
+            application.save()
+
+    def test_prefix_matches_around_punctuation(self):
+        emails = list(ArtistApplication.objects.values_list("email", flat=True))
+        # PostgreSQL 경로(LIKE 앞 일치)도 같은 결과를 내는지 함께 본다
+        for vendor in ("sqlite", "postgresql"):
+            for query in ("kim.", "kim-", "kim_", "kim/", "kim0", "kim"):
+                with self.subTest(vendor=vendor, query=query), mock.patch.object(contacts.connection, "vendor", vendor):
+                    found = search_contacts(ArtistApplication.objects.all(), "email", query).values_list("email", flat=True)
+                    self.assertEqual(sorted(found), sorted(email for email in emails if email.startswith(query)))
+
+class BulkApproveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=0, exhibitions_per_artist=0, applications=8)
+
+    def ids(self, status):
+        return list(ArtistApplication.objects.filter(status=status).order_by("pk").values_list("pk", flat=True))
+
+    def test_result_splits_approved_skipped_and_failed(self):
+        pending, errored, rejected = self.ids("PENDING"), self.ids("ERROR"), self.ids("REJECTED")
+        owner = ArtistApplication.objects.get(pk=pending[0]).applicant
+        ArtistProfile.objects.create(user=owner, name="기존", gender="F", birth_date="1990-01-01",
+                                     email=owner.email, phone="010-0000-0000")
+
+        result = process_multiple_approve(pending + errored + rejected, self.seed.admin)
+        self.assertEqual(sorted(result.approved), sorted(pending[1:] + errored))
+        self.assertEqual(sorted(result.skipped), sorted(pending[:1] + rejected))
+        self.assertEqual(result.failed, [])
+        self.assertEqual(ArtistApplication.objects.get(pk=pending[0]).last_error_message, PROFILE_EXISTS_MESSAGE)
+        self.assertEqual(reconcile_status_counts(), {})
+
+    def test_chunk_failure_is_logged_and_retried_one_by_one(self):
+        pending = self.ids("PENDING")
+        single = service.process_single_application
+
+        def fail_first(application, admin_user):
+            if application.pk == pending[0]:
+                raise ValueError("broken")
+            return single(application, admin_user)
+
+        with mock.patch.object(service, "_approve_chunk", side_effect=RuntimeError("chunk")), \
+                mock.patch.object(service, "process_single_application", side_effect=fail_first), \
+                self.assertLogs("artist.service", "ERROR"):
+            result = process_multiple_approve(pending, self.seed.admin)
+        self.assertEqual(result.failed, pending[:1])
+        self.assertEqual(sorted(result.approved), pending[1:])
+        self.assertEqual(ArtistApplication.objects.get(pk=pending[0]).status, "ERROR")
+
+    def test_profile_created_concurrently_falls_back_without_overwriting(self):
+        pending = self.ids("PENDING")
+        racer = ArtistApplication.objects.get(pk=pending[0]).applicant_id
+        fill = ArtistProfile.fill_contact_columns
+        raced = []
+
+        def race(profile):
+            # 일괄 삽입 직전에 다른 경로가 같은 회원의 프로필을 같은 내용으로 만든 경우
+            if profile.user_id == racer and not raced:
+                raced.append(racer)
+                application = ArtistApplication.objects.get(pk=pending[0])
+                ArtistProfile.objects.create(user_id=racer, **{field: getattr(application, field) for field in PROFILE_FIELDS})
+            fill(profile)
+
+        with mock.patch.object(ArtistProfile, "fill_contact_columns", autospec=True, side_effect=race):
+            result = process_multiple_approve(pending, self.seed.admin)
+        self.assertEqual(sorted(result.approved), pending[1:])
+        self.assertEqual(result.skipped, pending[:1])
+        self.assertFalse(ArtistProfile.objects.get(user_id=racer).is_approved)
+        self.assertEqual(reconcile_status_counts(), {})
+
+S3_TEST_STORAGES = {
+    "default": {
+        "BACKEND": "opengallery.storages.MediaStorage",
+        "OPTIONS": {
+            "bucket_name": "og-test", "region_name": "us-east-1",
+            "access_key": "testing", "secret_key": "testing",
+        },
+    },
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@mock_aws
+@override_settings(STORAGES=S3_TEST_STORAGES, USE_DIRECT_UPLOAD=True, TASK_QUEUE_EAGER=False)
+class DirectUploadTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=0)
+
+    def setUp(self):
+        super().setUp()
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="og-test")
+        self.login(self.seed.artist)
+
+    def upload(self, filename="photo.jpg", metadata=True):
+        exif = Image.Exif()
+        exif[0x013B] = "secret-author"
+        buffer = BytesIO()
+        Image.new("RGB", (8, 6), "#336699").save(buffer, format="JPEG", **({"exif": exif} if metadata else {}))
+        response = self.client.post(reverse("artist:direct_upload"), {"kind": "artwork", "filename": filename})
+        self.assertEqual(response.status_code, 200)
+        target = response.json()
+        stored = requests.post(target["url"], data=target["fields"], files={"file": buffer.getvalue()})
+        self.assertLess(stored.status_code, 300)
+        return target["key"]
+
+    def apply(self, key, title="직접 업로드"):
+        client = default_storage.connection.meta.client
+        # 요청 안에서는 헤더 범위만 읽고 원본 전체를 받거나 다시 올리지 않는다
+        with mock.patch.object(client, "get_object", wraps=client.get_object) as get_object, \
+                mock.patch.object(client, "put_object", side_effect=AssertionError) as put_object:
+            response = self.client.post(
+                reverse("artist:artwork_apply"), {"title": title, "price": 1000, "size": 10, "image_key": key}
+            )
+        self.assertRedirects(response, reverse("artist:artwork_apply"), fetch_redirect_response=False)
+        self.assertTrue(all("Range" in call.kwargs for call in get_object.call_args_list))
+        put_object.assert_not_called()
+        return Artwork.objects.get(title=title)
+
+    def promote(self):
+        task = Task.objects.get(name=promote_direct_upload.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            promote_direct_upload(*task.args)
+
+    def test_presigned_upload_is_stripped_and_moved_by_task(self):
+        key = self.upload()
+        artwork = self.apply(key)
+        self.assertEqual(artwork.image.name, key)
+        self.assertEqual((artwork.image_width, artwork.image_height), (8, 6))
+        self.assertIn(b"secret-author", default_storage.open(key).read())
+
+        self.promote()
+        artwork.refresh_from_db()
+        self.assertTrue(artwork.image.name.startswith(f"artworks/A{self.seed.profile.pk}/"))
+        self.assertEqual((artwork.image_width, artwork.image_height), (8, 6))
+        self.assertNotIn(b"secret-author", artwork.image.read())
+        self.assertFalse(default_storage.exists(key))
+
+    def test_clean_upload_is_copied_without_rewriting(self):
+        key = self.upload(metadata=False)
+        artwork = self.apply(key)
+        with mock.patch.object(default_storage, "save", side_effect=AssertionError):
+            self.promote()
+        artwork.refresh_from_db()
+        self.assertTrue(artwork.image.name.startswith(f"artworks/A{self.seed.profile.pk}/"))
+        self.assertTrue(default_storage.exists(artwork.image.name))
+        self.assertFalse(default_storage.exists(key))
+
+    def test_mismatched_header_is_rejected_in_request(self):
+        key = self.upload(filename="photo.png")
+        response = self.client.post(
+            reverse("artist:artwork_apply"), {"title": "형식 불일치", "price": 1000, "size": 10, "image_key": key}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("image_key", response.context["form"].errors)
+        self.assertFalse(Task.objects.filter(name=promote_direct_upload.name).exists())
+
+    def test_other_artists_key_is_rejected(self):
+        key = self.upload().replace(f"/A{self.seed.profile.pk}/", "/A0/")
+        response = self.client.post(
+            reverse("artist:artwork_apply"), {"title": "남의 키", "price": 1000, "size": 10, "image_key": key}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("image_key", response.context["form"].errors)
+
+    def test_stale_uploads_are_purged(self):
+        key = self.upload()
+        self.assertEqual(purge_stale_uploads(), 0)
+        self.assertEqual(purge_stale_uploads(now=timezone.now() + timedelta(days=2)), 1)
+        self.assertFalse(default_storage.exists(key))
+
+    def test_accepted_uploads_waiting_for_promotion_are_kept(self):
+        key = self.apply(self.upload()).image.name
+        self.assertEqual(purge_stale_uploads(now=timezone.now() + timedelta(days=2)), 0)
+        self.assertTrue(default_storage.exists(key))
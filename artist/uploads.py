@@ -0,0 +1,171 @@
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from gallery.images import (
+    COPY_CHUNK_SIZE, FORMAT_EXTENSIONS, MAX_HEADER_BYTES, ImageVerificationError, has_metadata, sniff_format,
+    strip_metadata, verify_image,
+)
+from gallery.models import ALLOWED_EXTENSIONS, ALLOWED_SIZE_MB, Artwork, Exhibition
+
+UPLOAD_KINDS = ("artwork", "exhibition")
+UPLOAD_CONTENT_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png"}
+PRESIGNED_UPLOAD_EXPIRES = 600
+# 브라우저가 올린 원본은 임시 경로에 두고, 폼이 받아들여진 뒤 작업이 메타데이터를 지운 사본을 정식 경로에 저장한다
+DIRECT_UPLOAD_PREFIX = "uploads"
+# 폼 제출로 이어지지 않은 임시 업로드는 이 시간(초)이 지나면 정리 작업이 지운다
+DIRECT_UPLOAD_TTL = 24 * 60 * 60
+DELETE_BATCH_SIZE = 1000
+
+
+def direct_uploads_enabled():
+    return getattr(settings, "USE_DIRECT_UPLOAD", False)
+
+
+def _upload_prefix(kind, profile):
+    return f"{DIRECT_UPLOAD_PREFIX}/{kind}/A{profile.pk}/"
+
+
+def _upload_name(kind, profile, filename):
+    return f"{_upload_prefix(kind, profile)}{uuid4().hex}{Path(filename).suffix.lower()}"
+
+
+def _object_params(name):
+    return {"Bucket": default_storage.bucket_name, "Key": default_storage._normalize_name(name)}
+
+
+def create_presigned_upload(kind, profile, filename):
+    extension = Path(filename or "").suffix.lower()
+    if kind not in UPLOAD_KINDS:
+        raise ValidationError("잘못된 업로드 대상입니다.")
+    if extension not in ALLOWED_EXTENSIONS:
+        raise ValidationError(f"허용된 이미지 형식이 아닙니다: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
+
+    name = _upload_name(kind, profile, filename)
+    content_type = UPLOAD_CONTENT_TYPES[extension]
+    params = _object_params(name)
+    post = default_storage.connection.meta.client.generate_presigned_post(
+        Bucket=params["Bucket"],
+        Key=params["Key"],
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, ALLOWED_SIZE_MB * 1024 * 1024],
+        ],
+        ExpiresIn=PRESIGNED_UPLOAD_EXPIRES,
+    )
+    return {"url": post["url"], "fields": post["fields"], "key": name}
+
+
+def accept_uploaded_key(kind, profile, name):
+    prefix = _upload_prefix(kind, profile)
+    # 다른 작가의 경로나 상위 경로를 가리키는 키는 받지 않는다
+    if not name.startswith(prefix) or "/" in name[len(prefix):] or ".." in name:
+        raise ValidationError("잘못된 업로드 키입니다.")
+    extension = Path(name).suffix.lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise ValidationError(f"허용된 이미지 형식이 아닙니다: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
+
+    # 요청 안에서는 객체 정보와 헤더 바이트만 읽어 검증한다. 메타데이터 제거와 정식 경로 이동은 promote_uploaded_key 작업이 맡는다.
+    client = default_storage.connection.meta.client
+    params = _object_params(name)
+    try:
+        head = client.head_object(**params)
+        if head["ContentLength"] > ALLOWED_SIZE_MB * 1024 * 1024:
+            raise ValidationError(f"이미지 파일 크기는 {ALLOWED_SIZE_MB}MB 이하만 가능합니다.")
+        if head.get("ContentType") != UPLOAD_CONTENT_TYPES[extension]:
+            raise ValidationError("파일 확장자와 실제 이미지 형식이 다릅니다.")
+        header = client.get_object(Range=f"bytes=0-{MAX_HEADER_BYTES - 1}", **params)["Body"].read()
+    except ClientError:
+        raise ValidationError("업로드된 이미지를 찾을 수 없습니다. 다시 업로드해주세요.")
+
+    try:
+        image_format, width, height = verify_image(BytesIO(header))
+    except ImageVerificationError as e:
+        raise ValidationError(str(e), code="invalid_image")
+    if extension not in FORMAT_EXTENSIONS[image_format]:
+        raise ValidationError("파일 확장자와 실제 이미지 형식이 다릅니다.")
+    return width, height
+
+
+def _download(name):
+    original = SpooledTemporaryFile(max_size=COPY_CHUNK_SIZE * 16)
+    body = default_storage.connection.meta.client.get_object(**_object_params(name))["Body"]
+    for chunk in iter(lambda: body.read(COPY_CHUNK_SIZE), b""):
+        original.write(chunk)
+    original.seek(0)
+    return original
+
+
+def promote_uploaded_key(model, pk, name):
+    instance = model.objects.filter(pk=pk).only("pk", "artist_id", "image").first()
+    if instance is None or instance.image.name != name:
+        # 행이 지워졌거나 그새 다른 이미지로 바뀌었으면 임시 업로드는 정리 작업에 맡긴다
+        return None
+
+    original = _download(name)
+    image_format = sniff_format(original)
+    target = instance.image.field.generate_filename(instance, Path(name).name)
+    if has_metadata(original, image_format):
+        original.seek(0)
+        target = default_storage.save(target, File(strip_metadata(original, image_format), name=target))
+    elif getattr(default_storage, "content_addressed", False):
+        # 내용 주소 저장소는 저장할 때 참조 수를 세므로 복사 대신 저장을 거친다
+        original.seek(0)
+        target = default_storage.save(target, File(original, name=target))
+    else:
+        target = default_storage.get_available_name(target)
+        default_storage.connection.meta.client.copy_object(
+            CopySource=_object_params(name), MetadataDirective="COPY", **_object_params(target)
+        )
+
+    with transaction.atomic():
+        instance = model.objects.select_for_update().filter(pk=pk).first()
+        if instance is None or instance.image.name != name:
+            transaction.on_commit(lambda: default_storage.delete(target))
+            return None
+        # 크기는 요청 때 헤더에서 읽어 둔 값과 같으므로 이미지 이름만 바꾼다
+        instance.image = target
+        instance.save(update_fields=["image"])
+        transaction.on_commit(lambda: discard_uploaded_key(name))
+    return target
+
+
+def discard_uploaded_key(name):
+    default_storage.connection.meta.client.delete_object(**_object_params(name))
+
+
+def purge_stale_uploads(now=None):
+    # 발급만 되고 폼 제출로 이어지지 않은 임시 업로드를 지운다
+    cutoff = (now or timezone.now()) - timedelta(seconds=DIRECT_UPLOAD_TTL)
+    client = default_storage.connection.meta.client
+    bucket = default_storage.bucket_name
+    pages = client.get_paginator("list_objects_v2").paginate(
+        Bucket=bucket, Prefix=default_storage._normalize_name(f"{DIRECT_UPLOAD_PREFIX}/")
+    )
+    # 폼은 받아들여졌지만 아직 정식 경로로 옮겨지지 않은 업로드는 행이 가리키고 있으므로 남긴다
+    pending = {
+        default_storage._normalize_name(name)
+        for model in (Artwork, Exhibition)
+        for name in model.objects.filter(image__startswith=f"{DIRECT_UPLOAD_PREFIX}/").values_list("image", flat=True)
+    }
+    stale = [
+        item["Key"] for page in pages for item in page.get("Contents", ())
+        if item["LastModified"] < cutoff and item["Key"] not in pending
+    ]
+    for start in range(0, len(stale), DELETE_BATCH_SIZE):
+        client.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in stale[start:start + DELETE_BATCH_SIZE]], "Quiet": True},
+        )
+    return len(stale)
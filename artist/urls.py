@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import ArtistApplicationCreateView, ArtworkCreateView, ExhibitionCreateView, DashboardView
+from .views import ArtistApplicationCreateView, ArtworkCreateView, ExhibitionCreateView, DashboardView, DirectUploadView
 app_name = "artist"
 
 urlpatterns = [
     path("apply/", ArtistApplicationCreateView.as_view(), name="apply"),
     path("artwork/apply/", ArtworkCreateView.as_view(), name="artwork_apply"),
     path("exhibition/apply/", ExhibitionCreateView.as_view(), name="exhibition_apply"),
+    path("uploads/presign/", DirectUploadView.as_view(), name="direct_upload"),
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
 ]
\ No newline at end of file
@@ -1,22 +1,24 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.exceptions import ValidationError
+from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
-from django.views.generic import CreateView, TemplateView
+from django.urls import reverse, reverse_lazy
+from django.views.generic import CreateView, TemplateView, View
 
 from artist.forms import ArtistApplicationForm
-from artist.models import ArtistApplication, ArtistProfile
+from artist.models import ArtistApplication
 from gallery.models import Artwork, Exhibition
+from gallery.projections import ArtworkCard, ExhibitionCard
 from .forms import ArtworkCreateForm, ExhibitionCreateForm
+from .uploads import create_presigned_upload, direct_uploads_enabled
 
 class ApprovedArtistRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     login_url = "accounts:login"
     redirect_field_name = "next"
 
     def test_func(self):
-        user = self.request.user
-        profile = getattr(user, "artistprofile", None)
-        return bool(profile and profile.is_approved)
+        return self.request.user_role.is_approved_artist
 
     def handle_no_permission(self):
         user = self.request.user
@@ -24,8 +26,7 @@ class ApprovedArtistRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
             messages.warning(self.request, "로그인이 필요합니다.")
             return super().handle_no_permission()
 
-        profile = getattr(user, "artistprofile", None)
-        if profile is None:
+        if not self.request.user_role.has_profile:
             messages.warning(self.request, "등록된 작가만 접근할 수 있습니다.")
             return redirect("core:main")
 
@@ -49,8 +50,7 @@ class ArtistApplicationCreateView(LoginRequiredMixin, CreateView):
         if not request.user.is_authenticated:
             return super().dispatch(request, *args, **kwargs)
 
-        profile = ArtistProfile.objects.filter(user=request.user, is_approved=True).first()
-        if profile:
+        if request.user_role.is_approved_artist:
             messages.info(request, "이미 승인된 작가 계정입니다.")
             return redirect("artist:dashboard")
 
@@ -76,14 +76,49 @@ class ArtistApplicationCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class ArtworkCreateView(ApprovedArtistRequiredMixin, CreateView):
+class DirectUploadContextMixin:
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["user"] = self.request.user
+        return kwargs
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        if direct_uploads_enabled():
+            form.fields["image"].widget.attrs.update({
+                "data-direct-upload-url": reverse("artist:direct_upload"),
+                "data-upload-kind": form.upload_kind,
+                "data-key-field": form.add_prefix("image_key"),
+            })
+        return form
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["direct_upload"] = direct_uploads_enabled()
+        return context
+
+
+class DirectUploadView(ApprovedArtistRequiredMixin, View):
+    def post(self, request):
+        if not direct_uploads_enabled():
+            raise Http404
+        try:
+            upload = create_presigned_upload(
+                request.POST.get("kind", ""), request.user.artistprofile, request.POST.get("filename", "")
+            )
+        except ValidationError as e:
+            return JsonResponse({"error": e.messages[0]}, status=400)
+        return JsonResponse(upload)
+
+
+class ArtworkCreateView(ApprovedArtistRequiredMixin, DirectUploadContextMixin, CreateView):
     model = Artwork
     form_class = ArtworkCreateForm
     template_name = "artist/artwork_apply.html"
     success_url = reverse_lazy("artist:artwork_apply")
 
     def form_valid(self, form):
-        form.instance.artist = self.request.user.artistprofile
+        form.instance.artist_id = self.request.user_role.profile_id
         response = super().form_valid(form)
         messages.success(self.request, "작품이 정상적으로 등록되었습니다.")
         return response
@@ -93,19 +128,14 @@ class ArtworkCreateView(ApprovedArtistRequiredMixin, CreateView):
         return super().form_invalid(form)
 
 
-class ExhibitionCreateView(ApprovedArtistRequiredMixin, CreateView):
+class ExhibitionCreateView(ApprovedArtistRequiredMixin, DirectUploadContextMixin, CreateView):
     model = Exhibition
     form_class = ExhibitionCreateForm
     template_name = "artist/exhibition_apply.html"
     success_url = reverse_lazy("artist:exhibition_apply")
 
-    def get_form_kwargs(self):
-        kwargs = super().get_form_kwargs()
-        kwargs["user"] = self.request.user
-        return kwargs
-
     def form_valid(self, form):
-        form.instance.artist = self.request.user.artistprofile
+        form.instance.artist_id = self.request.user_role.profile_id
         response = super().form_valid(form)
         messages.success(self.request, "전시가 등록되었습니다.")
         return response
@@ -121,15 +151,17 @@ class DashboardView(ApprovedArtistRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         profile = self.request.user.artistprofile
+        artworks = ArtworkCard.fetch(Artwork.objects.filter(artist=profile).order_by("-created_at", "-id"))
+        exhibitions = ExhibitionCard.fetch(Exhibition.objects.filter(artist=profile).order_by("-start_date", "-id"))
 
         context.update({
             "profile_name": getattr(profile, "name", self.request.user.get_username()),
             "profile_email": getattr(profile, "email", self.request.user.email),
             "profile_birth_date": getattr(profile, "birth_date", ""),
             "profile_phone": getattr(profile, "phone", ""),
-            "artworks_count": Artwork.objects.filter(artist=profile).count(),
-            "exhibitions_count": Exhibition.objects.filter(artist=profile).count(),
-            "artworks": Artwork.objects.filter(artist=profile).order_by("-id"),
-            "exhibitions": Exhibition.objects.filter(artist=profile).order_by("-start_date", "-id"),
+            "artworks_count": len(artworks),
+            "exhibitions_count": len(exhibitions),
+            "artworks": artworks,
+            "exhibitions": exhibitions,
         })
         return context
\ No newline at end of file
@@ -0,0 +1,154 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.utils.http import urlencode
+
+VERSION_KEY = "table-version:{}"
+PAGE_CACHE_KEY = "anonymous-page:{}"
+
+
+def _version_key(table):
+    return VERSION_KEY.format(table)
+
+
+def get_table_versions(tables):
+    keys = {_version_key(table): table for table in tables}
+    found = cache.get_many(keys)
+    versions = {}
+    for key, table in keys.items():
+        version = found.get(key)
+        if version is None:
+            # 버전 키가 축출된 경우 이전 값과 겹치지 않도록 현재 시각으로 다시 시작
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions[table] = version
+    return versions
+
+
+def get_model_versions(*models):
+    versions = get_table_versions([model._meta.db_table for model in models])
+    return tuple(versions[model._meta.db_table] for model in models)
+
+
+def _bump_table_version(table):
+    key = _version_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_model_version(*models):
+    tables = {model._meta.db_table for model in models}
+
+    def bump():
+        for table in tables:
+            _bump_table_version(table)
+
+    transaction.on_commit(bump)
+
+
+def _bump_sender_version(sender, raw=False, **kwargs):
+    if raw:
+        return
+    bump_model_version(sender)
+
+
+def _bump_m2m_version(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        bump_model_version(sender, type(instance), model)
+
+
+def track_model_versions(*models):
+    for model in models:
+        uid = f"track-version:{model._meta.label}"
+        post_save.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _bump_m2m_version, sender=field.remote_field.through, dispatch_uid=f"{uid}:{field.name}"
+            )
+
+
+def cache_is_shared():
+    return getattr(settings, "CACHE_IS_SHARED", True)
+
+
+def _is_page_cacheable(request):
+    # 워커 간에 버전 스탬프가 공유되지 않으면 다른 워커의 쓰기 뒤에도 오래된 페이지를 내주게 된다
+    if not cache_is_shared():
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.user.is_authenticated:
+        return False
+    return not len(get_messages(request))
+
+
+def cached_anonymous_response(request, models, params, get_response):
+    if not _is_page_cacheable(request):
+        return get_response()
+
+    raw = repr((request.path, urlencode(sorted(params)), get_model_versions(*models)))
+    key = PAGE_CACHE_KEY.format(hashlib.sha1(raw.encode()).hexdigest())
+    cached = cache.get(key)
+    if cached is not None:
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def store(response):
+        # 쿠키나 CSRF 토큰이 섞인 응답은 다른 방문자에게 재사용할 수 없다
+        if (
+            response.status_code != 200
+            or response.streaming
+            or response.cookies
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        ):
+            return
+        cache.set(
+            key,
+            (response.content, response["Content-Type"]),
+            getattr(settings, "ANONYMOUS_PAGE_CACHE_TIMEOUT", 300),
+        )
+
+    response = get_response()
+    if getattr(response, "is_rendered", True):
+        store(response)
+    else:
+        response.add_post_render_callback(store)
+    return response
+
+
+def anonymous_page_cache(*models):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return cached_anonymous_response(
+                request, models, request.GET.items(), lambda: view_func(request, *args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+class AnonymousPageCacheMixin:
+    page_cache_models = ()
+
+    def get_page_cache_params(self):
+        return self.request.GET.items()
+
+    def dispatch(self, request, *args, **kwargs):
+        return cached_anonymous_response(
+            request,
+            self.page_cache_models,
+            self.get_page_cache_params(),
+            lambda: super(AnonymousPageCacheMixin, self).dispatch(request, *args, **kwargs),
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from opengallery.sessions import PURGE_CHUNK_SIZE, SessionStore
+
+
+class Command(BaseCommand):
+    help = "만료된 세션을 일정 개수씩 나누어 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE, help="한 번에 삭제할 세션 수")
+        parser.add_argument("--pause", type=float, default=0, help="묶음 사이 대기 시간(초)")
+
+    def handle(self, *args, **options):
+        deleted = SessionStore.purge_expired(chunk_size=max(1, options["chunk_size"]), pause=options["pause"])
+        self.stdout.write(self.style.SUCCESS(f"만료된 세션 {deleted}건을 삭제했습니다."))
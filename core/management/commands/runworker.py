@@ -0,0 +1,75 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from core.tasks import claim_tasks, fail_abandoned_tasks, heartbeat, run_task, schedule_periodic_tasks
+
+
+def _init_process():
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = "데이터베이스 작업 큐를 처리하는 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="동시에 실행할 작업 수")
+        parser.add_argument("--pool", choices=("thread", "process"), default="thread", help="실행 풀 종류")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="대기 작업이 없을 때 조회 간격(초)")
+        parser.add_argument("--burst", action="store_true", help="대기 중인 작업을 모두 처리하면 종료합니다.")
+        parser.add_argument(
+            "--heartbeat-interval", type=float, default=60.0, help="실행 중인 작업의 잠금을 갱신하는 간격(초)"
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"[:64]
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if options["pool"] == "process":
+            # 포크 전에 연결을 닫아 자식 프로세스가 같은 소켓을 공유하지 않도록 한다
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=concurrency, initializer=_init_process)
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="task")
+
+        self.stdout.write(f"워커 {worker_id} 시작 ({options['pool']} x {concurrency})")
+        running = {}
+        last_heartbeat = 0
+        with executor:
+            while not self.stopping:
+                close_old_connections()
+                if time.monotonic() - last_heartbeat >= options["heartbeat_interval"]:
+                    heartbeat(worker_id, running.values())
+                    fail_abandoned_tasks()
+                    schedule_periodic_tasks()
+                    last_heartbeat = time.monotonic()
+
+                claimed = claim_tasks(worker_id, concurrency - len(running)) if len(running) < concurrency else []
+                running.update({executor.submit(run_task, task_id, worker_id): task_id for task_id in claimed})
+
+                if not running:
+                    if options["burst"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+                done, _ = wait(
+                    running, timeout=0 if claimed else options["poll_interval"], return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    running.pop(future)
+                    if future.exception() is not None:
+                        self.stderr.write(f"작업 처리 중 오류: {future.exception()!r}")
+            wait(running)
+        self.stdout.write(self.style.SUCCESS(f"워커 {worker_id} 종료"))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -1,3 +1,38 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Task(models.Model):
+    STATUS_CHOICES = (("PENDING", "대기"), ("RUNNING", "실행중"), ("DONE", "완료"), ("FAILED", "실패"))
+
+    name = models.CharField(max_length=128)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_at", "id"], name="task_ready"),
+        ]
+
+    def __str__(self):
+        return f"{self.name}#{self.pk} / {self.get_status_display()}"
+
+
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
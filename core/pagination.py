@@ -0,0 +1,223 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from django.utils.functional import cached_property
+
+from .cache import cache_is_shared, get_table_versions
+
+
+class CachedCountPaginator(Paginator):
+    def _count_signature(self, queryset):
+        query = queryset.order_by().values("pk").query
+        sql, params = query.sql_with_params()
+        tables = sorted({alias.table_name for alias in query.alias_map.values()})
+        versions = get_table_versions(tables)
+        raw = repr((queryset.db, sql, params, sorted(versions.items())))
+        return "paginator-count:" + hashlib.sha1(raw.encode()).hexdigest()
+
+    def _estimated_count(self, queryset):
+        query = queryset.query
+        threshold = getattr(settings, "PAGINATOR_ESTIMATE_THRESHOLD", 100_000)
+        if not threshold or query.where or query.distinct or query.group_by or query.combinator:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] is not None and row[0] >= threshold:
+            return int(row[0])
+        return None
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        if not cache_is_shared():
+            # 다른 워커가 쓴 뒤에도 무효화되지 않는 건수를 내주느니 매번 센다
+            return self._estimated_count(queryset) or queryset.count()
+
+        try:
+            key = self._count_signature(queryset)
+        except EmptyResultSet:
+            return 0
+
+        count = cache.get(key)
+        if count is None:
+            count = self._estimated_count(queryset)
+            if count is None:
+                count = queryset.count()
+            cache.set(key, count, getattr(settings, "PAGINATOR_COUNT_TIMEOUT", 300))
+        return count
+
+
+class KeysetPage(Sequence):
+    def __init__(self, object_list, paginator, has_next, has_previous, first_key=None, last_key=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        # object_list 는 템플릿용 객체로 교체될 수 있으므로 커서는 조회 때 따로 읽어 둔 정렬 키로 만든다
+        self._first_key = first_key
+        self._last_key = last_key
+
+    def __repr__(self):
+        return f"<Keyset page of {len(self.object_list)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or self._last_key is None:
+            return ""
+        return self.paginator.encode_cursor(self._last_key, "next")
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or self._first_key is None:
+            return ""
+        return self.paginator.encode_cursor(self._first_key, "prev")
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page, ordering=("-created_at", "-id")):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = [
+            (name[1:], True) if name.startswith("-") else (name, False) for name in ordering
+        ]
+        self._key_aliases = [f"keyset_{position}" for position in range(len(self.ordering))]
+
+    @cached_property
+    def _fields(self):
+        opts = self.queryset.model._meta
+        return [opts.get_field(name) for name, _ in self.ordering]
+
+    def encode_cursor(self, key, direction):
+        values = [value.isoformat() if hasattr(value, "isoformat") else value for value in key]
+        payload = json.dumps([direction[0], values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in ("n", "p") or len(raw_values) != len(self._fields):
+                return None, None
+            values = [field.to_python(value) for field, value in zip(self._fields, raw_values)]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            return None, None
+        if any(value is None for value in values):
+            return None, None
+        return ("next" if direction == "n" else "prev"), values
+
+    def _boundary(self, values, forward):
+        # (a, b) < (x, y) 를 "a <= x AND (a < x OR b < y)" 로 풀어 선두 컬럼 범위 스캔이 가능하도록 구성
+        head_name, head_desc = self.ordering[0]
+        head_lookup = "lte" if head_desc == forward else "gte"
+        condition = Q()
+        for position, (name, desc) in enumerate(self.ordering):
+            lookup = "lt" if desc == forward else "gt"
+            clause = Q(**{f"{name}__{lookup}": values[position]})
+            for prev_position in range(position):
+                clause &= Q(**{self.ordering[prev_position][0]: values[prev_position]})
+            condition |= clause
+        return Q(**{f"{head_name}__{head_lookup}": values[0]}) & condition
+
+    def _order_by(self, forward):
+        return [
+            f"-{name}" if desc == forward else name for name, desc in self.ordering
+        ]
+
+    def _split_key(self, row):
+        # 정렬 키는 행이 모델 객체, dict, 튜플 어느 것이든 같은 방식으로 덧붙여 읽고 떼어 낸다
+        if isinstance(row, tuple):
+            size = len(self._key_aliases)
+            return row[:-size], tuple(row[-size:])
+        if isinstance(row, dict):
+            return row, tuple(row.pop(alias) for alias in self._key_aliases)
+        return row, tuple(getattr(row, alias) for alias in self._key_aliases)
+
+    def page(self, cursor=None):
+        direction, values = self.decode_cursor(cursor)
+        forward = direction != "prev"
+
+        queryset = self.queryset
+        keyed = queryset.annotate(
+            **{alias: F(name) for alias, (name, _) in zip(self._key_aliases, self.ordering)}
+        )
+        if values is not None:
+            keyed = keyed.filter(self._boundary(values, forward))
+        rows = list(keyed.order_by(*self._order_by(forward))[: self.per_page + 1])
+
+        has_more = len(rows) > self.per_page
+        rows, keys = zip(*map(self._split_key, rows[: self.per_page])) if rows else ((), ())
+        rows, keys = list(rows), list(keys)
+        if not forward:
+            rows.reverse()
+            keys.reverse()
+
+        # 지나온 쪽에도 행이 남아 있는지는 커서를 믿지 않고 데이터로 확인한다
+        if values is None:
+            has_behind = False
+        elif keys:
+            edge = keys[0] if forward else keys[-1]
+            has_behind = queryset.filter(self._boundary(edge, not forward)).exists()
+        else:
+            has_behind = queryset.exclude(self._boundary(values, forward)).exists()
+
+        first_key, last_key = (keys[0], keys[-1]) if keys else (None, None)
+        if forward:
+            return KeysetPage(rows, self, has_more, has_behind, first_key, last_key)
+        return KeysetPage(rows, self, has_behind, has_more, first_key, last_key)
+
+
+class KeysetPaginationMixin:
+    cursor_kwarg = "cursor"
+    keyset_ordering = ("-created_at", "-id")
+
+    def is_keyset_mode(self):
+        return self.cursor_kwarg in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.is_keyset_mode():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cursor_mode"] = self.is_keyset_mode()
+        return context
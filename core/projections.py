@@ -0,0 +1,64 @@
+from django.core.files.storage import default_storage
+
+
+class MediaFile:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name or ""
+
+    def __bool__(self):
+        return bool(self.name)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+
+class Projection:
+    __slots__ = ()
+    lookups = {}
+    converters = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        attributes = []
+        for klass in reversed(cls.__mro__):
+            attributes.extend(klass.__dict__.get("__slots__", ()))
+        cls.attributes = tuple(attributes)
+        cls.field_lookups = tuple(cls.lookups.get(name, name) for name in attributes)
+
+    def __init__(self, *values):
+        converters = self.converters
+        for name, value in zip(self.attributes, values):
+            converter = converters.get(name)
+            setattr(self, name, converter(value) if converter else value)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {getattr(self, 'id', '')}>"
+
+    @classmethod
+    def project(cls, queryset):
+        return queryset.values_list(*cls.field_lookups)
+
+    @classmethod
+    def wrap(cls, rows):
+        return [cls(*row) for row in rows]
+
+    @classmethod
+    def fetch(cls, queryset):
+        return cls.wrap(cls.project(queryset))
+
+
+class ProjectionMixin:
+    projection = None
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            self.projection.project(queryset), page_size
+        )
+        page.object_list = self.projection.wrap(page.object_list)
+        return paginator, page, page.object_list, is_paginated
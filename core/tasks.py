@@ -0,0 +1,189 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+_registry = {}
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_attempts, retry_delay, every=None):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.every = timedelta(seconds=every) if every else None
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self, args, kwargs)
+
+    def delay_at(self, run_at, *args, **kwargs):
+        return enqueue(self, args, kwargs, run_at=run_at)
+
+    def backoff(self, attempts):
+        return timedelta(seconds=self.retry_delay * 2 ** (attempts - 1))
+
+
+def task(func=None, *, name=None, max_attempts=3, retry_delay=10, every=None):
+    # every(초)를 주면 워커가 그 간격으로 인자 없이 실행되도록 예약한다
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        wrapped = TaskFunction(func, task_name, max_attempts, retry_delay, every)
+        _registry[task_name] = wrapped
+        return wrapped
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    return _registry[name]
+
+
+def enqueue(task_function, args=(), kwargs=None, run_at=None):
+    kwargs = kwargs or {}
+    if getattr(settings, "TASK_QUEUE_EAGER", False):
+        # 워커 없이 개발할 때는 커밋 직후 같은 프로세스에서 바로 실행한다
+        transaction.on_commit(lambda: run_eager(task_function, args, kwargs))
+        return None
+
+    # 작업 행은 호출한 트랜잭션과 함께 커밋되므로 롤백되면 작업도 사라진다
+    return Task.objects.create(
+        name=task_function.name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=task_function.max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def run_eager(task_function, args, kwargs):
+    # 이미 커밋된 요청에 예외를 올려 보내지 않고 워커처럼 실패 기록을 남긴다 (EAGER 모드에서는 재시도하지 않는다)
+    try:
+        task_function(*args, **kwargs)
+    except Exception:
+        now = timezone.now()
+        Task.objects.create(
+            name=task_function.name,
+            args=list(args),
+            kwargs=kwargs,
+            status="FAILED",
+            attempts=1,
+            max_attempts=task_function.max_attempts,
+            run_at=now,
+            finished_at=now,
+            last_error=traceback.format_exc(),
+        )
+
+
+def schedule_periodic_tasks(now=None):
+    # 대기/실행 중인 행이 없을 때만 다음 실행을 예약하므로 여러 워커가 불러도 대부분 하나만 남는다 (겹쳐도 작업은 멱등이어야 한다)
+    now = now or timezone.now()
+    scheduled = []
+    for task_function in _registry.values():
+        if task_function.every is None:
+            continue
+        rows = Task.objects.filter(name=task_function.name)
+        if rows.filter(status__in=("PENDING", "RUNNING")).exists():
+            continue
+        last_run = rows.order_by("-run_at").values_list("run_at", flat=True).first()
+        run_at = max(now, last_run + task_function.every) if last_run else now
+        scheduled.append(
+            Task.objects.create(name=task_function.name, max_attempts=task_function.max_attempts, run_at=run_at)
+        )
+    return scheduled
+
+
+def _lock_expired_before(now):
+    return now - timedelta(seconds=getattr(settings, "TASK_LOCK_TIMEOUT", 600))
+
+
+def _ready_tasks(now):
+    # 워커가 죽어서 RUNNING 으로 남은 작업도 잠금 만료 후 다시 가져가되, 시도 횟수가 남은 경우만 가져간다
+    return Task.objects.filter(
+        Q(status="PENDING", run_at__lte=now)
+        | Q(status="RUNNING", locked_at__lt=_lock_expired_before(now), attempts__lt=F("max_attempts"))
+    ).order_by("run_at", "id")
+
+
+def fail_abandoned_tasks(now=None):
+    now = now or timezone.now()
+    return Task.objects.filter(
+        status="RUNNING", locked_at__lt=_lock_expired_before(now), attempts__gte=F("max_attempts")
+    ).update(
+        status="FAILED",
+        finished_at=now,
+        locked_by="",
+        locked_at=None,
+        last_error="작업 잠금이 만료되었고 남은 시도 횟수가 없습니다.",
+    )
+
+
+def heartbeat(worker_id, task_ids):
+    # 실행 중인 작업의 잠금 시각을 갱신해 오래 걸리는 작업을 다른 워커가 다시 가져가지 않게 한다
+    if not task_ids:
+        return 0
+    return Task.objects.filter(id__in=list(task_ids), locked_by=worker_id, status="RUNNING").update(
+        locked_at=timezone.now()
+    )
+
+
+def claim_tasks(worker_id, limit):
+    now = timezone.now()
+    claimed = {"status": "RUNNING", "locked_by": worker_id, "locked_at": now, "attempts": F("attempts") + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                _ready_tasks(now).select_for_update(skip_locked=True).values_list("id", flat=True)[:limit]
+            )
+            Task.objects.filter(id__in=ids).update(**claimed)
+        return ids
+
+    # SKIP LOCKED 를 지원하지 않는 DB(SQLite)는 상태 비교 후 갱신으로 선점한다
+    ids = []
+    for task_id, status, locked_at in _ready_tasks(now).values_list("id", "status", "locked_at")[:limit]:
+        if Task.objects.filter(id=task_id, status=status, locked_at=locked_at).update(**claimed):
+            ids.append(task_id)
+    return ids
+
+
+def run_task(task_id, worker_id):
+    close_old_connections()
+    try:
+        task_row = Task.objects.filter(id=task_id, locked_by=worker_id, status="RUNNING").first()
+        if task_row is None:
+            return None
+        try:
+            task_function = get_task(task_row.name)
+            task_function(*task_row.args, **task_row.kwargs)
+        except Exception:
+            return _record_failure(task_row, worker_id, traceback.format_exc())
+        Task.objects.filter(id=task_id, locked_by=worker_id).update(
+            status="DONE", finished_at=timezone.now(), locked_by="", locked_at=None, last_error=""
+        )
+        return "DONE"
+    finally:
+        close_old_connections()
+
+
+def _record_failure(task_row, worker_id, error):
+    task_function = _registry.get(task_row.name)
+    now = timezone.now()
+    if task_function is not None and task_row.attempts < task_row.max_attempts:
+        status, run_at, finished_at = "PENDING", now + task_function.backoff(task_row.attempts), None
+    else:
+        status, run_at, finished_at = "FAILED", task_row.run_at, now
+    Task.objects.filter(id=task_row.id, locked_by=worker_id).update(
+        status=status, run_at=run_at, finished_at=finished_at, locked_by="", locked_at=None, last_error=error
+    )
+    return status
@@ -0,0 +1,169 @@
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.roles import ROLE_SESSION_KEY, resolve_role
+
+SEED_PASSWORD = "seed-password-1234"
+
+
+def seed_dataset(artists=30, artworks_per_artist=8, exhibitions_per_artist=2, applications=40):
+    # 신호를 거치지 않는 bulk_create 로 채우고, 집계 테이블은 마지막에 한 번에 다시 만든다
+    from artist.counters import reconcile_status_counts
+    from artist.models import ArtistApplication, ArtistProfile
+    from artist.stats import refresh_stale_stats
+    from gallery.facets import rebuild_facet_cells
+    from gallery.latest_artwork import rebuild_latest_artworks
+    from gallery.models import Artwork, Exhibition
+    from gallery.search import get_search_backend
+
+    User = get_user_model()
+    password = make_password(SEED_PASSWORD)
+    now = timezone.now()
+
+    admin = User.objects.create(email="admin@seed.test", password=password, is_staff=True, is_superuser=True)
+    User.objects.bulk_create(
+        [User(email=f"artist{i}@seed.test", password=password) for i in range(artists)]
+        + [User(email=f"applicant{i}@seed.test", password=password) for i in range(applications)]
+        + [User(email="member@seed.test", password=password)]
+    )
+    users = {user.email: user for user in User.objects.exclude(pk=admin.pk)}
+
+    profiles = [
+        ArtistProfile(
+            user=users[f"artist{i}@seed.test"],
+            name=f"작가{i}",
+            gender="MF"[i % 2],
+            birth_date=date(1970 + i % 30, 1 + i % 12, 1 + i % 28),
+            email=f"artist{i}@seed.test",
+            phone=f"010-{1000 + i:04d}-{i:04d}",
+            is_approved=True,
+        )
+        for i in range(artists)
+    ]
+    application_rows = [
+        ArtistApplication(
+            applicant=users[f"applicant{i}@seed.test"],
+            name=f"신청자{i}",
+            gender="MF"[i % 2],
+            birth_date=date(1990, 1 + i % 12, 1 + i % 28),
+            email=f"applicant{i}@seed.test",
+            phone=f"010-{2000 + i:04d}-{i:04d}",
+            status=("PENDING", "PENDING", "ERROR", "REJECTED")[i % 4],
+        )
+        for i in range(applications)
+    ]
+    # bulk_create 는 save() 를 거치지 않으므로 검색용 연락처 컬럼을 직접 채운다
+    for row in profiles + application_rows:
+        row.fill_contact_columns()
+
+    ArtistProfile.objects.bulk_create(profiles)
+    profiles = list(ArtistProfile.objects.order_by("pk"))
+
+    Artwork.objects.bulk_create([
+        Artwork(
+            artist=profile,
+            title=f"풍경 {index}-{j}",
+            price=10_000 * (1 + (index * 7 + j) % 50),
+            size=1 + (index * 13 + j * 31) % 500,
+            # 파일 없이 이름만 채우고, 카드가 비율을 잡을 수 있도록 크기도 함께 넣어 둔다
+            **({"image": f"artworks/seed/{index}-{j}.jpg", "image_width": 1200, "image_height": 900} if j % 2 else {}),
+        )
+        for index, profile in enumerate(profiles)
+        for j in range(artworks_per_artist)
+    ])
+    # 최근 30일 집계와 정렬이 의미 있도록 작성일을 과거로 흩어 둔다
+    artworks = list(Artwork.objects.order_by("pk").only("pk"))
+    for offset, artwork in enumerate(artworks):
+        artwork.created_at = now - timedelta(hours=offset * 7)
+    Artwork.objects.bulk_update(artworks, ["created_at"], batch_size=500)
+
+    Exhibition.objects.bulk_create([
+        Exhibition(
+            artist=profile,
+            title=f"개인전 {index}-{j}",
+            start_date=now.date() - timedelta(days=index * 3 + j * 40),
+            end_date=now.date() - timedelta(days=index * 3 + j * 40 - 14),
+        )
+        for index, profile in enumerate(profiles)
+        for j in range(exhibitions_per_artist)
+    ])
+
+    ArtistApplication.objects.bulk_create(application_rows)
+
+    for model in (Artwork, Exhibition):
+        get_search_backend().rebuild(model)
+    rebuild_facet_cells()
+    rebuild_latest_artworks()
+    refresh_stale_stats(everything=True)
+    reconcile_status_counts()
+
+    return SimpleNamespace(
+        admin=admin,
+        artist=profiles[0].user,
+        profile=profiles[0],
+        applicant=users.get("applicant0@seed.test"),
+        member=users["member@seed.test"],
+    )
+
+
+def query_plan(sql, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+
+class QueryBudgetMixin:
+    # 조회 수 예산과 인덱스 사용을 함께 검사한다. 캐시가 비어 있는 첫 요청 기준으로 잰다.
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def login(self, user):
+        # 세션에 역할 정보가 이미 저장된 상태(두 번째 요청부터)를 기준으로 잰다
+        self.client.force_login(user)
+        user.refresh_from_db(fields=["role_version"])
+        session = self.client.session
+        session[ROLE_SESSION_KEY] = {
+            "role": resolve_role(user).as_dict(),
+            "version": user.role_version,
+            "resolved_at": int(time.time()),
+        }
+        session.save()
+
+    def request_within_budget(self, budget, url, method="get", data=None, **extra):
+        using = DEFAULT_DB_ALIAS
+        with CaptureQueriesContext(connections[using]) as context:
+            response = getattr(self.client, method)(url, data, **extra)
+            if response.streaming:
+                response.streamed = b"".join(response.streaming_content)
+        queries = context.captured_queries
+        if len(queries) > budget:
+            listing = "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(queries, 1))
+            self.fail(f"{url}: {len(queries)} queries (budget {budget})\n{listing}")
+        response.captured_queries = queries
+        return response
+
+    def assertUsesIndex(self, queries, index_name, table=None):
+        plans = []
+        for query in queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            if table and f'"{table}"' not in sql:
+                continue
+            plan = query_plan(sql)
+            if index_name in plan:
+                return plan
+            plans.append(f"{sql}\n  -> {plan}")
+        self.fail(f"index {index_name} not used\n" + "\n".join(plans))
@@ -1,3 +1,198 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from artist.tasks import refresh_stale_artist_stats
+from opengallery.sessions import SessionStore
+
+from .cache import bump_model_version
+from .models import Task
+from .pagination import CachedCountPaginator, KeysetPaginator
+from .tasks import claim_tasks, fail_abandoned_tasks, heartbeat, schedule_periodic_tasks, task
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+@task(every=60)
+def tick():
+    pass
+
+
+class TaskQueueTests(TestCase):
+    def stale_task(self, attempts):
+        return Task.objects.create(
+            name=explode.name, status="RUNNING", attempts=attempts, max_attempts=2,
+            locked_by="dead-worker", locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+    def test_stale_task_is_reclaimed_only_with_attempts_left(self):
+        retry = self.stale_task(attempts=1)
+        exhausted = self.stale_task(attempts=2)
+        self.assertEqual(claim_tasks("worker", 10), [retry.pk])
+
+        self.assertEqual(fail_abandoned_tasks(), 1)
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.status, "FAILED")
+        self.assertEqual(exhausted.attempts, 2)
+
+    def test_heartbeat_keeps_running_task_locked(self):
+        running = self.stale_task(attempts=1)
+        Task.objects.filter(pk=running.pk).update(locked_by="live-worker")
+        self.assertEqual(heartbeat("live-worker", [running.pk]), 1)
+        self.assertEqual(claim_tasks("worker", 10), [])
+
+    def test_periodic_task_is_scheduled_once_per_interval(self):
+        now = timezone.now()
+        schedule_periodic_tasks(now)
+        schedule_periodic_tasks(now)
+        first = Task.objects.get(name=tick.name)
+        self.assertEqual(first.run_at, now)
+
+        Task.objects.filter(pk=first.pk).update(status="DONE")
+        schedule_periodic_tasks(now + timedelta(seconds=1))
+        following = Task.objects.filter(name=tick.name, status="PENDING").get()
+        self.assertEqual(following.run_at, now + timedelta(seconds=60))
+
+    def test_stale_stats_catch_up_is_periodic(self):
+        schedule_periodic_tasks()
+        self.assertTrue(Task.objects.filter(name=refresh_stale_artist_stats.name, status="PENDING").exists())
+
+    @override_settings(TASK_QUEUE_EAGER=True)
+    def test_eager_failure_is_recorded_instead_of_raised(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            explode.delay()
+        failed = Task.objects.get()
+        self.assertEqual((failed.name, failed.status), (explode.name, "FAILED"))
+        self.assertIn("RuntimeError: boom", failed.last_error)
+
+
+class CachedCountPaginatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Task.objects.bulk_create([Task(name="noop") for _ in range(3)])
+
+    def count(self):
+        return CachedCountPaginator(Task.objects.order_by("pk"), 2).count
+
+    def test_count_is_cached_until_table_version_changes(self):
+        self.assertEqual(self.count(), 3)
+        Task.objects.create(name="noop")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.count(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_model_version(Task)
+        self.assertEqual(self.count(), 4)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_count_is_not_cached_on_process_local_backend(self):
+        self.assertEqual(self.count(), 3)
+        Task.objects.create(name="noop")
+        self.assertEqual(self.count(), 4)
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        # 작성 시각이 같은 행이 섞여 있어도 id 로 순서가 정해져야 한다
+        base = timezone.now()
+        Task.objects.bulk_create([Task(name=f"task{i}") for i in range(7)])
+        for i, pk in enumerate(Task.objects.order_by("pk").values_list("pk", flat=True)):
+            Task.objects.filter(pk=pk).update(created_at=base - timedelta(minutes=i // 2))
+        self.expected = list(Task.objects.order_by("-created_at", "-id").values_list("name", flat=True))
+
+    def paginator(self):
+        # 커서에 쓰는 정렬 컬럼이 조회 결과에 없어도 동작해야 한다
+        return KeysetPaginator(Task.objects.values_list("name"), 3)
+
+    def names(self, page):
+        return [row[0] for row in page]
+
+    def test_pages_forward_and_backward(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        self.assertEqual((first.has_previous(), first.has_next()), (False, True))
+        second = paginator.page(first.next_cursor)
+        last = paginator.page(second.next_cursor)
+        self.assertEqual(self.names(first) + self.names(second) + self.names(last), self.expected)
+        self.assertEqual((last.has_previous(), last.has_next()), (True, False))
+
+        back = paginator.page(last.previous_cursor)
+        self.assertEqual(self.names(back), self.names(second))
+        self.assertEqual((back.has_previous(), back.has_next()), (True, True))
+        start = paginator.page(back.previous_cursor)
+        self.assertEqual(self.names(start), self.names(first))
+        self.assertEqual((start.has_previous(), start.has_next()), (False, True))
+
+    def test_has_next_follows_data_when_paging_back(self):
+        paginator = self.paginator()
+        second = paginator.page(paginator.page().next_cursor)
+        Task.objects.filter(name__in=self.expected[3:]).delete()
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual(self.names(back), self.expected[:3])
+        self.assertFalse(back.has_next())
+
+    def test_tampered_cursor_starts_over(self):
+        paginator = self.paginator()
+        for cursor in ("not-a-cursor", paginator.encode_cursor(["yesterday", 1], "next"), "WyJuIiwgWzFdXQ"):
+            page = paginator.page(cursor)
+            self.assertEqual(self.names(page), self.expected[:3])
+            self.assertFalse(page.has_previous())
+
+
+class SessionStoreTests(TestCase):
+    def setUp(self):
+        store = SessionStore()
+        store["cart"] = [1, 2]
+        store.save()
+        self.session_key = store.session_key
+
+    def test_unchanged_session_is_not_written(self):
+        store = SessionStore(self.session_key)
+        store["cart"] = [1, 2]
+        with self.assertNumQueries(0):
+            store.save()
+
+    def test_changed_session_is_written(self):
+        store = SessionStore(self.session_key)
+        store["cart"].append(3)
+        store.save()
+        self.assertEqual(SessionStore(self.session_key)["cart"], [1, 2, 3])
+
+    def test_other_writers_are_visible(self):
+        # 프로세스 안에 세션을 담아 두지 않으므로 다른 워커의 변경과 삭제가 바로 보인다
+        self.assertEqual(SessionStore(self.session_key)["cart"], [1, 2])
+        other = SessionStore(self.session_key)
+        other["cart"] = [9]
+        other.save()
+        self.assertEqual(SessionStore(self.session_key)["cart"], [9])
+        SessionStore(self.session_key).delete()
+        self.assertEqual(SessionStore(self.session_key).load(), {})
+
+    def test_expiry_refresh_is_coalesced(self):
+        stored = Session.objects.get().expire_date
+        with self.assertNumQueries(1):
+            SessionStore(self.session_key).save()
+        self.assertEqual(Session.objects.get().expire_date, stored)
+
+        with override_settings(SESSION_EXPIRY_REFRESH_INTERVAL=0), self.assertNumQueries(4):
+            SessionStore(self.session_key).save()
+        self.assertGreater(Session.objects.get().expire_date, stored)
+
+    def test_purge_sessions_deletes_expired_in_chunks(self):
+        expired = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create(
+            [Session(session_key=f"expired{i:033d}", session_data="", expire_date=expired) for i in range(7)]
+        )
+        out = StringIO()
+        with self.assertNumQueries(6):
+            call_command("purge_sessions", chunk_size=3, stdout=out)
+        self.assertIn("7건", out.getvalue())
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), [self.session_key])
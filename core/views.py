@@ -1,6 +1,10 @@
 from django.shortcuts import render
 
-# Create your views here.
+from artist.models import ArtistProfile
+from core.cache import anonymous_page_cache
+from gallery.models import Artwork, Exhibition
 
+
+@anonymous_page_cache(Artwork, Exhibition, ArtistProfile)
 def main(request):
     return render(request, "core/main.html")
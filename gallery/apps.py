@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gallery'
+
+    def ready(self):
+        from core.cache import track_model_versions
+        from . import signals  # noqa: F401
+
+        track_model_versions(self.get_model("Artwork"), self.get_model("Exhibition"))
@@ -0,0 +1,179 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+
+from .models import Artwork, ArtworkFacetCell
+from .search import get_search_backend
+
+# [min, max] 구간 (max 가 None 이면 상한 없음)
+PRICE_BUCKETS = (
+    (0, 99_999),
+    (100_000, 499_999),
+    (500_000, 999_999),
+    (1_000_000, 2_999_999),
+    (3_000_000, 4_999_999),
+    (5_000_000, 9_999_999),
+    (10_000_000, None),
+)
+
+SIZE_BUCKETS = (
+    (1, 10),
+    (11, 30),
+    (31, 50),
+    (51, 100),
+    (101, 200),
+    (201, 500),
+)
+
+
+def _bucket_index(value, buckets):
+    for index, (_, upper) in enumerate(buckets):
+        if upper is None or value <= upper:
+            return index
+    return len(buckets) - 1
+
+
+def price_bucket(price):
+    return _bucket_index(price, PRICE_BUCKETS)
+
+
+def size_bucket(size):
+    return _bucket_index(size, SIZE_BUCKETS)
+
+
+def _bucket_case(field, buckets):
+    whens = [
+        When(**{f"{field}__lte": upper}, then=Value(index))
+        for index, (_, upper) in enumerate(buckets)
+        if upper is not None
+    ]
+    return Case(*whens, default=Value(len(buckets) - 1), output_field=IntegerField())
+
+
+def apply_delta(price, size, delta):
+    cell = ArtworkFacetCell.objects.filter(price_bucket=price_bucket(price), size=size)
+    if cell.update(count=F("count") + delta):
+        return
+    try:
+        with transaction.atomic():
+            ArtworkFacetCell.objects.create(price_bucket=price_bucket(price), size=size, count=delta)
+    except IntegrityError:
+        cell.update(count=F("count") + delta)
+
+
+def rebuild_facet_cells():
+    rows = (
+        Artwork.objects.order_by()
+        .annotate(bucket=_bucket_case("price", PRICE_BUCKETS))
+        .values("bucket", "size")
+        .annotate(total=Count("id"))
+    )
+    with transaction.atomic():
+        ArtworkFacetCell.objects.all().delete()
+        ArtworkFacetCell.objects.bulk_create(
+            ArtworkFacetCell(price_bucket=row["bucket"], size=row["size"], count=row["total"]) for row in rows
+        )
+
+
+def _size_q(size_min, size_max, field="size"):
+    q = Q()
+    if size_min is not None:
+        q &= Q(**{f"{field}__gte": size_min})
+    if size_max is not None:
+        q &= Q(**{f"{field}__lte": size_max})
+    return q
+
+
+def _price_q(price_min, price_max):
+    q = Q()
+    if price_min is not None:
+        q &= Q(price__gte=price_min)
+    if price_max is not None:
+        q &= Q(price__lte=price_max)
+    return q
+
+
+def _split_price_range(price_min, price_max):
+    # 가격 조건을 완전히 포함되는 구간(집계 테이블로 계산)과 경계에 걸친 구간(가격 인덱스 범위로 직접 계산)으로 나눈다
+    full, partial = [], []
+    for index, (lower, upper) in enumerate(PRICE_BUCKETS):
+        low = lower if price_min is None else max(lower, price_min)
+        high = upper if price_max is None else (price_max if upper is None else min(upper, price_max))
+        if high is not None and low > high:
+            continue
+        if (low, high) == (lower, upper):
+            full.append(index)
+        else:
+            partial.append(_price_q(low, high))
+    return full, partial
+
+
+def _as_facets(buckets, counts):
+    return [
+        {"min": lower, "max": upper, "count": counts.get(index, 0)}
+        for index, (lower, upper) in enumerate(buckets)
+    ]
+
+
+def _live_counts(queryset, field, buckets):
+    rows = (
+        queryset.order_by()
+        .annotate(bucket=_bucket_case(field, buckets))
+        .values("bucket")
+        .annotate(total=Count("id"))
+    )
+    return {row["bucket"]: row["total"] for row in rows}
+
+
+def _search_counts(title, price_min, price_max, size_min, size_max):
+    # 검색어가 있으면 검색 후보를 하위 쿼리로 두고 (가격 구간, 호수 구간) 별로 DB 에서 한 번에 센다.
+    # 가격 분포는 호수 조건만, 호수 분포는 가격 조건만 적용해 센 뒤 구간별로 합친다.
+    candidates = get_search_backend().search(Artwork.objects.order_by(), title).values("pk")
+    rows = (
+        Artwork.objects.filter(pk__in=candidates)
+        .order_by()
+        .values(price_bucket=_bucket_case("price", PRICE_BUCKETS), size_bucket=_bucket_case("size", SIZE_BUCKETS))
+        .annotate(
+            in_size=Count("id", filter=_size_q(size_min, size_max) or None),
+            in_price=Count("id", filter=_price_q(price_min, price_max) or None),
+        )
+    )
+    price_counts, size_counts = Counter(), Counter()
+    for row in rows:
+        price_counts[row["price_bucket"]] += row["in_size"]
+        size_counts[row["size_bucket"]] += row["in_price"]
+    return price_counts, size_counts
+
+
+def artwork_facets(title=None, price_min=None, price_max=None, size_min=None, size_max=None):
+    if title:
+        price_counts, size_counts = _search_counts(title, price_min, price_max, size_min, size_max)
+    else:
+        cells = ArtworkFacetCell.objects.filter(count__gt=0)
+        price_counts = dict(
+            cells.filter(_size_q(size_min, size_max))
+            .order_by()
+            .values_list("price_bucket")
+            .annotate(total=Sum("count"))
+        )
+
+        full, partial = _split_price_range(price_min, price_max)
+        size_counts = Counter()
+        if full:
+            size_counts.update(dict(
+                cells.filter(price_bucket__in=full)
+                .order_by()
+                .annotate(bucket=_bucket_case("size", SIZE_BUCKETS))
+                .values_list("bucket")
+                .annotate(total=Sum("count"))
+            ))
+        if partial:
+            size_counts.update(_live_counts(Artwork.objects.filter(reduce(or_, partial)), "size", SIZE_BUCKETS))
+
+    return {
+        "price": _as_facets(PRICE_BUCKETS, price_counts),
+        "size": _as_facets(SIZE_BUCKETS, size_counts),
+    }
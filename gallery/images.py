@@ -0,0 +1,263 @@
+import struct
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+
+from .models import ALLOWED_EXTENSIONS, ALLOWED_SIZE_MB
+
+# 전체 디코딩 전에 헤더만으로 거를 픽셀 상한 (약 6000 x 6000)
+MAX_IMAGE_PIXELS = 36_000_000
+MAX_IMAGE_SIDE = 12_000
+# 헤더(차원 정보)를 찾기 위해 읽을 수 있는 최대 바이트 수
+MAX_HEADER_BYTES = 512 * 1024
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+FORMAT_EXTENSIONS = {
+    "jpeg": {".jpg", ".jpeg"},
+    "png": {".png"},
+}
+CONTENT_TYPES = {"jpeg": "image/jpeg", "png": "image/png"}
+
+# SOF 마커 중 DHT(C4), JPG(C8), DAC(CC) 는 프레임 헤더가 아니다
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+# APP0(JFIF) 와 APP14(Adobe, 색 공간 정보)는 디코딩에 필요하므로 남긴다
+JPEG_KEPT_APP_MARKERS = {0xE0, 0xEE}
+JPEG_EXIF_MARKER = 0xE1
+JPEG_COMMENT_MARKER = 0xFE
+JPEG_SOS_MARKER = 0xDA
+
+PNG_KEPT_CHUNKS = {b"IHDR", b"PLTE", b"IDAT", b"IEND", b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT", b"pHYs"}
+
+
+class ImageVerificationError(Exception):
+    pass
+
+
+def _read_exact(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ImageVerificationError("이미지 파일이 손상되었습니다.")
+    return data
+
+
+def sniff_format(file):
+    file.seek(0)
+    head = file.read(len(PNG_MAGIC))
+    file.seek(0)
+    if head.startswith(JPEG_MAGIC):
+        return "jpeg"
+    if head == PNG_MAGIC:
+        return "png"
+    raise ImageVerificationError("지원하지 않는 이미지 형식입니다.")
+
+
+def _jpeg_segments(file):
+    # SOI 이후 (마커, 세그먼트 데이터 길이) 를 SOS 직전까지 순서대로 돌려준다
+    file.seek(2)
+    while True:
+        byte = _read_exact(file, 1)
+        if byte != b"\xff":
+            raise ImageVerificationError("이미지 파일이 손상되었습니다.")
+        marker = _read_exact(file, 1)[0]
+        while marker == 0xFF:
+            marker = _read_exact(file, 1)[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            yield marker, 0
+            continue
+        length = struct.unpack(">H", _read_exact(file, 2))[0] - 2
+        if length < 0:
+            raise ImageVerificationError("이미지 파일이 손상되었습니다.")
+        yield marker, length
+        if marker == JPEG_SOS_MARKER:
+            return
+
+
+def _jpeg_dimensions(file):
+    for marker, length in _jpeg_segments(file):
+        if file.tell() > MAX_HEADER_BYTES:
+            break
+        if marker in JPEG_SOF_MARKERS:
+            _, height, width = struct.unpack(">BHH", _read_exact(file, 5))
+            return width, height
+        file.seek(length, 1)
+    raise ImageVerificationError("이미지 크기 정보를 찾을 수 없습니다.")
+
+
+def _png_dimensions(file):
+    file.seek(len(PNG_MAGIC))
+    length, chunk_type = struct.unpack(">I4s", _read_exact(file, 8))
+    if chunk_type != b"IHDR" or length < 8:
+        raise ImageVerificationError("이미지 크기 정보를 찾을 수 없습니다.")
+    return struct.unpack(">II", _read_exact(file, 8))
+
+
+def read_dimensions(file, image_format):
+    if image_format == "jpeg":
+        return _jpeg_dimensions(file)
+    return _png_dimensions(file)
+
+
+def _exif_orientation(data):
+    # EXIF 전체는 버리더라도 회전 정보(0x0112)만은 유지해야 사진이 눕지 않는다
+    if not data.startswith(b"Exif\x00\x00") or len(data) < 14:
+        return None
+    tiff = data[6:]
+    order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if order is None:
+        return None
+    try:
+        offset = struct.unpack(order + "I", tiff[4:8])[0]
+        count = struct.unpack(order + "H", tiff[offset:offset + 2])[0]
+        for index in range(count):
+            entry = tiff[offset + 2 + index * 12: offset + 14 + index * 12]
+            tag, _, _, value = struct.unpack(order + "HHI2s", entry[:10])
+            if tag == 0x0112:
+                orientation = struct.unpack(order + "H", value)[0]
+                return orientation if 1 < orientation <= 8 else None
+    except struct.error:
+        return None
+    return None
+
+
+def _orientation_segment(orientation):
+    tiff = b"MM\x00\x2a\x00\x00\x00\x08" + struct.pack(">HHHIHHI", 1, 0x0112, 3, 1, orientation, 0, 0)
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _copy(src, dst, size=None):
+    while size is None or size > 0:
+        chunk = src.read(COPY_CHUNK_SIZE if size is None else min(COPY_CHUNK_SIZE, size))
+        if not chunk:
+            if size:
+                raise ImageVerificationError("이미지 파일이 손상되었습니다.")
+            return
+        dst.write(chunk)
+        if size is not None:
+            size -= len(chunk)
+
+
+def _strip_jpeg(src, dst):
+    dst.write(b"\xff\xd8")
+    for marker, length in _jpeg_segments(src):
+        if marker == JPEG_EXIF_MARKER:
+            orientation = _exif_orientation(_read_exact(src, length))
+            if orientation:
+                dst.write(_orientation_segment(orientation))
+            continue
+        if marker == JPEG_COMMENT_MARKER or (0xE0 <= marker <= 0xEF and marker not in JPEG_KEPT_APP_MARKERS):
+            src.seek(length, 1)
+            continue
+        dst.write(bytes((0xFF, marker)))
+        if marker not in JPEG_STANDALONE_MARKERS:
+            dst.write(struct.pack(">H", length + 2))
+            _copy(src, dst, length)
+    # SOS 이후 압축 데이터는 그대로 흘려 복사한다
+    _copy(src, dst)
+
+
+def _strip_png(src, dst):
+    src.seek(0)
+    dst.write(_read_exact(src, len(PNG_MAGIC)))
+    while True:
+        header = _read_exact(src, 8)
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type in PNG_KEPT_CHUNKS:
+            dst.write(header)
+            _copy(src, dst, length + 4)
+        else:
+            src.seek(length + 4, 1)
+        if chunk_type == b"IEND":
+            return
+
+
+def _jpeg_has_metadata(file):
+    for marker, length in _jpeg_segments(file):
+        if marker in (JPEG_EXIF_MARKER, JPEG_COMMENT_MARKER) or (0xE0 <= marker <= 0xEF and marker not in JPEG_KEPT_APP_MARKERS):
+            return True
+        file.seek(length, 1)
+    return False
+
+
+def _png_has_metadata(file):
+    file.seek(len(PNG_MAGIC))
+    while True:
+        length, chunk_type = struct.unpack(">I4s", _read_exact(file, 8))
+        if chunk_type not in PNG_KEPT_CHUNKS:
+            return True
+        if chunk_type == b"IEND":
+            return False
+        file.seek(length + 4, 1)
+
+
+def has_metadata(file, image_format):
+    # 지울 메타데이터가 없으면 다시 쓰지 않고 스토리지 안에서 복사만 하면 된다
+    if image_format == "jpeg":
+        return _jpeg_has_metadata(file)
+    return _png_has_metadata(file)
+
+
+def strip_metadata(file, image_format):
+    stripped = SpooledTemporaryFile(max_size=COPY_CHUNK_SIZE * 16)
+    if image_format == "jpeg":
+        _strip_jpeg(file, stripped)
+    else:
+        _strip_png(file, stripped)
+    stripped.seek(0)
+    return stripped
+
+
+def verify_image(file):
+    image_format = sniff_format(file)
+    width, height = read_dimensions(file, image_format)
+    if not width or not height:
+        raise ImageVerificationError("이미지 크기 정보가 올바르지 않습니다.")
+    if width > MAX_IMAGE_SIDE or height > MAX_IMAGE_SIDE or width * height > MAX_IMAGE_PIXELS:
+        raise ImageVerificationError(f"이미지 해상도가 너무 큽니다. ({width} x {height})")
+    return image_format, width, height
+
+
+class VerifiedImageField(forms.FileField):
+    default_error_messages = {
+        "invalid_extension": f"허용된 이미지 형식이 아닙니다: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
+        "too_large": f"이미지 파일 크기는 {ALLOWED_SIZE_MB}MB 이하만 가능합니다.",
+        "mismatch": "파일 확장자와 실제 이미지 형식이 다릅니다.",
+    }
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", forms.ClearableFileInput(attrs={"accept": "image/jpeg,image/png"}))
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, data):
+        upload = super().to_python(data)
+        if upload is None:
+            return None
+
+        extension = Path(upload.name).suffix.lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            raise ValidationError(self.error_messages["invalid_extension"], code="invalid_extension")
+        if upload.size > ALLOWED_SIZE_MB * 1024 * 1024:
+            raise ValidationError(self.error_messages["too_large"], code="too_large")
+
+        try:
+            image_format, width, height = verify_image(upload)
+            if extension not in FORMAT_EXTENSIONS[image_format]:
+                raise ValidationError(self.error_messages["mismatch"], code="mismatch")
+            stripped = strip_metadata(upload, image_format)
+        except ImageVerificationError as e:
+            raise ValidationError(str(e), code="invalid_image")
+
+        stripped.seek(0, 2)
+        size = stripped.tell()
+        stripped.seek(0)
+        verified = UploadedFile(stripped, name=upload.name, content_type=CONTENT_TYPES[image_format], size=size)
+        verified.image_size = (width, height)
+        return verified
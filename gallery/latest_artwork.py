@@ -0,0 +1,49 @@
+from django.db import transaction
+
+from artist.models import ArtistProfile
+
+from .models import Artwork
+
+LATEST_ARTWORK_FIELDS = {
+    "latest_artwork_image": "image",
+    "latest_artwork_renditions": "image_renditions",
+    "latest_artwork_color": "image_color",
+    "latest_artwork_placeholder": "image_placeholder",
+}
+EMPTY_LATEST_ARTWORK = {
+    "latest_artwork_image": "",
+    "latest_artwork_renditions": {},
+    "latest_artwork_color": "",
+    "latest_artwork_placeholder": "",
+}
+
+
+def _artworks_with_image():
+    return Artwork.objects.exclude(image="").filter(image__isnull=False)
+
+
+def latest_artwork_values(artist_id):
+    row = (
+        _artworks_with_image()
+        .filter(artist_id=artist_id)
+        .order_by("-created_at", "-id")
+        .values(*LATEST_ARTWORK_FIELDS.values())
+        .first()
+    )
+    if row is None:
+        return dict(EMPTY_LATEST_ARTWORK)
+    return {field: row[source] or EMPTY_LATEST_ARTWORK[field] for field, source in LATEST_ARTWORK_FIELDS.items()}
+
+
+def sync_latest_artwork(artist_id):
+    with transaction.atomic():
+        # 작가 행을 먼저 잠가 동시에 작품이 바뀌어도 마지막 갱신이 최신 작품을 보도록 한다
+        if not ArtistProfile.objects.select_for_update().filter(pk=artist_id).exists():
+            return False
+        ArtistProfile.objects.filter(pk=artist_id).update(**latest_artwork_values(artist_id))
+    return True
+
+
+def rebuild_latest_artworks():
+    artist_ids = ArtistProfile.objects.order_by("pk").values_list("pk", flat=True)
+    return sum(sync_latest_artwork(artist_id) for artist_id in artist_ids.iterator(chunk_size=500))
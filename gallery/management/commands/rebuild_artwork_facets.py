@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from gallery.facets import rebuild_facet_cells
+
+
+class Command(BaseCommand):
+    help = "작품 가격/호수 분포 집계 테이블을 다시 생성합니다."
+
+    def handle(self, *args, **options):
+        rebuild_facet_cells()
+        self.stdout.write(self.style.SUCCESS("작품 분포 집계 테이블을 갱신했습니다."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from gallery.models import Artwork, Exhibition
+from gallery.latest_artwork import rebuild_latest_artworks
+from gallery.renditions import rebuild_renditions
+
+
+class Command(BaseCommand):
+    help = "작품/전시 이미지의 WebP/AVIF 리사이즈 이미지를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="이미 생성된 이미지도 다시 만듭니다.")
+
+    def handle(self, *args, **options):
+        for label, model in (("작품", Artwork), ("전시", Exhibition)):
+            count = rebuild_renditions(model, force=options["force"])
+            self.stdout.write(self.style.SUCCESS(f"{label} 이미지 {count}건을 갱신했습니다."))
+            if model is Artwork and count:
+                rebuild_latest_artworks()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from gallery.latest_artwork import rebuild_latest_artworks
+
+
+class Command(BaseCommand):
+    help = "작가 목록 썸네일용 최신 작품 이미지 정보를 다시 채웁니다."
+
+    def handle(self, *args, **options):
+        count = rebuild_latest_artworks()
+        self.stdout.write(self.style.SUCCESS(f"작가 {count}명의 최신 작품 이미지를 갱신했습니다."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gallery.models import Artwork, Exhibition
+from gallery.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "작품/전시 제목 검색 인덱스를 다시 생성합니다."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        for model in (Artwork, Exhibition):
+            with transaction.atomic():
+                backend.rebuild(model)
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.label} 검색 인덱스를 갱신했습니다."))
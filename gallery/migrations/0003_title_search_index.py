@@ -0,0 +1,68 @@
+import re
+
+from django.db import migrations
+
+SEARCH_MODELS = ("Artwork", "Exhibition")
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def title_grams(text):
+    # 이 마이그레이션 시점의 gallery.search.title_grams 사본. 앱 코드가 바뀌어도 마이그레이션 결과는 그대로 둔다.
+    grams = []
+    for word in WORD_RE.findall((text or "").lower()):
+        grams.extend(word)
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(grams))
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            if "ENABLE_FTS5" not in {row[0] for row in cursor.fetchall()}:
+                return
+            for model_name in SEARCH_MODELS:
+                model = apps.get_model("gallery", model_name)
+                table = f"{model._meta.db_table}_title_fts"
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}" '
+                    f"USING fts5(grams, tokenize = 'unicode61 remove_diacritics 0')"
+                )
+                rows = [
+                    (pk, " ".join(title_grams(title)))
+                    for pk, title in model.objects.values_list("pk", "title")
+                ]
+                cursor.executemany(f'INSERT INTO "{table}" (rowid, grams) VALUES (%s, %s)', rows)
+
+    elif connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for model_name in SEARCH_MODELS:
+            table = apps.get_model("gallery", model_name)._meta.db_table
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_title_trgm" '
+                f'ON "{table}" USING gin ((UPPER("title"::text)) gin_trgm_ops)'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    for model_name in SEARCH_MODELS:
+        table = apps.get_model("gallery", model_name)._meta.db_table
+        if connection.vendor == "sqlite":
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{table}_title_fts"')
+        elif connection.vendor == "postgresql":
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_title_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0002_exhibition_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
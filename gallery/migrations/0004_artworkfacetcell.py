@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:42
+
+from collections import Counter
+
+from django.db import migrations, models
+
+# 이 마이그레이션 시점의 gallery.facets 가격 구간 상한 사본. 앱 코드가 바뀌어도 마이그레이션 결과는 그대로 둔다.
+PRICE_BUCKET_UPPERS = (99_999, 499_999, 999_999, 2_999_999, 4_999_999, 9_999_999)
+
+
+def price_bucket(price):
+    for index, upper in enumerate(PRICE_BUCKET_UPPERS):
+        if price <= upper:
+            return index
+    return len(PRICE_BUCKET_UPPERS)
+
+
+def populate_facet_cells(apps, schema_editor):
+    Artwork = apps.get_model("gallery", "Artwork")
+    ArtworkFacetCell = apps.get_model("gallery", "ArtworkFacetCell")
+
+    counter = Counter(
+        (price_bucket(price), size)
+        for price, size in Artwork.objects.values_list("price", "size").iterator(chunk_size=2000)
+    )
+    ArtworkFacetCell.objects.bulk_create(
+        ArtworkFacetCell(price_bucket=bucket, size=size, count=count) for (bucket, size), count in counter.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0003_title_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtworkFacetCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price_bucket', models.PositiveSmallIntegerField()),
+                ('size', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('price_bucket', 'size'), name='unique_artwork_facet_cell')],
+            },
+        ),
+        migrations.RunPython(populate_facet_cells, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0004_artworkfacetcell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
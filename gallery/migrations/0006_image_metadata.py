@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:54
+
+import gallery.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0005_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='image_color',
+            field=models.CharField(blank=True, default='', editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_placeholder',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='image_color',
+            field=models.CharField(blank=True, default='', editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='image_placeholder',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='exhibition',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='artwork',
+            name='image',
+            field=models.ImageField(blank=True, height_field='image_height', null=True, upload_to=gallery.models.artwork_upload_to, validators=[gallery.models.validate_image_ext, gallery.models.validate_image_size], width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='exhibition',
+            name='image',
+            field=models.ImageField(blank=True, height_field='image_height', null=True, upload_to=gallery.models.exhibition_upload_to, validators=[gallery.models.validate_image_ext, gallery.models.validate_image_size], width_field='image_width'),
+        ),
+    ]
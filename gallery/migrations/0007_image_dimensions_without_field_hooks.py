@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:25
+
+import gallery.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0006_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artwork',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to=gallery.models.artwork_upload_to, validators=[gallery.models.validate_image_ext, gallery.models.validate_image_size]),
+        ),
+        migrations.AlterField(
+            model_name='exhibition',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to=gallery.models.exhibition_upload_to, validators=[gallery.models.validate_image_ext, gallery.models.validate_image_size]),
+        ),
+    ]
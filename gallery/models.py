@@ -33,6 +33,11 @@ class Artwork(models.Model):
     size = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(500)], db_index=True)
     image = models.ImageField(upload_to=artwork_upload_to, blank=True, null=True,
                                   validators=[validate_image_ext, validate_image_size])
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default="", editable=False)
+    image_placeholder = models.TextField(blank=True, default="", editable=False)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
@@ -59,6 +64,11 @@ class Exhibition(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     image = models.ImageField(upload_to=exhibition_upload_to, blank=True, null=True,
                                   validators=[validate_image_ext, validate_image_size])
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default="", editable=False)
+    image_placeholder = models.TextField(blank=True, default="", editable=False)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ["-start_date", "-created_at"]
@@ -71,4 +81,17 @@ class Exhibition(models.Model):
             raise ValidationError({"end_date": "종료일은 시작일보다 빠를 수 없습니다."})
 
     def __str__(self) -> str:
-        return f"[{self.artist.name}] {self.title}"
\ No newline at end of file
+        return f"[{self.artist.name}] {self.title}"
+
+class ArtworkFacetCell(models.Model):
+    price_bucket = models.PositiveSmallIntegerField()
+    size = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["price_bucket", "size"], name="unique_artwork_facet_cell"),
+        ]
+
+    def __str__(self) -> str:
+        return f"price#{self.price_bucket} / {self.size}호: {self.count}"
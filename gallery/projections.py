@@ -0,0 +1,30 @@
+from core.projections import MediaFile, Projection
+
+
+class ArtworkCard(Projection):
+    __slots__ = (
+        "id", "title", "price", "size", "image", "image_renditions",
+        "image_width", "image_height", "image_color", "image_placeholder", "created_at",
+    )
+    converters = {"image": MediaFile}
+
+
+class ArtworkListCard(ArtworkCard):
+    __slots__ = ("artist_id", "artist_name")
+    lookups = {"artist_name": "artist__name"}
+
+
+class ExhibitionCard(Projection):
+    __slots__ = (
+        "id", "title", "start_date", "end_date", "image", "image_renditions",
+        "image_width", "image_height", "image_color", "image_placeholder",
+    )
+    converters = {"image": MediaFile}
+
+
+class ArtistCard(Projection):
+    __slots__ = (
+        "id", "name", "gender", "birth_date", "email", "phone", "created_at",
+        "latest_artwork_image", "latest_artwork_renditions", "latest_artwork_color", "latest_artwork_placeholder",
+    )
+    converters = {"latest_artwork_image": MediaFile}
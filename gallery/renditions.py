@@ -0,0 +1,140 @@
+from base64 import b64encode
+from io import BytesIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from core.cache import bump_model_version
+
+# 썸네일 / 카드 / 상세 화면용 가로 폭(px)
+RENDITION_WIDTHS = {
+    "thumb": 320,
+    "card": 640,
+    "detail": 1280,
+}
+
+# 원본이 오기 전에 먼저 그려 둘 흐린 미리보기 폭(px)
+PLACEHOLDER_WIDTH = 16
+EMPTY_METADATA = {"image_width": None, "image_height": None, "image_color": "", "image_placeholder": ""}
+
+RENDITION_FORMATS = {
+    "avif": {"format": "AVIF", "quality": 55},
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+}
+
+
+def available_formats():
+    return [name for name in RENDITION_FORMATS if features.check(name)]
+
+
+def _target_widths(source_width):
+    # 원본보다 큰 사이즈는 만들지 않고 원본 폭으로 한 번만 만든다
+    return sorted({min(width, source_width) for width in RENDITION_WIDTHS.values()})
+
+
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode in ("LA", "PA") or "transparency" in image.info:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def _encode(image, options):
+    buffer = BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def _dominant_color(image):
+    sample = image.convert("RGB").resize((64, 64), Image.Resampling.BILINEAR).quantize(colors=5)
+    _, index = max(sample.getcolors())
+    red, green, blue = sample.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _placeholder(image):
+    width = PLACEHOLDER_WIDTH
+    height = max(1, round(image.height * width / image.width))
+    tiny = image.convert("RGB").resize((width, height), Image.Resampling.BILINEAR)
+    if features.check("webp"):
+        data, mime = _encode(tiny, {"format": "WEBP", "quality": 40}), "image/webp"
+    else:
+        data, mime = _encode(tiny, {"format": "JPEG", "quality": 40}), "image/jpeg"
+    return f"data:{mime};base64,{b64encode(data).decode()}"
+
+
+def extract_metadata(image):
+    return {
+        "image_width": image.width,
+        "image_height": image.height,
+        "image_color": _dominant_color(image),
+        "image_placeholder": _placeholder(image),
+    }
+
+
+def generate_renditions(field_file):
+    renditions = {"source": field_file.name}
+    try:
+        with field_file.open("rb") as source, Image.open(source) as original:
+            image = _prepare(original)
+            image.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        return renditions, {}
+
+    stem = str(Path(field_file.name).with_suffix(""))
+    for width in _target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for name in available_formats():
+            saved = default_storage.save(
+                f"{stem}_{width}w.{name}", ContentFile(_encode(resized, RENDITION_FORMATS[name]))
+            )
+            renditions.setdefault(name, []).append([width, saved])
+    return renditions, extract_metadata(image)
+
+
+def delete_renditions(renditions):
+    for name in RENDITION_FORMATS:
+        for _, path in (renditions or {}).get(name, ()):
+            default_storage.delete(path)
+
+
+def needs_renditions(instance):
+    name = instance.image.name if instance.image else ""
+    return name != (instance.image_renditions or {}).get("source", "")
+
+
+def refresh_renditions(model, pk, force=False):
+    instance = model.objects.filter(pk=pk).only("image", "image_width", "image_height", "image_renditions").first()
+    if instance is None or not (force or needs_renditions(instance)):
+        return False
+
+    queryset = model.objects.filter(pk=pk)
+    if instance.image:
+        renditions, metadata = generate_renditions(instance.image)
+        queryset = queryset.filter(image=instance.image.name)
+    else:
+        renditions, metadata = {}, EMPTY_METADATA
+        queryset = queryset.filter(Q(image="") | Q(image__isnull=True))
+
+    if not queryset.update(image_renditions=renditions, **metadata):
+        # 그 사이 이미지가 다시 바뀌었다면 새로 만든 파일은 버리고 다음 갱신에 맡긴다
+        delete_renditions(renditions)
+        return False
+    delete_renditions(instance.image_renditions)
+    bump_model_version(model)
+    return True
+
+
+def rebuild_renditions(model, force=False):
+    queryset = model.objects.exclude(image="").exclude(image__isnull=True).only("pk", "image", "image_width", "image_height", "image_renditions")
+    return sum(
+        refresh_renditions(model, instance.pk, force=force)
+        for instance in queryset.iterator(chunk_size=200)
+        if force or needs_renditions(instance)
+    )
@@ -0,0 +1,138 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fts_table_name(model):
+    return f"{model._meta.db_table}_title_fts"
+
+
+def title_grams(text):
+    # 한글은 두 글자 단어가 많아 trigram 보다 unigram + bigram 조합이 재현율이 높다
+    grams = []
+    for word in WORD_RE.findall((text or "").lower()):
+        grams.extend(word)
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(grams))
+
+
+def query_grams(text):
+    grams = []
+    for word in WORD_RE.findall((text or "").lower()):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(grams))
+
+
+class FtsRank(Func):
+    # 후보 행의 rowid 로 FTS 점수를 찾는다. 바깥 쿼리의 별칭을 따르도록 pk 컬럼은 컴파일러가 만든다.
+    output_field = FloatField()
+
+    def __init__(self, table, match):
+        self.table = table
+        self.match = match
+        super().__init__(F("pk"))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        pk_sql, pk_params = compiler.compile(self.source_expressions[0])
+        table = self.table
+        sql = f'(SELECT -bm25("{table}") FROM "{table}" WHERE "{table}" MATCH %s AND rowid = {pk_sql})'
+        return sql, [self.match, *pk_params]
+
+
+class BaseSearchBackend:
+    def search(self, queryset, query):
+        return queryset.filter(title__icontains=query)
+
+    def rank(self, queryset, query):
+        # 관련도 정렬이 필요할 때만 붙인다
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def index(self, instance):
+        pass
+
+    def remove(self, instance):
+        pass
+
+    def rebuild(self, model):
+        pass
+
+
+class SqliteFtsSearchBackend(BaseSearchBackend):
+    @staticmethod
+    def _match(query):
+        return " AND ".join(f'"{gram}"' for gram in query_grams(query))
+
+    def search(self, queryset, query):
+        match = self._match(query)
+        if not match:
+            return super().search(queryset, query)
+
+        table = fts_table_name(queryset.model)
+        candidates = RawSQL(f'SELECT rowid FROM "{table}" WHERE "{table}" MATCH %s', (match,))
+        # bigram 교집합은 연속성을 보장하지 않으므로 후보 행에 한해 부분 문자열 검사를 유지
+        return queryset.filter(pk__in=candidates).filter(title__icontains=query)
+
+    def rank(self, queryset, query):
+        match = self._match(query)
+        if not match:
+            return super().rank(queryset, query)
+        return queryset.annotate(search_rank=FtsRank(fts_table_name(queryset.model), match))
+
+    def index(self, instance):
+        table = fts_table_name(type(instance))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{table}" WHERE rowid = %s', [instance.pk])
+            cursor.execute(
+                f'INSERT INTO "{table}" (rowid, grams) VALUES (%s, %s)',
+                [instance.pk, " ".join(title_grams(instance.title))],
+            )
+
+    def remove(self, instance):
+        table = fts_table_name(type(instance))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{table}" WHERE rowid = %s', [instance.pk])
+
+    def rebuild(self, model):
+        table = fts_table_name(model)
+        rows = (
+            (pk, " ".join(title_grams(title)))
+            for pk, title in model._default_manager.values_list("pk", "title").iterator(chunk_size=2000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{table}"')
+            cursor.executemany(f'INSERT INTO "{table}" (rowid, grams) VALUES (%s, %s)', rows)
+
+
+class PostgresTrigramSearchBackend(BaseSearchBackend):
+    # UPPER(title) 에 걸린 gin_trgm_ops 인덱스가 icontains(LIKE) 를 처리한다
+    def rank(self, queryset, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return queryset.annotate(search_rank=TrigramSimilarity("title", query))
+
+
+@lru_cache(maxsize=None)
+def _default_backend_path():
+    if connection.vendor == "postgresql":
+        return "gallery.search.PostgresTrigramSearchBackend"
+    if connection.vendor == "sqlite":
+        from gallery.models import Artwork
+
+        if fts_table_name(Artwork) in connection.introspection.table_names():
+            return "gallery.search.SqliteFtsSearchBackend"
+    return "gallery.search.BaseSearchBackend"
+
+
+def get_search_backend():
+    path = getattr(settings, "GALLERY_SEARCH_BACKEND", None) or _default_backend_path()
+    return import_string(path)()
@@ -0,0 +1,131 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import facets, renditions, tasks
+from .latest_artwork import sync_latest_artwork
+from .models import Artwork, Exhibition
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Exhibition)
+def index_title(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Exhibition)
+def remove_title(sender, instance, **kwargs):
+    get_search_backend().remove(instance)
+
+
+@receiver(pre_save, sender=Artwork)
+def remember_facet_cell(sender, instance, raw=False, **kwargs):
+    instance._facet_previous = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._facet_previous = (
+        Artwork.objects.filter(pk=instance.pk).values_list("price", "size").first()
+    )
+
+
+@receiver(post_save, sender=Artwork)
+def update_facet_cells(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_facet_previous", None)
+    current = (instance.price, instance.size)
+    if previous == current:
+        return
+    if previous is not None:
+        facets.apply_delta(*previous, -1)
+    facets.apply_delta(*current, 1)
+
+
+@receiver(post_delete, sender=Artwork)
+def release_facet_cell(sender, instance, **kwargs):
+    facets.apply_delta(instance.price, instance.size, -1)
+
+
+@receiver(pre_save, sender=Artwork)
+@receiver(pre_save, sender=Exhibition)
+def remember_image(sender, instance, raw=False, **kwargs):
+    instance._image_previous = None
+    instance._image_uploaded = bool(instance.image) and not instance.image._committed
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._image_previous = sender.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+
+
+@receiver(pre_save, sender=Artwork)
+@receiver(pre_save, sender=Exhibition)
+def fill_image_dimensions(sender, instance, raw=False, **kwargs):
+    # ImageField 의 width_field/height_field 는 크기가 비어 있는 행을 불러올 때마다 저장소에서 파일을 열어 쓰지 않는다.
+    # 업로드 검증 때 읽어 둔 크기를 쓰고, 알 수 없으면 비워 두었다가 렌디션 작업이 채운다.
+    if raw:
+        return
+    image = instance.image
+    if not image:
+        instance.image_width = instance.image_height = None
+    elif not image._committed:
+        instance.image_width, instance.image_height = getattr(image.file, "image_size", (None, None))
+    elif not instance._state.adding and image.name != (instance._image_previous or ""):
+        instance.image_width = instance.image_height = None
+
+
+@receiver(post_save, sender=Artwork)
+def update_latest_artwork(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = instance.image.name if instance.image else ""
+    if not created and (getattr(instance, "_image_previous", None) or "") == current:
+        return
+    if created and not current:
+        return
+    sync_latest_artwork(instance.artist_id)
+
+
+@receiver(post_delete, sender=Artwork)
+def release_latest_artwork(sender, instance, **kwargs):
+    if instance.image:
+        sync_latest_artwork(instance.artist_id)
+
+
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Exhibition)
+def schedule_renditions(sender, instance, raw=False, **kwargs):
+    if raw or not renditions.needs_renditions(instance):
+        return
+    tasks.refresh_image_renditions.delay(sender._meta.label, instance.pk)
+
+
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Exhibition)
+def remove_renditions(sender, instance, **kwargs):
+    stale = instance.image_renditions
+    transaction.on_commit(lambda: renditions.delete_renditions(stale))
+
+
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Exhibition)
+def release_image_blob(sender, instance, **kwargs):
+    # 내용 주소 저장소에서는 참조 수가 남아 있으면 파일이 유지되므로 원본도 함께 반납한다
+    if instance.image and getattr(default_storage, "content_addressed", False):
+        name = instance.image.name
+        transaction.on_commit(lambda: default_storage.delete(name))
+
+
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Exhibition)
+def release_replaced_image_blob(sender, instance, raw=False, **kwargs):
+    # 이미지를 바꾸면 이전 파일의 참조를 반납한다. 같은 내용을 다시 올려 이름이 같아도 참조는 하나 늘었으므로 반납한다.
+    previous = getattr(instance, "_image_previous", None)
+    if raw or not previous or not getattr(default_storage, "content_addressed", False):
+        return
+    current = instance.image.name if instance.image else ""
+    if previous != current or getattr(instance, "_image_uploaded", False):
+        transaction.on_commit(lambda: default_storage.delete(previous))
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+
+from core.tasks import task
+
+from . import renditions
+from .latest_artwork import sync_latest_artwork
+from .models import Artwork
+
+
+@task(max_attempts=5)
+def refresh_image_renditions(model_label, pk):
+    model = apps.get_model(model_label)
+    if renditions.refresh_renditions(model, pk) and model is Artwork:
+        # 작가 목록 썸네일에 복사해 둔 리사이즈 정보도 함께 맞춘다
+        artist_id = Artwork.objects.filter(pk=pk).values_list("artist_id", flat=True).first()
+        if artist_id is not None:
+            sync_latest_artwork(artist_id)
+
+
+@task(max_attempts=3, every=24 * 60 * 60)
+def purge_orphan_blobs():
+    if getattr(default_storage, "content_addressed", False):
+        default_storage.purge_orphan_blobs()
@@ -0,0 +1,47 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from gallery.renditions import RENDITION_FORMATS
+
+register = template.Library()
+
+# col-6 / col-md-4 / col-lg-3 카드 그리드 기준
+CARD_SIZES = "(min-width: 992px) 25vw, (min-width: 768px) 33vw, 50vw"
+
+
+def _srcset(candidates):
+    return ", ".join(f"{default_storage.url(path)} {width}w" for width, path in candidates)
+
+
+def _placeholder_style(color, placeholder):
+    styles = []
+    if color:
+        styles.append(f"background-color: {color}")
+    if placeholder:
+        styles.append(f"background-image: url('{placeholder}'); background-size: cover; background-position: center")
+    return "; ".join(styles)
+
+
+@register.simple_tag
+def picture(image, renditions=None, alt="", css_class="", sizes=CARD_SIZES, loading="lazy",
+            width=None, height=None, color="", placeholder=""):
+    if not image:
+        return ""
+    renditions = renditions or {}
+    sources = [
+        (f"image/{name}", _srcset(renditions[name]), sizes)
+        for name in RENDITION_FORMATS
+        if renditions.get(name)
+    ]
+    dimensions = format_html(' width="{}" height="{}"', width, height) if width and height else ""
+    return format_html(
+        '<picture class="d-block" style="{}">{}<img src="{}" class="{}" alt="{}"{} loading="{}" decoding="async"></picture>',
+        _placeholder_style(color, placeholder),
+        format_html_join("", '<source type="{}" srcset="{}" sizes="{}">', sources),
+        image.url,
+        css_class,
+        alt,
+        dimensions,
+        loading,
+    )
@@ -1,3 +1,426 @@
-from django.test import TestCase
+import struct
+import zlib
+from contextlib import nullcontext
+from datetime import timedelta
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+from django.urls import reverse
+
+from artist.models import ArtistProfile
+from core.models import MediaBlob
+from core.testing import QueryBudgetMixin, seed_dataset
+
+from .facets import PRICE_BUCKETS, SIZE_BUCKETS, artwork_facets
+from .images import PNG_MAGIC, VerifiedImageField
+from .latest_artwork import latest_artwork_values
+from . import renditions
+from .models import Artwork
+from .renditions import RENDITION_FORMATS, _target_widths, refresh_renditions
+from .templatetags.gallery_images import CARD_SIZES, picture
+
+
+class GalleryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset()
+
+    def test_artwork_list(self):
+        response = self.request_within_budget(4, reverse("gallery:artwork_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["artworks"]), 24)
+
+    def test_artwork_list_filtered(self):
+        response = self.request_within_budget(
+            4, reverse("gallery:artwork_list"), data={"title": "풍경", "price_min": 50000, "size_max": 300}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_rank_is_computed_only_for_relevance_order(self):
+        response = self.request_within_budget(4, reverse("gallery:artwork_list"), data={"title": "풍경 3-1"})
+        self.assertTrue(any("bm25" in query["sql"] for query in response.captured_queries))
+        catalog = self.request_within_budget(1, reverse("gallery:artwork_catalog"), data={"title": "풍경 3-1"})
+        self.assertFalse(any("bm25" in query["sql"] for query in catalog.captured_queries))
+
+    def test_artwork_list_cursor(self):
+        expected = list(Artwork.objects.order_by("-created_at", "-id").values_list("pk", flat=True)[:48])
+        first = self.request_within_budget(3, reverse("gallery:artwork_list"), data={"cursor": ""})
+        cursor = first.context["page_obj"].next_cursor
+        response = self.request_within_budget(4, reverse("gallery:artwork_list"), data={"cursor": cursor})
+        self.assertEqual(response.status_code, 200)
+        pages = [[art.id for art in page.context["artworks"]] for page in (first, response)]
+        self.assertEqual(pages, [expected[:24], expected[24:]])
+
+        previous = response.context["page_obj"].previous_cursor
+        back = self.client.get(reverse("gallery:artwork_list"), {"cursor": previous})
+        self.assertEqual([art.id for art in back.context["artworks"]], expected[:24])
+        self.assertFalse(back.context["page_obj"].has_previous())
+
+    def test_title_search_orders_by_relevance(self):
+        # 최신순이었다면 긴 제목이 먼저 나왔겠지만 관련도가 높은 짧은 제목이 앞선다
+        Artwork.objects.create(artist=self.seed.profile, title="노을", price=1000, size=10)
+        Artwork.objects.create(artist=self.seed.profile, title="노을 지는 바다 위의 오래된 등대", price=1000, size=10)
+        response = self.client.get(reverse("gallery:artwork_list"), {"title": "노을"})
+        self.assertEqual([art.title for art in response.context["artworks"]], ["노을", "노을 지는 바다 위의 오래된 등대"])
+
+    def test_artist_list(self):
+        response = self.request_within_budget(2, reverse("gallery:artist_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(artist.latest_artwork_image for artist in response.context["artists"]))
+        approved_index = ArtistProfile._meta.indexes[0].name
+        self.assertUsesIndex(response.captured_queries, approved_index, table="artist_artistprofile")
+        self.assertFalse(any('"gallery_artwork"' in query["sql"] for query in response.captured_queries))
+
+    def test_artist_list_filtered(self):
+        response = self.request_within_budget(2, reverse("gallery:artist_list"), data={"name": "작가1", "gender": "M"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_artist_list_contact_search(self):
+        response = self.request_within_budget(3, reverse("gallery:artist_list"), data={"phone": "0021"})
+        self.assertEqual([artist.name for artist in response.context["artists"]], ["작가21"])
+        self.assertUsesIndex(response.captured_queries, "phone_reversed", table="artist_artistprofile")
+
+        response = self.request_within_budget(3, reverse("gallery:artist_list"), data={"email": "ARTIST2@seed"})
+        self.assertEqual([artist.name for artist in response.context["artists"]], ["작가2"])
+        self.assertUsesIndex(response.captured_queries, "email_local", table="artist_artistprofile")
+
+        # 앞/뒤 일치가 없으면 가운데 일부로도 찾는다
+        response = self.client.get(reverse("gallery:artist_list"), {"phone": "1021"})
+        self.assertEqual([artist.name for artist in response.context["artists"]], ["작가21"])
+        response = self.client.get(reverse("gallery:artist_list"), {"email": "rtist2@"})
+        self.assertEqual([artist.name for artist in response.context["artists"]], ["작가2"])
+
+    def test_artwork_catalog(self):
+        response = self.request_within_budget(1, reverse("gallery:artwork_catalog"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.streamed.count(b"\n"), 240)
+
+    def test_main(self):
+        response = self.request_within_budget(0, reverse("core:main"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_anonymous_page_cache(self):
+        self.request_within_budget(2, reverse("gallery:artist_list"))
+        self.request_within_budget(0, reverse("gallery:artist_list"))
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_anonymous_page_cache_needs_shared_backend(self):
+        self.request_within_budget(2, reverse("gallery:artist_list"))
+        response = self.request_within_budget(2, reverse("gallery:artist_list"))
+        self.assertTrue(response.captured_queries)
+
+
+class LatestArtworkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=2, artworks_per_artist=4, applications=0)
+
+    def assertLatestArtwork(self, profile):
+        profile.refresh_from_db()
+        expected = latest_artwork_values(profile.pk)
+        self.assertEqual(profile.latest_artwork_image, expected["latest_artwork_image"])
+        self.assertEqual(profile.latest_artwork_color, expected["latest_artwork_color"])
+
+    def test_follows_artwork_writes(self):
+        profile = self.seed.profile
+        artwork = Artwork.objects.create(
+            artist=profile, title="신작", price=1000, size=10,
+            image="artworks/seed/new.jpg", image_width=10, image_height=10, image_color="#123456",
+        )
+        profile.refresh_from_db()
+        self.assertEqual(profile.latest_artwork_image, "artworks/seed/new.jpg")
+
+        buffer = BytesIO()
+        Image.new("RGB", (4, 3), "#336699").save(buffer, format="PNG")
+        with TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            artwork.image = SimpleUploadedFile("changed.png", buffer.getvalue(), content_type="image/png")
+            artwork.save()
+            profile.refresh_from_db()
+            self.assertEqual(profile.latest_artwork_image, artwork.image.name)
+
+            changed = artwork.image.name
+            artwork.delete()
+        self.assertLatestArtwork(profile)
+        self.assertNotEqual(profile.latest_artwork_image, changed)
+
+        Artwork.objects.filter(artist=profile).delete()
+        self.assertLatestArtwork(profile)
+        self.assertEqual(profile.latest_artwork_image, "")
+
+
+class ImageDimensionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=0)
+
+    def test_loading_rows_without_dimensions_does_not_open_files(self):
+        Artwork.objects.create(
+            artist=self.seed.profile, title="크기 미상", price=1000, size=10, image="artworks/missing.jpg"
+        )
+        with mock.patch.object(default_storage, "open", side_effect=AssertionError("storage read")):
+            artworks = list(Artwork.objects.all())
+        self.assertIsNone(artworks[0].image_width)
+
+    def test_dimensions_come_from_verified_upload(self):
+        buffer = BytesIO()
+        Image.new("RGB", (8, 6), "#336699").save(buffer, format="PNG")
+        upload = VerifiedImageField().clean(SimpleUploadedFile("new.png", buffer.getvalue(), content_type="image/png"))
+        with TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            artwork = Artwork.objects.create(artist=self.seed.profile, title="신작", price=1000, size=10, image=upload)
+            self.assertEqual((artwork.image_width, artwork.image_height), (8, 6))
+
+            artwork.image = "artworks/other.png"
+            artwork.save()
+        self.assertEqual((artwork.image_width, artwork.image_height), (None, None))
+
+
+class ImageVerificationTests(TestCase):
+    def jpeg(self, **save):
+        buffer = BytesIO()
+        Image.new("RGB", (8, 6), "#336699").save(buffer, format="JPEG", **save)
+        return buffer.getvalue()
+
+    def clean(self, name, data):
+        return VerifiedImageField().clean(SimpleUploadedFile(name, data))
+
+    def test_rejection_messages(self):
+        png = BytesIO()
+        Image.new("RGB", (4, 4)).save(png, format="PNG")
+        cases = [
+            ("a.gif", self.jpeg(), "허용된 이미지 형식이 아닙니다"),
+            ("a.png", self.jpeg(), "파일 확장자와 실제 이미지 형식이 다릅니다."),
+            ("a.jpg", b"GIF89a" + bytes(32), "지원하지 않는 이미지 형식입니다."),
+            ("a.jpg", self.jpeg()[:24], "이미지 파일이 손상되었습니다."),
+            ("a.png", png.getvalue()[:20], "이미지 파일이 손상되었습니다."),
+        ]
+        for name, data, message in cases:
+            with self.subTest(name=name, message=message), self.assertRaisesMessage(ValidationError, message):
+                self.clean(name, data)
+
+    def test_pixel_budget_is_checked_from_header(self):
+        ihdr = b"IHDR" + struct.pack(">IIBBBBB", 50_000, 50_000, 8, 2, 0, 0, 0)
+        data = PNG_MAGIC + struct.pack(">I", 13) + ihdr + struct.pack(">I", zlib.crc32(ihdr))
+        with self.assertRaisesMessage(ValidationError, "이미지 해상도가 너무 큽니다. (50000 x 50000)"):
+            self.clean("huge.png", data)
+
+    def test_exif_is_removed_but_orientation_kept(self):
+        exif = Image.Exif()
+        exif[0x013B] = "secret-author"
+        exif[0x0112] = 6
+        cleaned = self.clean("a.jpg", self.jpeg(exif=exif)).read()
+        self.assertNotIn(b"secret-author", cleaned)
+        image = Image.open(BytesIO(cleaned))
+        self.assertEqual(dict(image.getexif()), {0x0112: 6})
+        self.assertEqual(image.size, (8, 6))
+
+    def test_png_text_chunks_are_removed(self):
+        info = PngInfo()
+        info.add_text("Author", "secret-author")
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="PNG", pnginfo=info)
+        cleaned = self.clean("a.png", buffer.getvalue()).read()
+        self.assertNotIn(b"tEXt", cleaned)
+        self.assertNotIn(b"secret-author", cleaned)
+        self.assertEqual(Image.open(BytesIO(cleaned)).size, (4, 4))
+
+class RenditionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=0, applications=0)
+
+    def setUp(self):
+        media_root = TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name, TASK_QUEUE_EAGER=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def artwork(self, width, height):
+        buffer = BytesIO()
+        Image.new("RGB", (width, height), "#336699").save(buffer, format="PNG")
+        return Artwork.objects.create(
+            artist=self.seed.profile, title="렌디션", price=1000, size=10, image=ContentFile(buffer.getvalue(), "a.png")
+        )
+
+    def test_target_widths_never_upscale(self):
+        self.assertEqual(_target_widths(2000), [320, 640, 1280])
+        self.assertEqual(_target_widths(500), [320, 500])
+        self.assertEqual(_target_widths(100), [100])
+
+        artwork = self.artwork(800, 400)
+        self.assertTrue(refresh_renditions(Artwork, artwork.pk))
+        artwork.refresh_from_db()
+        self.assertEqual([width for width, _ in artwork.image_renditions["webp"]], [320, 640, 800])
+        self.assertEqual((artwork.image_width, artwork.image_height), (800, 400))
+
+    def test_avif_is_skipped_when_unavailable(self):
+        artwork = self.artwork(400, 200)
+        with mock.patch("gallery.renditions.features.check", side_effect=lambda name: name != "avif"):
+            refresh_renditions(Artwork, artwork.pk)
+        artwork.refresh_from_db()
+        self.assertNotIn("avif", artwork.image_renditions)
+        self.assertEqual([width for width, _ in artwork.image_renditions["webp"]], [320, 400])
+
+    def test_picture_tag_markup(self):
+        artwork = self.artwork(400, 200)
+        candidates = {"source": artwork.image.name, "webp": [[320, "a_320w.webp"], [400, "a_400w.webp"]]}
+        html = picture(artwork.image, candidates, alt="풍경", width=400, height=200, color="#336699")
+        self.assertInHTML(
+            f'<source type="image/webp" srcset="/media/a_320w.webp 320w, /media/a_400w.webp 400w" sizes="{CARD_SIZES}">',
+            html,
+        )
+        self.assertNotIn("image/avif", html)
+        self.assertIn('width="400" height="200" loading="lazy"', html)
+        self.assertIn("background-color: #336699", html)
+        self.assertEqual(picture(None), "")
+
+    def test_renditions_are_discarded_when_image_changes_meanwhile(self):
+        artwork = self.artwork(400, 200)
+        generate = renditions.generate_renditions
+        generated = []
+
+        def replace_during_generation(field_file):
+            result = generate(field_file)
+            generated.extend(path for name in RENDITION_FORMATS for _, path in result[0].get(name, ()))
+            Artwork.objects.filter(pk=artwork.pk).update(image="artworks/replaced.png")
+            return result
+
+        with mock.patch.object(renditions, "generate_renditions", side_effect=replace_during_generation):
+            self.assertFalse(refresh_renditions(Artwork, artwork.pk))
+        self.assertTrue(generated)
+        self.assertFalse(any(default_storage.exists(path) for path in generated))
+        self.assertEqual(Artwork.objects.get(pk=artwork.pk).image_renditions, {})
+
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=1, artworks_per_artist=1, applications=0)
+
+    def setUp(self):
+        media_root = TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        storages = {
+            "default": {"BACKEND": "opengallery.storages.ContentAddressedFileSystemStorage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }
+        settings = override_settings(STORAGES=storages, MEDIA_ROOT=media_root.name, TASK_QUEUE_EAGER=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def upload(self, color):
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), color).save(buffer, format="PNG")
+        return VerifiedImageField().clean(SimpleUploadedFile("a.png", buffer.getvalue(), content_type="image/png"))
+
+    def refs(self):
+        return dict(MediaBlob.objects.values_list("name", "ref_count"))
+
+    def test_replacing_image_releases_previous_blob(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            artwork = Artwork.objects.create(
+                artist=self.seed.profile, title="교체", price=1000, size=10, image=self.upload("red")
+            )
+        first = artwork.image.name
+        self.assertEqual(self.refs(), {first: 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            artwork.image = self.upload("red")
+            artwork.save()
+        self.assertEqual(self.refs(), {first: 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            artwork.image = self.upload("blue")
+            artwork.save()
+        self.assertEqual(self.refs(), {artwork.image.name: 1})
+        self.assertFalse(default_storage.exists(first))
+
+    def test_rolled_back_write_is_not_counted_and_gets_purged(self):
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                name = default_storage.save("artworks/rollback.png", ContentFile(b"rolled back"))
+                raise RuntimeError
+        self.assertEqual(self.refs(), {})
+        self.assertTrue(default_storage.exists(name))
+
+        self.assertEqual(default_storage.purge_orphan_blobs(), 0)
+        self.assertEqual(default_storage.purge_orphan_blobs(now=timezone.now() + timedelta(days=2)), 1)
+        self.assertFalse(default_storage.exists(name))
+
+    def test_delete_during_save_keeps_the_reused_blob(self):
+        name = default_storage.save("artworks/shared.png", ContentFile(b"shared"))
+        # 두 번째 저장이 쓰기를 건너뛰고 아직 커밋되기 전에 첫 참조가 지워져도 파일은 남아야 한다
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            self.assertEqual(default_storage.save("artworks/again.png", ContentFile(b"shared")), name)
+            default_storage.delete(name)
+        self.assertEqual(self.refs(), {name: 1})
+        self.assertTrue(default_storage.exists(name))
+
+
+class ArtworkFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seed = seed_dataset(artists=6, artworks_per_artist=8, applications=0)
+
+    def expected(self, title=None, price_min=None, price_max=None, size_min=None, size_max=None):
+        def within(value, lower, upper):
+            return (lower is None or value >= lower) and (upper is None or value <= upper)
+
+        rows = [
+            (price, size) for price, size, name in Artwork.objects.values_list("price", "size", "title")
+            if not title or title in name
+        ]
+        return {
+            "price": [
+                sum(within(p, lower, upper) and within(s, size_min, size_max) for p, s in rows)
+                for lower, upper in PRICE_BUCKETS
+            ],
+            "size": [
+                sum(within(s, lower, upper) and within(p, price_min, price_max) for p, s in rows)
+                for lower, upper in SIZE_BUCKETS
+            ],
+        }
+
+    def assertFacets(self, queries=None, **params):
+        expected = self.expected(**params)
+        with self.assertNumQueries(queries) if queries is not None else nullcontext():
+            facets = artwork_facets(**params)
+        actual = {name: [bucket["count"] for bucket in facets[name]] for name in ("price", "size")}
+        self.assertEqual(actual, expected)
+
+    def test_counts_match_rows(self):
+        self.assertFacets(queries=2)
+        self.assertFacets(price_min=100_000, price_max=499_999, size_max=200)
+
+    def test_unaligned_price_bounds_read_only_edge_rows(self):
+        # 온전히 포함된 구간은 집계 테이블, 경계에 걸친 두 구간만 가격 범위로 직접 센다
+        self.assertFacets(queries=3, price_min=120_000, price_max=3_500_000)
+        self.assertFacets(price_min=150_000, price_max=160_000)
+        self.assertFacets(price_min=5_000_000)
+
+    def test_counts_follow_artwork_writes(self):
+        params = {"price_min": 100_000, "price_max": 499_999}
+        artwork = Artwork.objects.create(artist=self.seed.profile, title="새 작품", price=150_000, size=40)
+        self.assertFacets(**params)
+        artwork.price, artwork.size = 6_000_000, 300
+        artwork.save()
+        self.assertFacets(**params)
+        self.assertFacets(price_min=5_000_000)
+        artwork.delete()
+        self.assertFacets(price_min=5_000_000)
+
+    def test_title_counts_come_from_search_candidates(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertFacets(queries=1, title="풍경 3", price_min=120_000, size_min=50)
+        # 후보 행을 파이썬으로 가져오지 않고 DB 에서 구간별로 묶어 센다
+        self.assertIn("GROUP BY", captured[-1]["sql"])
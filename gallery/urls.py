@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import ArtworkListView, ArtistListView
+from .views import ArtworkListView, ArtistListView, ArtworkCatalogView
 
 app_name = "gallery"
 
 urlpatterns = [
     path('artworks/', ArtworkListView.as_view(), name='artwork_list'),
 path('artists/', ArtistListView.as_view(), name='artist_list'),
+    path('api/artworks/', ArtworkCatalogView.as_view(), name='artwork_catalog'),
 ]
\ No newline at end of file
@@ -1,18 +1,32 @@
-from django.views.generic import ListView
-from django.db.models import Q, OuterRef, Subquery
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.views.generic import ListView, View
+from django.db.models import Q
 from django.utils.http import urlencode
-from .models import Artwork
+from .models import Artwork, Exhibition
+from artist.contacts import search_contacts
 from artist.models import ArtistProfile
 from datetime import datetime
 from django.utils import timezone
+from core.cache import AnonymousPageCacheMixin
+from core.pagination import CachedCountPaginator, KeysetPaginationMixin
+from core.projections import ProjectionMixin
+from .facets import artwork_facets
+from .projections import ArtworkListCard, ArtistCard
+from .search import get_search_backend
 
-class ArtworkListView(ListView):
-    model = Artwork
-    template_name = "gallery/artwork_list.html"
-    context_object_name = "artworks"
-    paginate_by = 24
-    ordering = ["-created_at", "-id"]
+class GalleryPageCacheMixin(AnonymousPageCacheMixin):
+    page_cache_models = (Artwork, Exhibition, ArtistProfile)
 
+    def get_page_cache_params(self):
+        params = self.get_preserved_params()
+        for key in ("page", self.cursor_kwarg):
+            if key in self.request.GET:
+                params[key] = self.request.GET[key]
+        return params.items()
+
+
+class ArtworkFilterMixin:
     @staticmethod
     def _to_int_or_none(value):
         try:
@@ -20,9 +34,7 @@ class ArtworkListView(ListView):
         except (TypeError, ValueError):
             return None
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-
+    def get_search_params(self):
         title = (self.request.GET.get("title") or "").strip()
         price_min = self._to_int_or_none(self.request.GET.get("price_min"))
         price_max = self._to_int_or_none(self.request.GET.get("price_max"))
@@ -38,9 +50,23 @@ class ArtworkListView(ListView):
         if size_max is not None:
             size_max = min(500, size_max)
 
+        return {
+            "title": title,
+            "price_min": price_min,
+            "price_max": price_max,
+            "size_min": size_min,
+            "size_max": size_max,
+        }
+
+    def filter_artworks(self, queryset):
+        params = self.get_search_params()
+        title = params["title"]
+        price_min, price_max = params["price_min"], params["price_max"]
+        size_min, size_max = params["size_min"], params["size_max"]
+
         filters = Q()
         if title:
-            queryset = queryset.filter(title__icontains=title)
+            queryset = get_search_backend().search(queryset, title)
         if price_min is not None:
             queryset = queryset.filter(price__gte=price_min)
         if price_max is not None:
@@ -54,6 +80,24 @@ class ArtworkListView(ListView):
             queryset = queryset.filter(filters)
         return queryset
 
+
+class ArtworkListView(GalleryPageCacheMixin, ArtworkFilterMixin, ProjectionMixin, KeysetPaginationMixin, ListView):
+    model = Artwork
+    projection = ArtworkListCard
+    paginator_class = CachedCountPaginator
+    template_name = "gallery/artwork_list.html"
+    context_object_name = "artworks"
+    paginate_by = 24
+    ordering = ["-created_at", "-id"]
+
+    def get_queryset(self):
+        queryset = self.filter_artworks(super().get_queryset())
+        title = self.get_search_params()["title"]
+        if title and not self.is_keyset_mode():
+            # 관련도 순으로 보여줄 때만 행마다 점수를 계산한다
+            queryset = get_search_backend().rank(queryset, title).order_by("-search_rank", "-created_at", "-id")
+        return queryset
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -72,23 +116,42 @@ class ArtworkListView(ListView):
         })
 
         page_obj = context.get("page_obj")
-        if page_obj:
+        if page_obj and not context["cursor_mode"]:
             paginator = page_obj.paginator
             context["page_range"] = paginator.get_elided_page_range(
                 number=page_obj.number, on_each_side=1, on_ends=1
             )
 
+        preserved_params = self.get_preserved_params()
+        context["preserved_query"] = urlencode(preserved_params)
+        context["facets"] = self.get_facets(preserved_params)
+
+        return context
+
+    def get_preserved_params(self):
         preserved_params = {}
         for key in ["title", "price_min", "price_max", "size_min", "size_max"]:
             value = self.request.GET.get(key)
             if value not in [None, ""]:
                 preserved_params[key] = value
-        context["preserved_query"] = urlencode(preserved_params)
+        return preserved_params
 
-        return context
+    def get_facets(self, preserved_params):
+        result = artwork_facets(**self.get_search_params())
+        for facet_name, facet_keys in (("price", ("price_min", "price_max")), ("size", ("size_min", "size_max"))):
+            base_params = {key: value for key, value in preserved_params.items() if key not in facet_keys}
+            for bucket in result[facet_name]:
+                bucket_params = dict(base_params)
+                bucket_params[facet_keys[0]] = bucket["min"]
+                if bucket["max"] is not None:
+                    bucket_params[facet_keys[1]] = bucket["max"]
+                bucket["query"] = urlencode(bucket_params)
+        return result
 
-class ArtistListView(ListView):
+class ArtistListView(GalleryPageCacheMixin, ProjectionMixin, KeysetPaginationMixin, ListView):
     model = ArtistProfile
+    projection = ArtistCard
+    paginator_class = CachedCountPaginator
     template_name = "gallery/artist_list.html"
     context_object_name = "artists"
     paginate_by = 24
@@ -125,21 +188,10 @@ class ArtistListView(ListView):
         if birth_date:
             queryset = queryset.filter(birth_date=birth_date)
         if email:
-            queryset = queryset.filter(email__icontains=email)
+            queryset = search_contacts(queryset, "email", email)
         if phone:
-            queryset = queryset.filter(phone__icontains=phone)
-
-        latest_with_image = (
-            Artwork.objects
-            .filter(artist=OuterRef("pk"))
-            .filter(image__isnull=False)
-            .exclude(image="")
-            .order_by("-created_at", "-id")
-            .values("image")[:1]
-        )
-        queryset = queryset.annotate(
-            latest_artwork_image=Subquery(latest_with_image)
-        )
+            queryset = search_contacts(queryset, "phone", phone)
+
         return queryset
 
     def get_context_data(self, **kwargs):
@@ -161,20 +213,55 @@ class ArtistListView(ListView):
             })
 
             page_obj = context.get("page_obj")
-            if page_obj:
+            if page_obj and not context["cursor_mode"]:
                 paginator = page_obj.paginator
                 context["page_range"] = paginator.get_elided_page_range(
                     number=page_obj.number, on_each_side=1, on_ends=1
                 )
 
-            preserved_params = {}
-            for key in ["name", "gender", "birth_date", "email", "phone"]:
-                value = self.request.GET.get(key)
-                if key == "birth_date":
-                    if self._to_date_or_none(value):
-                        preserved_params[key] = value
-                else:
-                    if value not in [None, ""]:
-                        preserved_params[key] = value
-            context["preserved_query"] = urlencode(preserved_params)
-            return context
\ No newline at end of file
+            context["preserved_query"] = urlencode(self.get_preserved_params())
+            return context
+
+    def get_preserved_params(self):
+        preserved_params = {}
+        for key in ["name", "gender", "birth_date", "email", "phone"]:
+            value = self.request.GET.get(key)
+            if key == "birth_date":
+                if self._to_date_or_none(value):
+                    preserved_params[key] = value
+            else:
+                if value not in [None, ""]:
+                    preserved_params[key] = value
+        return preserved_params
+
+
+class ArtworkCatalogView(ArtworkFilterMixin, View):
+    projection = ArtworkListCard
+    chunk_size = 2000
+    lines_per_write = 200
+
+    def get(self, request):
+        queryset = self.filter_artworks(Artwork.objects.order_by("-created_at", "-id"))
+        rows = self.projection.project(queryset).iterator(chunk_size=self.chunk_size)
+        return StreamingHttpResponse(self.stream(rows), content_type="application/x-ndjson; charset=utf-8")
+
+    def stream(self, rows):
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        buffer = []
+        for row in rows:
+            card = self.projection(*row)
+            buffer.append(encoder.encode({
+                "id": card.id,
+                "title": card.title,
+                "price": card.price,
+                "size": card.size,
+                "image": card.image.url if card.image else None,
+                "artist_id": card.artist_id,
+                "artist_name": card.artist_name,
+                "created_at": card.created_at,
+            }))
+            if len(buffer) >= self.lines_per_write:
+                yield "\n".join(buffer) + "\n"
+                buffer = []
+        if buffer:
+            yield "\n".join(buffer) + "\n"
@@ -34,4 +34,23 @@ AWS_S3_REGION_NAME = getenv("AWS_S3_REGION_NAME", "ap-northeast-2")
 AWS_S3_SIGNATURE_VERSION = "s3v4"
 AWS_S3_ADDRESSING_STYLE  = "virtual"
 AWS_STORAGE_BUCKET_NAME = getenv("AWS_STORAGE_BUCKET_NAME")
-AWS_S3_CUSTOM_DOMAIN = getenv("AWS_S3_CUSTOM_DOMAIN", f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com")
\ No newline at end of file
+USE_CONTENT_ADDRESSED_MEDIA = as_bool(getenv("USE_CONTENT_ADDRESSED_MEDIA", False))
+# MinIO 등 S3 호환 로컬 스토리지를 쓸 때 지정
+AWS_S3_ENDPOINT_URL = getenv("AWS_S3_ENDPOINT_URL")
+USE_DIRECT_UPLOAD = as_bool(getenv("USE_DIRECT_UPLOAD"), USE_S3_MEDIA)
+AWS_S3_CUSTOM_DOMAIN = getenv("AWS_S3_CUSTOM_DOMAIN", f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com")
+
+# Cache Config
+# 운영에서는 gunicorn 워커와 작업 워커가 같은 캐시를 봐야 하므로 기본값을 Redis 로 둔다
+CACHE_BACKEND = getenv(
+    "CACHE_BACKEND",
+    "django.core.cache.backends.redis.RedisCache" if PRODUCTION else "django.core.cache.backends.locmem.LocMemCache",
+)
+CACHE_LOCATION = getenv("CACHE_LOCATION", "redis://redis:6379/0" if PRODUCTION else "opengallery")
+
+# Task Queue Config
+TASK_QUEUE_EAGER = as_bool(getenv("TASK_QUEUE_EAGER"), not PRODUCTION)
+
+# Login Throttle Config
+# 리버스 프록시 뒤에서 실제 클라이언트 주소를 담는 헤더 (예: HTTP_X_FORWARDED_FOR)
+LOGIN_THROTTLE_IP_HEADER = getenv("LOGIN_THROTTLE_IP_HEADER", "")
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.db import DatabaseError, IntegrityError, router, transaction
+from django.utils import timezone
+
+PURGE_CHUNK_SIZE = 1000
+
+
+class SessionStore(DBSessionStore):
+    # 불러온 내용(직렬화 결과)과 만료 시각을 기억해 두고, 바뀐 것이 없으면 DB 쓰기를 건너뛴다.
+    # 읽기는 매번 DB 에서 하므로 다른 워커의 변경(로그아웃 등)이 바로 보인다.
+    _stored = None
+
+    def _snapshot(self, data):
+        return self.serializer().dumps(data)
+
+    def load(self):
+        session = self._get_session_from_db()
+        if session is None:
+            self._stored = None
+            return {}
+        data = self.decode(session.session_data)
+        self._stored = (self._snapshot(data), session.expire_date)
+        return data
+
+    def _write_is_redundant(self, snapshot, expire_date):
+        if self._stored is None:
+            return False
+        stored_snapshot, stored_expire_date = self._stored
+        if snapshot != stored_snapshot or stored_expire_date <= timezone.now():
+            return False
+        # 내용이 같으면 만료 시각 연장은 일정 간격이 쌓였을 때만 기록한다
+        interval = timedelta(seconds=getattr(settings, "SESSION_EXPIRY_REFRESH_INTERVAL", 0))
+        return expire_date - stored_expire_date < interval
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        snapshot = self._snapshot(data)
+        expire_date = self.get_expiry_date()
+        if not must_create and self._write_is_redundant(snapshot, expire_date):
+            return
+
+        session = self.model(
+            session_key=self._get_or_create_session_key(),
+            session_data=self.encode(data),
+            expire_date=expire_date,
+        )
+        using = router.db_for_write(self.model, instance=session)
+        try:
+            with transaction.atomic(using=using):
+                session.save(force_insert=must_create, force_update=not must_create, using=using)
+        except IntegrityError:
+            if must_create:
+                raise CreateError
+            raise
+        except DatabaseError:
+            if not must_create:
+                raise UpdateError
+            raise
+        self._stored = (snapshot, expire_date)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        if session_key == self.session_key:
+            self._stored = None
+        self.model.objects.filter(session_key=session_key).delete()
+
+    @classmethod
+    def purge_expired(cls, chunk_size=PURGE_CHUNK_SIZE, pause=0):
+        # 한 번의 큰 DELETE 대신 만료 인덱스로 잘라 지워 잠금 시간을 짧게 유지한다
+        model = cls.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now)
+                .order_by("expire_date")
+                .values_list("session_key", flat=True)[:chunk_size]
+            )
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+            if len(keys) < chunk_size:
+                return deleted
+            if pause:
+                time.sleep(pause)
+
+    @classmethod
+    def clear_expired(cls):
+        cls.purge_expired()
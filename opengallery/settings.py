@@ -60,6 +60,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.roles.UserRoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -109,6 +110,44 @@ else:
         }
     }
 
+# Cache
+# 버전 스탬프 기반 캐시 무효화가 gunicorn 워커 간에 공유되려면 공용 백엔드(운영 기본값 Redis)를 지정해야 한다.
+
+CACHES = {
+    "default": {
+        "BACKEND": env.CACHE_BACKEND,
+        "LOCATION": env.CACHE_LOCATION,
+    }
+}
+
+# 프로세스마다 따로인 백엔드에서는 다른 워커의 무효화가 보이지 않는다.
+# 운영에서 이런 백엔드가 지정되면 캐시에 기대는 최적화(익명 페이지, 목록 건수)를 끈다. 개발 서버는 단일 프로세스라 그대로 쓴다.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+CACHE_IS_SHARED = not (env.PRODUCTION and env.CACHE_BACKEND in PROCESS_LOCAL_CACHE_BACKENDS)
+
+PAGINATOR_COUNT_TIMEOUT = 300
+PAGINATOR_ESTIMATE_THRESHOLD = 100_000
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 300
+# 세션에 저장한 사용자 역할(작가/관리자)을 다시 확인하기까지의 최대 시간(초).
+# 역할 변경은 사용자 행의 role_version 으로 바로 무효화되므로 이 값은 안전장치일 뿐이다.
+USER_ROLE_MAX_AGE = 3600
+
+# Sessions
+# 수정 표시가 되었더라도 내용이 그대로인 세션은 다시 쓰지 않고, 만료 연장만 필요한 경우는 아래 간격(초)이 쌓였을 때만 기록한다.
+
+SESSION_ENGINE = "opengallery.sessions"
+SESSION_EXPIRY_REFRESH_INTERVAL = 600
+
+# Task queue
+# EAGER 모드에서는 워커 없이 커밋 직후 요청 프로세스에서 바로 실행한다.
+
+TASK_QUEUE_EAGER = env.TASK_QUEUE_EAGER
+# 워커는 실행 중인 작업의 잠금을 주기적으로 갱신하므로 이 시간은 워커가 죽었다고 판단하는 기준이다
+TASK_LOCK_TIMEOUT = 600
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -159,10 +198,14 @@ if env.USE_S3_MEDIA:
     AWS_S3_SIGNATURE_VERSION = env.AWS_S3_SIGNATURE_VERSION
     AWS_STORAGE_BUCKET_NAME = env.AWS_STORAGE_BUCKET_NAME
     AWS_S3_CUSTOM_DOMAIN = env.AWS_S3_CUSTOM_DOMAIN
+    AWS_S3_ENDPOINT_URL = env.AWS_S3_ENDPOINT_URL
 
     STORAGES = {
             "default": {
-                "BACKEND": "opengallery.storages.MediaStorage",
+                "BACKEND": (
+                    "opengallery.storages.ContentAddressedMediaStorage"
+                    if env.USE_CONTENT_ADDRESSED_MEDIA else "opengallery.storages.MediaStorage"
+                ),
             },
             "staticfiles": {
                 "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
@@ -171,6 +214,20 @@ if env.USE_S3_MEDIA:
 
     MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 
+elif env.USE_CONTENT_ADDRESSED_MEDIA:
+    # 같은 내용의 파일은 해시 이름 하나로 저장하고 참조 수로 관리한다
+    STORAGES = {
+        "default": {
+            "BACKEND": "opengallery.storages.ContentAddressedFileSystemStorage",
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        },
+    }
+
+# 브라우저가 presigned POST 로 스토리지에 직접 업로드 (S3 미디어 사용 시에만 동작)
+USE_DIRECT_UPLOAD = env.USE_S3_MEDIA and env.USE_DIRECT_UPLOAD
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -184,6 +241,12 @@ LOGIN_URL = "accounts/login"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = '/'
 
+# 비밀번호 검증 전에 IP / 이메일별 시도 수를 제한한다: (허용 시도 수, 기준 시간(초))
+# 워커들이 같은 한도를 나눠 쓰도록 공용 캐시(운영 기본값 Redis)에 카운터를 둔다.
+LOGIN_THROTTLE_RATES = {"ip": (30, 60), "email": (5, 300), "account": (50, 300)}
+LOGIN_THROTTLE_CACHE = "default"
+LOGIN_THROTTLE_IP_HEADER = env.LOGIN_THROTTLE_IP_HEADER
+
 if env.PRODUCTION:
 
     CSRF_TRUSTED_ORIGINS = env.CSRF_TRUSTED_ORIGINS
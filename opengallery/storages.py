@@ -1,5 +1,99 @@
+import hashlib
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from storages.backends.s3boto3 import S3Boto3Storage
 
+# 참조 없는 파일이라도 이 시간(초)보다 최근에 쓰인 것은 진행 중인 트랜잭션의 것일 수 있어 남겨 둔다
+ORPHAN_BLOB_MIN_AGE = 24 * 60 * 60
+
 class MediaStorage(S3Boto3Storage):
     location = "media"
-    file_overwrite = False
\ No newline at end of file
+    file_overwrite = False
+
+
+class ContentAddressedStorageMixin:
+    blob_prefix = "blobs"
+    content_addressed = True
+
+    def get_available_name(self, name, max_length=None):
+        # 실제 저장 이름은 내용 해시로 정해지므로 중복 확인 요청을 보내지 않는다
+        return name
+
+    def blob_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        return f"{self.blob_prefix}/{hexdigest[:2]}/{hexdigest}{Path(name).suffix.lower()}"
+
+    def _save(self, name, content):
+        from core.models import MediaBlob
+
+        name = self.blob_name(name, content)
+        # 참조는 저장하는 트랜잭션 안에서 행을 잠그고 올린다. 같은 이름을 지우는 delete 도 이 행을 잠그므로
+        # 쓰기를 건너뛴 파일이 참조를 얻기 전에 지워지는 일이 없다. 롤백되어 참조 없이 남은 파일은 purge_orphan_blobs 가 지운다.
+        with transaction.atomic():
+            blob, created = MediaBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={"size": content.size, "ref_count": 1}
+            )
+            if not created:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            # 같은 내용이 이미 있으면 쓰기는 건너뛴다
+            if not self.exists(name):
+                name = super()._save(name, content)
+        return name
+
+    def delete(self, name):
+        from core.models import MediaBlob
+
+        if not name.startswith(f"{self.blob_prefix}/"):
+            return super().delete(name)
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.ref_count > 1:
+                MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+            if blob is not None:
+                blob.delete()
+            super().delete(name)
+
+    def purge_orphan_blobs(self, now=None, min_age=ORPHAN_BLOB_MIN_AGE):
+        # 아직 커밋되지 않은 트랜잭션이 쓴 파일을 지우지 않도록 일정 시간이 지난 것만 본다
+        from core.models import MediaBlob
+
+        cutoff = (now or timezone.now()) - timedelta(seconds=min_age)
+        try:
+            shards, _ = self.listdir(self.blob_prefix)
+        except FileNotFoundError:
+            return 0
+        purged = 0
+        for shard in shards:
+            _, files = self.listdir(f"{self.blob_prefix}/{shard}")
+            names = {f"{self.blob_prefix}/{shard}/{file}" for file in files}
+            referenced = set(
+                MediaBlob.objects.filter(name__in=names, ref_count__gt=0).values_list("name", flat=True)
+            )
+            for name in sorted(names - referenced):
+                if self.get_modified_time(name) < cutoff:
+                    MediaBlob.objects.filter(name=name).delete()
+                    super().delete(name)
+                    purged += 1
+        return purged
+
+
+class ContentAddressedMediaStorage(ContentAddressedStorageMixin, MediaStorage):
+    # 이름이 내용으로 정해지므로 같은 키를 덮어써도 내용은 같다
+    file_overwrite = True
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedStorageMixin, FileSystemStorage):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
@@ -0,0 +1,67 @@
+(function () {
+  function csrfToken(form) {
+    const input = form && form.querySelector('input[name="csrfmiddlewaretoken"]');
+    return input ? input.value : '';
+  }
+
+  function setStatus(input, message, isError) {
+    let el = input.parentElement.querySelector('.direct-upload-status');
+    if (!el) {
+      el = document.createElement('small');
+      el.className = 'direct-upload-status d-block mt-1';
+      input.insertAdjacentElement('afterend', el);
+    }
+    el.textContent = message;
+    el.classList.toggle('text-danger', !!isError);
+    el.classList.toggle('text-muted', !isError);
+  }
+
+  async function upload(input) {
+    const file = input.files && input.files[0];
+    const form = input.form;
+    const keyInput = form.querySelector('input[name="' + input.dataset.keyField + '"]');
+    const submit = form.querySelector('button[type="submit"]');
+    if (!file || !keyInput) return;
+
+    keyInput.value = '';
+    if (submit) submit.disabled = true;
+    setStatus(input, '이미지를 업로드하는 중입니다...');
+
+    try {
+      const presign = await fetch(input.dataset.directUploadUrl, {
+        method: 'POST',
+        headers: {'X-CSRFToken': csrfToken(form)},
+        body: new URLSearchParams({kind: input.dataset.uploadKind, filename: file.name}),
+      });
+      const target = await presign.json();
+      if (!presign.ok) throw new Error(target.error || '업로드를 준비하지 못했습니다.');
+
+      const body = new FormData();
+      Object.entries(target.fields).forEach(([name, value]) => body.append(name, value));
+      body.append('file', file);
+      const stored = await fetch(target.url, {method: 'POST', body: body});
+      if (!stored.ok) throw new Error('이미지 업로드에 실패했습니다.');
+
+      // 파일은 이미 스토리지에 올라갔으므로 폼에는 키만 담아 보낸다
+      keyInput.value = target.key;
+      input.value = '';
+      setStatus(input, '업로드 완료: ' + file.name);
+    } catch (e) {
+      setStatus(input, e.message, true);
+    } finally {
+      if (submit) submit.disabled = false;
+    }
+  }
+
+  function init() {
+    document.querySelectorAll('input[type="file"][data-direct-upload-url]').forEach(input => {
+      input.addEventListener('change', () => upload(input));
+    });
+  }
+
+  if (document.readyState !== "loading") {
+    init();
+  } else {
+    document.addEventListener("DOMContentLoaded", init);
+  }
+})();